@@ -0,0 +1,28 @@
+"""
+Settings profiles, selected with the DJANGO_ENV environment variable:
+
+    dev   (default) DEBUG and the debug toolbar
+    test  used by ``manage.py test``
+    prod  no debug tooling, cached templates and console logging
+
+A profile can also be chosen directly with
+DJANGO_SETTINGS_MODULE=airport.settings.prod.
+"""
+import os
+from importlib import import_module
+
+from django.core.exceptions import ImproperlyConfigured
+
+PROFILES = ("dev", "test", "prod")
+
+_env = os.environ.get("DJANGO_ENV", "dev")
+if _env not in PROFILES:
+    raise ImproperlyConfigured(
+        f"DJANGO_ENV must be one of {', '.join(PROFILES)}, not {_env!r}."
+    )
+
+globals().update(
+    (name, value)
+    for name, value in vars(import_module(f"{__name__}.{_env}")).items()
+    if name.isupper()
+)
@@ -0,0 +1,347 @@
+"""
+Django settings for airport project, shared by every profile.
+
+Generated by 'django-admin startproject' using Django 5.2.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/5.2/ref/settings/
+"""
+import os
+from copy import deepcopy
+from datetime import timedelta
+from pathlib import Path
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.environ.get("SECRET_KEY")
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = False
+
+ALLOWED_HOSTS = ["0.0.0.0", "localhost", "127.0.0.1"]
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    "django.contrib.postgres",
+    "drf_spectacular",
+    "django_filters",
+    "rest_framework",
+    "airport_app",
+    "user",
+]
+
+MIDDLEWARE = [
+    "airport_app.middleware.TracingMiddleware",
+    "airport_app.middleware.MetricsMiddleware",
+    "airport_app.middleware.SlowQueryMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "airport_app.middleware.ProfilingMiddleware",
+    "airport_app.middleware.QueryBudgetMiddleware",
+    "airport_app.middleware.NPlusOneMiddleware",
+]
+
+ROOT_URLCONF = "airport.urls"
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [BASE_DIR / 'templates'],
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = "airport.wsgi.application"
+
+
+# Database
+# https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+
+# Connections are kept open for POSTGRES_CONN_MAX_AGE seconds and
+# checked before reuse. Setting POSTGRES_POOL_MAX_SIZE switches to a
+# client-side pool instead, which suits ASGI workers better; it needs
+# psycopg 3: pip install "psycopg[binary,pool]".
+DATABASE_POOL_MAX_SIZE = int(os.environ.get("POSTGRES_POOL_MAX_SIZE", 0))
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ.get("POSTGRES_DB", "airport"),
+        "USER": os.environ.get("POSTGRES_USER", "airport"),
+        "PASSWORD": os.environ.get("POSTGRES_PASSWORD", "airport"),
+        "HOST": os.environ.get("POSTGRES_HOST", "db"),
+        "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+        "CONN_MAX_AGE": int(os.environ.get("POSTGRES_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "connect_timeout": int(
+                os.environ.get("POSTGRES_CONNECT_TIMEOUT", 5)
+            ),
+            # Milliseconds, 0 disables the limit.
+            "options": "-c statement_timeout={}".format(
+                int(os.environ.get("POSTGRES_STATEMENT_TIMEOUT", 0))
+            ),
+        },
+    }
+}
+
+if DATABASE_POOL_MAX_SIZE:
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.environ.get("POSTGRES_POOL_MIN_SIZE", 2)),
+        "max_size": DATABASE_POOL_MAX_SIZE,
+        "timeout": int(os.environ.get("POSTGRES_POOL_TIMEOUT", 10)),
+    }
+
+# Read replicas, e.g. POSTGRES_REPLICA_HOSTS=replica1,replica2:5433.
+# Safe requests read from a random replica; a user who has just written
+# stays on the primary for AIRPORT_REPLICAS["PIN_SECONDS"].
+for index, address in enumerate(
+    filter(None, os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(",")),
+    start=1,
+):
+    host, _, port = address.strip().partition(":")
+    DATABASES[f"replica{index}"] = {
+        **deepcopy(DATABASES["default"]),
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["airport_app.utils.replicas.ReplicaRouter"]
+
+AIRPORT_REPLICAS = {
+    "DATABASES": [alias for alias in DATABASES if alias != "default"],
+    "PIN_SECONDS": int(os.environ.get("POSTGRES_REPLICA_PIN_SECONDS", 10)),
+}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.CommonPasswordValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
+    },
+]
+
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework_simplejwt.authentication.JWTAuthentication',
+    ],
+    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    'DEFAULT_FILTER_BACKENDS': [
+        'django_filters.rest_framework.DjangoFilterBackend'
+    ],
+    "DEFAULT_PAGINATION_CLASS": "airport_app.pagination.CustomPageNumberPagination",
+    "PAGE_SIZE": 5,
+}
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.2/topics/i18n/
+
+LANGUAGE_CODE = "en-us"
+
+TIME_ZONE = "UTC"
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.2/howto/static-files/
+
+STATIC_URL = "/static/"
+STATIC_ROOT = "/files/static"
+
+MEDIA_ROOT = "/files/media"
+MEDIA_URL = "/media/"
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+AUTH_USER_MODEL = "user.User"
+
+SIMPLE_JWT = {
+   "ACCESS_TOKEN_LIFETIME": timedelta(minutes=800),
+   "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
+   "ROTATE_REFRESH_TOKENS": True,
+}
+
+# Every worker shares this cache: the generations that invalidate cached
+# responses, the CROSS_PROCESS_LOCK keys, the autocomplete index version
+# and the replica read pins only hold across processes through it.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("REDIS_URL", "redis://localhost:6379/0"),
+    }
+}
+
+AIRPORT_CACHE = {
+    "TIMEOUT": int(os.environ.get("AIRPORT_CACHE_TIMEOUT", 60)),
+    "STALE_WHILE_REVALIDATE": int(
+        os.environ.get("AIRPORT_CACHE_STALE_WHILE_REVALIDATE", 30)
+    ),
+    "CROSS_PROCESS_LOCK": (
+        os.environ.get("AIRPORT_CACHE_CROSS_PROCESS_LOCK", "0") == "1"
+    ),
+    "LOCK_TIMEOUT": 10,
+}
+
+# Server-Sent Events. The in-process broker serves a single ASGI worker;
+# set AIRPORT_EVENTS_BROKER=airport_app.utils.events.PostgresBroker to
+# share events between workers and nodes over LISTEN/NOTIFY.
+AIRPORT_EVENTS = {
+    "BROKER": os.environ.get(
+        "AIRPORT_EVENTS_BROKER", "airport_app.utils.events.InProcessBroker"
+    ),
+    "HEARTBEAT": int(os.environ.get("AIRPORT_EVENTS_HEARTBEAT", 15)),
+    "QUEUE_SIZE": 100,
+}
+
+# Request metrics, scraped from /metrics. Set AIRPORT_METRICS_TOKEN to
+# require "Authorization: Bearer <token>", the prod profile refuses to
+# start without it. Under several worker processes set
+# PROMETHEUS_MULTIPROC_DIR to an empty directory shared by them.
+AIRPORT_METRICS = {
+    "ENABLED": os.environ.get("AIRPORT_METRICS_ENABLED", "1") == "1",
+    "TOKEN": os.environ.get("AIRPORT_METRICS_TOKEN", ""),
+}
+
+# Opt-in slow query log: set AIRPORT_SLOW_QUERY_MS to record every query
+# that takes at least that long, with its EXPLAIN plan, in the admin at
+# /admin/slow-queries/ and in AIRPORT_SLOW_QUERY_LOG when it is set.
+AIRPORT_SLOW_QUERIES = {
+    "ENABLED": bool(os.environ.get("AIRPORT_SLOW_QUERY_MS")),
+    "THRESHOLD_MS": float(os.environ.get("AIRPORT_SLOW_QUERY_MS") or 200),
+    "BUFFER_SIZE": int(os.environ.get("AIRPORT_SLOW_QUERY_BUFFER", 200)),
+    "EXPLAIN": True,
+    "LOG_FILE": os.environ.get("AIRPORT_SLOW_QUERY_LOG", ""),
+    "LOG_PARAMS": (
+        os.environ.get("AIRPORT_SLOW_QUERY_LOG_PARAMS", "0") == "1"
+    ),
+}
+
+# Check the queries of viewset actions against their
+# action_query_budgets: "warn" logs requests over budget and "raise" fails
+# them. The test profile raises.
+AIRPORT_QUERY_BUDGETS = {
+    "MODE": os.environ.get("AIRPORT_QUERY_BUDGETS", "off"),
+}
+
+# Log relations that a request loads one object at a time, with the
+# select_related/prefetch_related lookup that avoids it. On in the dev
+# profile, set AIRPORT_N_PLUS_ONE=1 to turn it on elsewhere, e.g. staging.
+AIRPORT_N_PLUS_ONE = {
+    "ENABLED": os.environ.get("AIRPORT_N_PLUS_ONE", "0") == "1",
+    "THRESHOLD": 2,
+}
+
+# Staff users add ?_profile=cprofile or ?_profile=alloc to an API request
+# to get its cProfile or tracemalloc report. The latest KEEP reports are
+# stored in DIRECTORY and listed at /admin/profiles/. On in the dev
+# profile, elsewhere set AIRPORT_PROFILING=1.
+AIRPORT_PROFILING = {
+    "ENABLED": os.environ.get("AIRPORT_PROFILING", "0") == "1",
+    "DIRECTORY": os.environ.get(
+        "AIRPORT_PROFILE_DIRECTORY", "/files/profiles"
+    ),
+    "KEEP": int(os.environ.get("AIRPORT_PROFILE_KEEP", 50)),
+    "TOP": 40,
+    "ALLOC_FRAMES": 10,
+}
+
+# Trace SAMPLE_RATE of the requests when AIRPORT_TRACE_FILE is set: spans
+# for authentication, permissions, querysets, SQL, serialization and
+# rendering, appended to the file as OTLP JSON, one trace per line.
+AIRPORT_TRACING = {
+    "ENABLED": bool(os.environ.get("AIRPORT_TRACE_FILE")),
+    "SAMPLE_RATE": float(os.environ.get("AIRPORT_TRACE_SAMPLE_RATE", 0.1)),
+    "EXPORTER": "airport_app.utils.tracing.JsonFileExporter",
+    "FILE": os.environ.get("AIRPORT_TRACE_FILE", ""),
+    "SERVICE_NAME": "airport",
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {},
+    "loggers": {},
+}
+
+if AIRPORT_SLOW_QUERIES["LOG_FILE"]:
+    LOGGING["handlers"]["slow_queries"] = {
+        "class": "logging.handlers.RotatingFileHandler",
+        "filename": AIRPORT_SLOW_QUERIES["LOG_FILE"],
+        "maxBytes": 10 * 1024 * 1024,
+        "backupCount": 5,
+    }
+    LOGGING["loggers"]["airport_app.utils.slow_queries"] = {
+        "handlers": ["slow_queries"],
+        "level": "WARNING",
+    }
+
+# Written by manage.py build_schema and served by /api/schema/.
+AIRPORT_SCHEMA = {
+    "DIRECTORY": os.environ.get(
+        "AIRPORT_SCHEMA_DIRECTORY", BASE_DIR / "build" / "schema"
+    ),
+}
+
+SPECTACULAR_SETTINGS = {
+    "TITLE": "Airport API",
+    "DESCRIPTION": "Manage flights, routes, tickets, and users in the airport system.",
+    "VERSION": "1.0.0",
+    "SERVE_INCLUDE_SCHEMA": False,
+    "DEFAULT_GENERATOR_CLASS": (
+        "airport_app.utils.schema_artifact.SchemaGenerator"
+    ),
+    "SWAGGER_UI_SETTINGS": {
+        "deepLinking": True,
+        "defaultModelsRendering": "model",
+        "defaultModelsExpandDepth": 2,
+        "defaultModelExpandDepth": 2,
+    },
+}
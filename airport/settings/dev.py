@@ -0,0 +1,37 @@
+"""
+Local development: DEBUG, the debug toolbar, the N+1 detector and
+request profiling.
+"""
+from airport.settings.base import *  # noqa: F401, F403
+from airport.settings.base import (
+    AIRPORT_N_PLUS_ONE,
+    AIRPORT_PROFILING,
+    INSTALLED_APPS,
+    MIDDLEWARE,
+    SECRET_KEY,
+)
+
+DJANGO_ENV = "dev"
+
+SECRET_KEY = SECRET_KEY or "django-insecure-development-only"
+
+DEBUG = True
+
+INSTALLED_APPS = [*INSTALLED_APPS, "debug_toolbar"]
+
+# The toolbar goes as early as possible, right after SecurityMiddleware.
+_security = MIDDLEWARE.index("django.middleware.security.SecurityMiddleware")
+MIDDLEWARE = [
+    *MIDDLEWARE[:_security + 1],
+    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    *MIDDLEWARE[_security + 1:],
+]
+
+INTERNAL_IPS = [
+    "127.0.0.1",
+    "localhost",
+]
+
+AIRPORT_N_PLUS_ONE = {**AIRPORT_N_PLUS_ONE, "ENABLED": True}
+
+AIRPORT_PROFILING = {**AIRPORT_PROFILING, "ENABLED": True}
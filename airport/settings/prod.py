@@ -0,0 +1,62 @@
+"""
+Production: no debug tooling in the request path, cached template
+loaders, persistent database connections and console logging.
+"""
+import os
+from copy import deepcopy
+
+from airport.settings.base import *  # noqa: F401, F403
+from airport.settings.base import DATABASES, LOGGING, TEMPLATES
+
+DJANGO_ENV = "prod"
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get("DJANGO_ALLOWED_HOSTS", "localhost").split(",")
+    if host.strip()
+]
+
+# Templates are read once per process instead of on every render.
+TEMPLATES = deepcopy(TEMPLATES)
+TEMPLATES[0]["APP_DIRS"] = False
+TEMPLATES[0]["OPTIONS"]["loaders"] = [
+    (
+        "django.template.loaders.cached.Loader",
+        [
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ],
+    ),
+]
+
+# Keep connections for ten minutes unless POSTGRES_CONN_MAX_AGE or the
+# pool says otherwise.
+if "POSTGRES_CONN_MAX_AGE" not in os.environ:
+    for database in DATABASES.values():
+        if "pool" not in database["OPTIONS"]:
+            database["CONN_MAX_AGE"] = 600
+
+# The slow query log keeps its file handler from the base settings.
+LOGGING = deepcopy(LOGGING)
+LOGGING["formatters"] = {
+    "console": {
+        "format": (
+            "%(asctime)s %(levelname)s %(process)d %(name)s %(message)s"
+        ),
+    },
+}
+LOGGING["handlers"]["console"] = {
+    "class": "logging.StreamHandler",
+    "formatter": "console",
+}
+LOGGING["root"] = {
+    "handlers": ["console"],
+    "level": os.environ.get("DJANGO_LOG_LEVEL", "INFO"),
+}
+LOGGING["loggers"].update({
+    # 4xx responses are logged by the access log of the server.
+    "django.request": {"level": "ERROR"},
+    "django.db.backends": {"level": "WARNING"},
+})
@@ -0,0 +1,30 @@
+"""
+Test runs: no debug tooling, a per-process cache, cheap password hashing,
+a mirror replica and viewset query budgets that fail the request when
+exceeded.
+"""
+from copy import deepcopy
+
+from airport.settings.base import *  # noqa: F401, F403
+from airport.settings.base import AIRPORT_REPLICAS, DATABASES, SECRET_KEY
+
+DJANGO_ENV = "test"
+
+SECRET_KEY = SECRET_KEY or "django-insecure-test-only"
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+AIRPORT_QUERY_BUDGETS = {"MODE": "raise"}
+
+# Without POSTGRES_REPLICA_HOSTS, a replica alias that mirrors the primary
+# lets the replica routing tests run. It only sees committed rows.
+if not AIRPORT_REPLICAS["DATABASES"]:
+    DATABASES["replica1"] = {
+        **deepcopy(DATABASES["default"]),
+        "TEST": {"MIRROR": "default"},
+    }
+    AIRPORT_REPLICAS = {**AIRPORT_REPLICAS, "DATABASES": ["replica1"]}
@@ -18,30 +18,61 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-    SpectacularRedocView
-)
+
+from airport_app.admin import profile_download, profiles, slow_queries
+from airport_app.utils.profiling import STATS_SUFFIX
+from airport_app.utils.lazy import lazy_view
+from airport_app.views import metrics
 
 urlpatterns = [
+    path(
+        "admin/slow-queries/",
+        admin.site.admin_view(slow_queries),
+        name="admin-slow-queries",
+    ),
+    path(
+        "admin/profiles/",
+        admin.site.admin_view(profiles),
+        name="admin-profiles",
+    ),
+    path(
+        "admin/profiles/<str:profile_id>/",
+        admin.site.admin_view(profile_download),
+        name="admin-profile",
+    ),
+    path(
+        "admin/profiles/<str:profile_id>/stats/",
+        admin.site.admin_view(profile_download),
+        {"suffix": STATS_SUFFIX},
+        name="admin-profile-stats",
+    ),
     path("admin/", admin.site.urls),
+    path("metrics", metrics, name="metrics"),
     path("api/airport/", include("airport_app.urls", namespace="airport_app")),
     path("api/user/", include("user.urls", namespace="user")),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    # Schema views load drf-spectacular's generator, import them lazily.
+    path(
+        "api/schema/",
+        lazy_view("airport_app.schema_views.SchemaView"),
+        name="schema"
+    ),
     path(
         "api/schema/swagger/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
+        lazy_view(
+            "drf_spectacular.views.SpectacularSwaggerView", url_name="schema"
+        ),
         name="swagger-ui"
     ),
     path(
         "api/schema/redoc/",
-        SpectacularRedocView.as_view(url_name="schema"),
+        lazy_view(
+            "drf_spectacular.views.SpectacularRedocView", url_name="schema"
+        ),
         name="redoc"
     ),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
-if settings.DEBUG:
+if "debug_toolbar" in settings.INSTALLED_APPS:
     urlpatterns += [
         path('__debug__/', include('debug_toolbar.urls'))
     ]
@@ -1,4 +1,9 @@
+import json
+
 from django.contrib import admin
+from django.http import FileResponse, Http404
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
 
 from .models import (
     Country,
@@ -6,20 +11,93 @@ from .models import (
     Crew,
     Airport,
     Route,
+    RouteAvailability,
     AirplaneType,
     Airplane,
     Flight,
     Order,
     Ticket,
 )
+from .utils.profiling import (
+    REPORT_SUFFIX,
+    STATS_SUFFIX,
+    get_profiling_settings,
+    get_store,
+)
+from .utils.slow_queries import get_buffer, get_slow_query_settings
+
+
+@admin.register(Crew)
+class CrewAdmin(admin.ModelAdmin):
+    list_display = ("search_full_name", "position")
+    list_filter = ("position",)
+    search_fields = ("search_full_name",)
+
 
 admin.site.register(Country)
 admin.site.register(City)
-admin.site.register(Crew)
 admin.site.register(Airport)
 admin.site.register(Route)
+admin.site.register(RouteAvailability)
 admin.site.register(AirplaneType)
 admin.site.register(Airplane)
 admin.site.register(Flight)
 admin.site.register(Order)
 admin.site.register(Ticket)
+
+
+def slow_queries(request):
+    """List the slow queries recorded by this process, newest first."""
+    buffer = get_buffer()
+    if request.method == "POST":
+        buffer.clear()
+        return redirect("admin-slow-queries")
+
+    config = get_slow_query_settings()
+    records = [
+        {
+            **record,
+            "plan_text": (
+                json.dumps(record["plan"], indent=2) if record["plan"] else ""
+            ),
+        }
+        for record in reversed(buffer.records())
+    ]
+    context = {
+        **admin.site.each_context(request),
+        "title": "Slow queries",
+        "enabled": config["ENABLED"],
+        "threshold_ms": config["THRESHOLD_MS"],
+        "records": records,
+    }
+    return TemplateResponse(
+        request, "admin/airport_app/slow_queries.html", context
+    )
+
+
+def profiles(request):
+    """List the stored request profiles, newest first."""
+    store = get_store()
+    context = {
+        **admin.site.each_context(request),
+        "title": "Request profiles",
+        "enabled": get_profiling_settings()["ENABLED"],
+        "profiles": [
+            {
+                "id": profile_id,
+                "has_stats": store.path(profile_id, STATS_SUFFIX) is not None,
+            }
+            for profile_id in store.profiles()
+        ],
+    }
+    return TemplateResponse(
+        request, "admin/airport_app/profiles.html", context
+    )
+
+
+def profile_download(request, profile_id, suffix=REPORT_SUFFIX):
+    """Download the report, or the pstats dump, of a stored profile."""
+    path = get_store().path(profile_id, suffix)
+    if path is None:
+        raise Http404("No such profile.")
+    return FileResponse(path.open("rb"), as_attachment=True)
@@ -4,3 +4,56 @@ from django.apps import AppConfig
 class AirportAppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "airport_app"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from airport_app import signals  # noqa: F401
+        from airport_app.checks import (
+            refuse_debug_tooling,
+            refuse_public_metrics,
+            refuse_unshared_cache_lock,
+        )
+        from airport_app.utils.metrics import (
+            get_metrics_settings,
+            install_query_counter,
+            instrument_serializers,
+        )
+        from airport_app.utils.n_plus_one import (
+            get_n_plus_one_settings,
+            install_n_plus_one_detector,
+        )
+        from airport_app.utils.query_budget import (
+            get_query_budget_settings,
+            install_query_recorder,
+        )
+        from airport_app.utils.slow_queries import (
+            get_slow_query_settings,
+            install_slow_query_log,
+        )
+        from airport_app.utils.tracing import (
+            get_tracing_settings,
+            install_sql_tracing,
+            install_tracing,
+        )
+
+        refuse_debug_tooling()
+        refuse_unshared_cache_lock()
+        refuse_public_metrics()
+
+        if get_metrics_settings()["ENABLED"]:
+            connection_created.connect(install_query_counter)
+            instrument_serializers()
+
+        if get_slow_query_settings()["ENABLED"]:
+            connection_created.connect(install_slow_query_log)
+
+        if get_query_budget_settings()["MODE"] != "off":
+            connection_created.connect(install_query_recorder)
+
+        if get_n_plus_one_settings()["ENABLED"]:
+            install_n_plus_one_detector()
+
+        if get_tracing_settings()["ENABLED"]:
+            install_tracing()
+            connection_created.connect(install_sql_tracing)
@@ -0,0 +1,76 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+DEBUG_APPS = ("debug_toolbar",)
+
+# Cache backends that each process keeps to itself.
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def debug_tooling_problems() -> list:
+    """List the debug settings that must not reach production."""
+    problems = []
+    if settings.DEBUG:
+        problems.append("DEBUG is on")
+    for app in DEBUG_APPS:
+        if app in settings.INSTALLED_APPS:
+            problems.append(f"{app} is in INSTALLED_APPS")
+        problems.extend(
+            f"{middleware} is in MIDDLEWARE"
+            for middleware in settings.MIDDLEWARE
+            if middleware.startswith(f"{app}.")
+        )
+    return problems
+
+
+def refuse_debug_tooling():
+    """
+    Stop a production process from starting with debug tooling, which
+    slows every request and keeps every SQL query in memory.
+    """
+    if getattr(settings, "DJANGO_ENV", None) != "prod":
+        return
+    problems = debug_tooling_problems()
+    if problems:
+        raise ImproperlyConfigured(
+            "Production settings refuse debug tooling: "
+            + "; ".join(problems)
+            + "."
+        )
+
+
+def refuse_unshared_cache_lock():
+    """
+    CROSS_PROCESS_LOCK coordinates workers through cache.add, which a
+    process-local cache cannot do.
+    """
+    from airport_app.utils.cache import get_cache_settings
+
+    if not get_cache_settings()["CROSS_PROCESS_LOCK"]:
+        return
+    backend = settings.CACHES["default"]["BACKEND"]
+    if backend in PROCESS_LOCAL_CACHES:
+        raise ImproperlyConfigured(
+            f"AIRPORT_CACHE['CROSS_PROCESS_LOCK'] needs a cache shared by "
+            f"the workers, {backend} is local to each process."
+        )
+
+
+def refuse_public_metrics():
+    """
+    /metrics names every view and its traffic, so production only
+    serves it to scrapers that send AIRPORT_METRICS["TOKEN"].
+    """
+    from airport_app.utils.metrics import get_metrics_settings
+
+    if getattr(settings, "DJANGO_ENV", None) != "prod":
+        return
+    config = get_metrics_settings()
+    if config["ENABLED"] and not config["TOKEN"]:
+        raise ImproperlyConfigured(
+            "Production settings refuse public metrics: set "
+            "AIRPORT_METRICS_TOKEN, or AIRPORT_METRICS_ENABLED=0."
+        )
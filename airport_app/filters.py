@@ -0,0 +1,202 @@
+from datetime import datetime, time, timedelta
+
+import django_filters
+from django import forms
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+from airport_app.models import LARGE_AIRPLANE_CAPACITY, Airplane, Flight
+
+
+class TrigramSearchFilter(SearchFilter):
+    """
+    Drop-in replacement for ``SearchFilter``. Matching stays
+    ``icontains`` (served by the pg_trgm GIN indexes), and results are
+    ranked by trigram similarity to the search terms unless the client
+    asked for an explicit ordering.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        queryset = super().filter_queryset(request, queryset, view)
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if (
+            not search_fields
+            or not search_terms
+            or api_settings.ORDERING_PARAM in request.query_params
+        ):
+            return queryset
+
+        term = " ".join(search_terms)
+        similarities = [
+            TrigramSimilarity(field.lstrip("^=@$"), term)
+            for field in search_fields
+        ]
+        rank = (
+            similarities[0]
+            if len(similarities) == 1
+            else Greatest(*similarities)
+        )
+        ordering = queryset.query.order_by or ("pk",)
+        return queryset.annotate(search_rank=rank).order_by(
+            "-search_rank", *ordering
+        )
+
+
+class AirplaneFilterSet(django_filters.FilterSet):
+    is_large = django_filters.BooleanFilter(method="filter_is_large")
+    capacity_min = django_filters.NumberFilter(
+        field_name="seat_capacity", lookup_expr="gte"
+    )
+    capacity_max = django_filters.NumberFilter(
+        field_name="seat_capacity", lookup_expr="lte"
+    )
+    ordering = django_filters.OrderingFilter(
+        fields=(("id", "id"), ("name", "name"), ("seat_capacity", "capacity"))
+    )
+
+    class Meta:
+        model = Airplane
+        fields = ["airplane_type"]
+
+    def filter_is_large(self, queryset, name, value):
+        if value:
+            return queryset.filter(seat_capacity__gt=LARGE_AIRPLANE_CAPACITY)
+        return queryset.filter(seat_capacity__lte=LARGE_AIRPLANE_CAPACITY)
+
+
+MAX_WINDOW_DAYS = 31
+DEPARTURE_WINDOW_FILTERS = (
+    "departure_date",
+    "departure_time_from",
+    "departure_time_to",
+)
+
+
+class FlightFilterForm(forms.Form):
+    def clean(self):
+        data = super().clean()
+        after = data.get("departure_after")
+        before = data.get("departure_before")
+        if after and before and after >= before:
+            raise forms.ValidationError(
+                "departure_after must be earlier than departure_before."
+            )
+
+        has_time_window = (
+            data.get("departure_time_from") or data.get("departure_time_to")
+        )
+        if has_time_window and not data.get("departure_date"):
+            if not (after and before):
+                raise forms.ValidationError(
+                    "A time-of-day window needs departure_date or both "
+                    "departure_after and departure_before."
+                )
+            if (before - after).days > MAX_WINDOW_DAYS:
+                raise forms.ValidationError(
+                    f"A time-of-day window may span at most "
+                    f"{MAX_WINDOW_DAYS} days."
+                )
+        return data
+
+
+class FlightFilterSet(django_filters.FilterSet):
+    """
+    Date filters compile to half-open ``departure_time`` ranges instead
+    of ``__date``/``__time`` casts, so they can use the departure index.
+    """
+
+    departure_after = django_filters.IsoDateTimeFilter(
+        field_name="departure_time", lookup_expr="gte"
+    )
+    departure_before = django_filters.IsoDateTimeFilter(
+        field_name="departure_time", lookup_expr="lt"
+    )
+    departure_date = django_filters.DateFilter()
+    departure_time_from = django_filters.TimeFilter()
+    departure_time_to = django_filters.TimeFilter()
+    min_capacity = django_filters.NumberFilter(
+        field_name="airplane__seat_capacity", lookup_expr="gte"
+    )
+    duration_min = django_filters.DurationFilter(
+        field_name="scheduled_duration", lookup_expr="gte"
+    )
+    duration_max = django_filters.DurationFilter(
+        field_name="scheduled_duration", lookup_expr="lte"
+    )
+    ordering = django_filters.OrderingFilter(
+        fields=(
+            ("departure_time", "departure_time"),
+            ("arrival_time", "arrival_time"),
+            ("scheduled_duration", "duration"),
+        )
+    )
+
+    class Meta:
+        model = Flight
+        form = FlightFilterForm
+        fields = [
+            "route",
+            "airplane",
+            "is_active",
+            "departure_time",
+            "arrival_time",
+        ]
+
+    def filter_queryset(self, queryset):
+        window = {
+            name: self.form.cleaned_data.pop(name, None)
+            for name in DEPARTURE_WINDOW_FILTERS
+        }
+        queryset = super().filter_queryset(queryset)
+        return self.filter_departure_window(queryset, **window)
+
+    def filter_departure_window(
+        self,
+        queryset,
+        departure_date=None,
+        departure_time_from=None,
+        departure_time_to=None,
+    ):
+        if departure_date:
+            days = [departure_date]
+        elif departure_time_from or departure_time_to:
+            tz = timezone.get_current_timezone()
+            first = self.form.cleaned_data["departure_after"]
+            last = self.form.cleaned_data["departure_before"]
+            first, last = first.astimezone(tz), last.astimezone(tz)
+            days = [
+                first.date() + timedelta(days=offset)
+                for offset in range((last.date() - first.date()).days + 1)
+            ]
+        else:
+            return queryset
+
+        windows = Q()
+        for day in days:
+            start, end = departure_window(
+                day, departure_time_from, departure_time_to
+            )
+            windows |= Q(departure_time__gte=start, departure_time__lt=end)
+        return queryset.filter(windows)
+
+
+def departure_window(day, start_time=None, end_time=None):
+    """
+    Return the aware [start, end) bounds of a time-of-day window on
+    ``day``. A window whose end is not after its start wraps past
+    midnight.
+    """
+    tz = timezone.get_current_timezone()
+    start = datetime.combine(day, start_time or time.min, tzinfo=tz)
+    if end_time is None:
+        end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=tz)
+    else:
+        end = datetime.combine(day, end_time, tzinfo=tz)
+        if end <= start:
+            end += timedelta(days=1)
+    return start, end
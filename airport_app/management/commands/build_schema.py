@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from airport_app.utils.schema_artifact import build_schema_artifacts
+
+
+class Command(BaseCommand):
+    help = "Build the gzipped OpenAPI schema files served by /api/schema/"
+
+    def handle(self, *args, **options):
+        for path in build_schema_artifacts():
+            self.stdout.write(self.style.SUCCESS(f"Wrote {path}"))
@@ -0,0 +1,173 @@
+import json
+import subprocess
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from airport_app.utils.loadtest import (
+    DEFAULT_MIX,
+    Targets,
+    parse_mix,
+    run,
+    seed,
+)
+
+COLUMNS = (
+    ("requests", "requests"),
+    ("throughput_rps", "req/s"),
+    ("p50_ms", "p50 ms"),
+    ("p95_ms", "p95 ms"),
+    ("p99_ms", "p99 ms"),
+    ("error_rate", "errors"),
+    ("rejected", "4xx"),
+)
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed data at scale and run a mix of browsing, search, login and "
+        "concurrent booking against a running server"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            default="http://127.0.0.1:8000",
+            help="Server to load, it must use this project's database.",
+        )
+        parser.add_argument(
+            "--seed",
+            action="store_true",
+            help="Replace the seeded data before the run.",
+        )
+        parser.add_argument("--no-run", action="store_true")
+        parser.add_argument("--airports", type=int, default=50)
+        parser.add_argument("--routes", type=int, default=200)
+        parser.add_argument("--flights", type=int, default=2000)
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument(
+            "--mix",
+            default=",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()),
+            help="Scenario weights, e.g. browse=50,search=20,order=30.",
+        )
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument(
+            "--duration", type=float, default=30, help="Seconds to run."
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=0,
+            help="Stop after this many requests instead.",
+        )
+        parser.add_argument(
+            "--hot-flights",
+            type=int,
+            default=5,
+            help="Flights that all the orders compete for.",
+        )
+        parser.add_argument(
+            "--output",
+            help="JSON file for the results, "
+            "by default build/loadtest/<time>-<commit>.json.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options["mix"])
+        except ValueError as error:
+            raise CommandError(error)
+
+        if options["seed"]:
+            try:
+                counts = seed(
+                    airports=options["airports"],
+                    routes=options["routes"],
+                    flights=options["flights"],
+                    users=options["users"],
+                )
+            except ValueError as error:
+                raise CommandError(error)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    "Seeded "
+                    + ", ".join(f"{n} {name}" for name, n in counts.items())
+                )
+            )
+        if options["no_run"]:
+            return
+
+        try:
+            targets = Targets(hot_flights=options["hot_flights"])
+        except ValueError as error:
+            raise CommandError(error)
+
+        started_at = timezone.now()
+        summary = run(
+            options["url"],
+            targets,
+            mix,
+            threads=options["threads"],
+            duration=options["duration"],
+            requests=options["requests"],
+        )
+        commit = current_commit()
+        result = {
+            "started_at": started_at.isoformat(),
+            "commit": commit,
+            "url": options["url"],
+            "threads": options["threads"],
+            "mix": mix,
+            **summary,
+        }
+
+        self.write_table(summary)
+        output = Path(
+            options["output"]
+            or Path(settings.BASE_DIR)
+            / "build"
+            / "loadtest"
+            / f"{started_at:%Y%m%dT%H%M%S}-{commit or 'unknown'}.json"
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(result, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Wrote {output}"))
+
+    def write_table(self, summary):
+        rows = [("endpoint", *(title for _, title in COLUMNS))]
+        for endpoint, stats in (
+            *summary["endpoints"].items(),
+            ("total", summary["total"]),
+        ):
+            rows.append(
+                (
+                    endpoint,
+                    *(
+                        "-" if stats[key] is None else str(stats[key])
+                        for key, _ in COLUMNS
+                    ),
+                )
+            )
+        widths = [max(map(len, column)) for column in zip(*rows)]
+        for row in rows:
+            self.stdout.write(
+                "  ".join(
+                    cell.ljust(width) if index == 0 else cell.rjust(width)
+                    for index, (cell, width) in enumerate(zip(row, widths))
+                )
+            )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from airport_app.utils.availability import rebuild_availability
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-route daily availability calendar"
+
+    def handle(self, *args, **options):
+        days = rebuild_availability()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt availability for {days} route days.")
+        )
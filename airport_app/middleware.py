@@ -0,0 +1,231 @@
+from abc import ABC, abstractmethod
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+
+from airport_app.utils.metrics import (
+    get_metrics_settings,
+    record_request,
+    track_request,
+    view_labels,
+)
+from airport_app.utils.n_plus_one import (
+    detect_n_plus_one,
+    get_n_plus_one_settings,
+    report_n_plus_one,
+)
+from airport_app.utils.profiling import (
+    busy_response,
+    get_profiling_settings,
+    is_staff,
+    profile_response,
+    profiling,
+    requested_profiler,
+)
+from airport_app.utils.query_budget import (
+    MODES,
+    capture_queries,
+    check_request_budget,
+    get_query_budget_settings,
+)
+from airport_app.utils.slow_queries import (
+    get_slow_query_settings,
+    track_queries,
+)
+from airport_app.utils.tracing import (
+    export_trace,
+    get_tracing_settings,
+    trace_request,
+)
+
+
+class RequestHookMiddleware(ABC):
+    """
+    Base of the middleware that wrap each request, sync or async, in the
+    context manager returned by ``around``. ``finish`` then receives the
+    response and the value of the context manager; the middleware is not
+    used when ``enabled`` is false.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not self.enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    @abstractmethod
+    def enabled(self) -> bool:
+        """Whether the middleware is used, read once at startup."""
+
+    @abstractmethod
+    def around(self, request):
+        """The context manager that wraps the rest of the chain."""
+
+    def finish(self, request, response, state):
+        return response
+
+    async def afinish(self, request, response, state):
+        return self.finish(request, response, state)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        with self.around(request) as state:
+            response = self.get_response(request)
+        return self.finish(request, response, state)
+
+    async def __acall__(self, request):
+        with self.around(request) as state:
+            response = await self.get_response(request)
+        return await self.afinish(request, response, state)
+
+
+class MetricsMiddleware(RequestHookMiddleware):
+    """
+    Record latency, SQL queries, serializer time and response size per
+    (view, action, status). Supports both sync and async requests, so
+    the async views and event streams stay on the event loop.
+    """
+
+    def enabled(self) -> bool:
+        return get_metrics_settings()["ENABLED"]
+
+    def around(self, request):
+        return track_request()
+
+    def finish(self, request, response, stats):
+        record_request(request, response, stats)
+        return response
+
+
+class SlowQueryMiddleware(RequestHookMiddleware):
+    """
+    Make the current request known to the slow query log, which labels
+    each slow query with the view and action that ran it.
+    """
+
+    def enabled(self) -> bool:
+        return get_slow_query_settings()["ENABLED"]
+
+    def around(self, request):
+        return track_queries(request)
+
+
+class QueryBudgetMiddleware(RequestHookMiddleware):
+    """
+    Check the queries of each viewset request against the
+    ``action_query_budgets`` of its viewset, listing every query with the
+    code that ran it when the budget is exceeded.
+    """
+
+    def enabled(self) -> bool:
+        self.mode = get_query_budget_settings()["MODE"]
+        if self.mode not in MODES:
+            raise ImproperlyConfigured(
+                f"AIRPORT_QUERY_BUDGETS['MODE'] must be one of {MODES}."
+            )
+        return self.mode != "off"
+
+    def around(self, request):
+        return capture_queries()
+
+    def finish(self, request, response, log):
+        check_request_budget(request, log, self.mode)
+        return response
+
+
+class NPlusOneMiddleware(RequestHookMiddleware):
+    """
+    Log the relations a request loaded one object at a time, with the
+    lookup path to pass to select_related or prefetch_related.
+    """
+
+    def enabled(self) -> bool:
+        return get_n_plus_one_settings()["ENABLED"]
+
+    def around(self, request):
+        return detect_n_plus_one()
+
+    def finish(self, request, response, detector):
+        report_n_plus_one(".".join(view_labels(request)), detector)
+        return response
+
+
+class ProfilingMiddleware(RequestHookMiddleware):
+    """
+    Profile the requests of staff users that add ``?_profile=cprofile``
+    or ``?_profile=alloc``. The response is the cProfile or tracemalloc
+    report, also stored for download from the admin. Other requests,
+    and those that arrive while another one is profiled, skip the hooks.
+    """
+
+    def enabled(self) -> bool:
+        return get_profiling_settings()["ENABLED"]
+
+    def around(self, request):
+        return profiling(requested_profiler(request))
+
+    def finish(self, request, response, profile):
+        return profile_response(
+            request, requested_profiler(request), profile, response
+        )
+
+    async def afinish(self, request, response, profile):
+        return await sync_to_async(self.finish)(request, response, profile)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if requested_profiler(request) is None or not is_staff(request):
+            return self.get_response(request)
+        with self.around(request) as profile:
+            if profile is None:
+                return busy_response()
+            response = self.get_response(request)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        if requested_profiler(request) is None or not await sync_to_async(
+            is_staff
+        )(request):
+            return await self.get_response(request)
+        # Only the event loop thread is profiled, not the sync code that
+        # async views hand over to worker threads.
+        with self.around(request) as profile:
+            if profile is None:
+                return busy_response()
+            response = await self.get_response(request)
+        return await self.afinish(request, response, profile)
+
+
+class TracingMiddleware(RequestHookMiddleware):
+    """
+    Trace a sample of the requests: a span per phase, exported as OTLP
+    JSON once the response is ready.
+    """
+
+    def enabled(self) -> bool:
+        return get_tracing_settings()["ENABLED"]
+
+    def around(self, request):
+        return trace_request(request)
+
+    def finish(self, request, response, trace):
+        if trace is not None:
+            export_trace(trace, response)
+        return response
+
+    async def afinish(self, request, response, trace):
+        # Exporters write files or call collectors, off the event loop.
+        if trace is not None:
+            await sync_to_async(export_trace)(trace, response)
+        return response
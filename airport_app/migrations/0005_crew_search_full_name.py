@@ -0,0 +1,39 @@
+# Generated by Django 5.2 on 2026-10-19 09:59
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport_app", "0004_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="crew",
+            name="search_full_name",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.text.Concat(
+                    "first_name",
+                    models.Value(" "),
+                    "last_name",
+                    output_field=models.CharField(),
+                ),
+                output_field=models.CharField(max_length=511),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="crew",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("search_full_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="crew_full_name_trgm_idx",
+            ),
+        ),
+    ]
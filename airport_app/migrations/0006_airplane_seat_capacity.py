@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-19 10:00
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport_app", "0005_crew_search_full_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="airplane",
+            name="seat_capacity",
+            field=models.GeneratedField(
+                db_index=True,
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    models.F("rows"), "*", models.F("seats_in_row")
+                ),
+                output_field=models.PositiveIntegerField(),
+            ),
+        ),
+    ]
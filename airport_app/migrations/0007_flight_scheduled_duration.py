@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-19 10:01
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport_app", "0006_airplane_seat_capacity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flight",
+            name="scheduled_duration",
+            field=models.GeneratedField(
+                db_index=True,
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    models.F("arrival_time"), "-", models.F("departure_time")
+                ),
+                output_field=models.DurationField(),
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport_app", "0007_flight_scheduled_duration"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["departure_time"], name="flight_departure_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-19 10:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport_app", "0008_flight_departure_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RouteAvailability",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("flights_count", models.PositiveIntegerField(default=0)),
+                ("min_free_seats", models.PositiveIntegerField(default=0)),
+                ("max_free_seats", models.PositiveIntegerField(default=0)),
+                (
+                    "route",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="availability",
+                        to="airport_app.route",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "route availability",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("route", "date"),
+                        name="unique_route_availability_day",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,11 +1,15 @@
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Concat, Upper
 
 from airport_app.utils.helpers import airplane_image_path
 
 User = get_user_model()
 
+LARGE_AIRPLANE_CAPACITY = 200
+
 
 class Country(models.Model):
     name = models.CharField(max_length=255)
@@ -17,6 +21,12 @@ class Country(models.Model):
                 fields=["name", "code"], name="unique_country_name_code"
             )
         ]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="country_name_trgm_idx",
+            )
+        ]
 
     def __str__(self):
         return self.name
@@ -34,6 +44,12 @@ class City(models.Model):
                 fields=["name", "country"], name="unique_city_per_country"
             )
         ]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="city_name_trgm_idx",
+            )
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.country.code}"
@@ -54,6 +70,24 @@ class Crew(models.Model):
         choices=Position,
         default=Position.CREW_MEMBER,
     )
+    search_full_name = models.GeneratedField(
+        expression=Concat(
+            "first_name",
+            models.Value(" "),
+            "last_name",
+            output_field=models.CharField(),
+        ),
+        output_field=models.CharField(max_length=511),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            GinIndex(
+                OpClass(Upper("search_full_name"), name="gin_trgm_ops"),
+                name="crew_full_name_trgm_idx",
+            )
+        ]
 
     @property
     def full_name(self):
@@ -69,6 +103,14 @@ class Airport(models.Model):
         City, on_delete=models.CASCADE, related_name="airports"
     )
 
+    class Meta:
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="airport_name_trgm_idx",
+            )
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.city})"
 
@@ -108,6 +150,14 @@ class Route(models.Model):
 class AirplaneType(models.Model):
     name = models.CharField(max_length=255, unique=True)
 
+    class Meta:
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="airplanetype_name_trgm_idx",
+            )
+        ]
+
     def __str__(self):
         return self.name
 
@@ -120,6 +170,20 @@ class Airplane(models.Model):
         AirplaneType, on_delete=models.CASCADE, related_name="airplanes"
     )
     image = models.ImageField(null=True, upload_to=airplane_image_path)
+    seat_capacity = models.GeneratedField(
+        expression=models.F("rows") * models.F("seats_in_row"),
+        output_field=models.PositiveIntegerField(),
+        db_persist=True,
+        db_index=True,
+    )
+
+    class Meta:
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="airplane_name_trgm_idx",
+            )
+        ]
 
     @property
     def capacity(self):
@@ -127,7 +191,7 @@ class Airplane(models.Model):
 
     @property
     def is_large(self):
-        return self.capacity > 200
+        return self.capacity > LARGE_AIRPLANE_CAPACITY
 
     def __str__(self):
         return f"{self.name} ({self.airplane_type.name})"
@@ -144,6 +208,27 @@ class Flight(models.Model):
     arrival_time = models.DateTimeField()
     crew = models.ManyToManyField("Crew", related_name="flights")
     is_active = models.BooleanField(default=True)
+    scheduled_duration = models.GeneratedField(
+        expression=models.F("arrival_time") - models.F("departure_time"),
+        output_field=models.DurationField(),
+        db_persist=True,
+        db_index=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["departure_time"], name="flight_departure_idx"
+            ),
+            models.Index(
+                fields=["route", "departure_time"],
+                name="flight_route_departure_idx",
+            ),
+            models.Index(
+                fields=["route", "arrival_time"],
+                name="flight_route_arrival_idx",
+            ),
+        ]
 
     @property
     def duration(self):
@@ -166,6 +251,27 @@ class Flight(models.Model):
         )
 
 
+class RouteAvailability(models.Model):
+    route = models.ForeignKey(
+        Route, on_delete=models.CASCADE, related_name="availability"
+    )
+    date = models.DateField()
+    flights_count = models.PositiveIntegerField(default=0)
+    min_free_seats = models.PositiveIntegerField(default=0)
+    max_free_seats = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "route availability"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["route", "date"], name="unique_route_availability_day"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.route_id} on {self.date}: {self.flights_count} flights"
+
+
 class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(
@@ -1,3 +1,5 @@
+from django.core.paginator import InvalidPage, Page
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
@@ -6,6 +8,35 @@ class CustomPageNumberPagination(PageNumberPagination):
     page_size_query_param = "page_size"
     max_page_size = 100
 
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async counterpart of ``paginate_queryset`` that counts and fetches
+        the page through the async ORM interface.
+        """
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+
+        bottom = (number - 1) * page_size
+        objects = [
+            obj async for obj in queryset[bottom:bottom + page_size]
+        ]
+        self.page = Page(objects, number, paginator)
+        self.request = request
+        return objects
+
     def get_paginated_response(self, data):
         return Response({
             "links": {
@@ -0,0 +1,60 @@
+"""
+Views for the OpenAPI schema and its documentation pages. They live
+apart from ``airport_app.views`` and are imported on their first request,
+so API workers do not load drf-spectacular's schema generator at boot.
+"""
+import re
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SpectacularAPIView
+
+from airport_app.utils.schema_artifact import (
+    SchemaNotBuilt,
+    load_schema_artifact,
+)
+
+
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+class SchemaView(SpectacularAPIView):
+    """
+    Serve the OpenAPI schema from the files written by
+    ``manage.py build_schema`` instead of introspecting every viewset per
+    request. Only DEBUG falls back to live generation when they are
+    missing.
+    """
+
+    @extend_schema(exclude=True)
+    def get(self, request, *args, **kwargs):
+        fmt = request.accepted_renderer.format
+        artifact = load_schema_artifact(fmt)
+        if artifact is None:
+            if settings.DEBUG:
+                return super().get(request, *args, **kwargs)
+            raise SchemaNotBuilt
+
+        if artifact.etag in parse_etags(
+            request.headers.get("If-None-Match", "")
+        ):
+            response = HttpResponseNotModified()
+        elif ACCEPTS_GZIP.search(request.headers.get("Accept-Encoding", "")):
+            response = HttpResponse(
+                artifact.compressed, content_type=request.accepted_media_type
+            )
+            response["Content-Encoding"] = "gzip"
+        else:
+            response = HttpResponse(
+                artifact.content, content_type=request.accepted_media_type
+            )
+        response["ETag"] = artifact.etag
+        response["Content-Disposition"] = (
+            f'inline; filename="{self._get_filename(request, None)}"'
+        )
+        patch_cache_control(response, public=True, max_age=300)
+        patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+        return response
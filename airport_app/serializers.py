@@ -1,8 +1,16 @@
+from collections import defaultdict
+
 from django.db import transaction
 from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 from django.core.exceptions import ValidationError as DRFValidationError
 
+from airport_app.utils.availability import (
+    flight_route_day,
+    refresh_route_days,
+)
+from airport_app.utils.events import publish_event, seats_topic
 from airport_app.utils.mixins import UniqueFieldsValidatorMixin
 from airport_app.models import (
     Country,
@@ -15,6 +23,7 @@ from airport_app.models import (
     Ticket,
     Order,
     Airport,
+    RouteAvailability,
 )
 
 
@@ -132,6 +141,16 @@ class AirportListSerializer(AirportSerializer):
         fields = ("id", "name", "city", "country_code")
 
 
+class AirportAutocompleteSerializer(AirportListSerializer):
+    country = serializers.CharField(
+        source="city.country.name", read_only=True
+    )
+
+    class Meta:
+        model = Airport
+        fields = ("id", "name", "city", "country", "country_code")
+
+
 class AirportRetrieveSerializer(AirportSerializer):
     city = CityRetrieveSerializer()
 
@@ -156,12 +175,17 @@ class RouteSerializer(
                 instance=instance,
             )
 
-        if data.get("source") == data.get("destination"):
+        # A partial update is checked against the current values.
+        source, destination, distance = (
+            data.get(field, getattr(instance, field, None))
+            for field in ("source", "destination", "distance")
+        )
+        if source == destination:
             raise serializers.ValidationError(
                 "Source and destination airports must be different."
             )
 
-        if data.get("distance") <= 0:
+        if distance is not None and distance <= 0:
             raise serializers.ValidationError(
                 "Distance must be greater than 0 kilometers."
             )
@@ -179,6 +203,20 @@ class RouteRetrieveSerializer(RouteSerializer):
     destination = AirportListSerializer()
 
 
+class RouteAvailabilitySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RouteAvailability
+        fields = ("date", "flights_count", "min_free_seats", "max_free_seats")
+
+
+class RouteCalendarSerializer(serializers.Serializer):
+    month = serializers.DateField(
+        input_formats=["%Y-%m"],
+        required=False,
+        help_text="Month as YYYY-MM. Defaults to the current month.",
+    )
+
+
 class AirplaneTypeSerializer(serializers.ModelSerializer):
     class Meta:
         model = AirplaneType
@@ -251,7 +289,49 @@ class AirplaneImageSerializer(serializers.ModelSerializer):
         fields = ("id", "image")
 
 
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """Look up all the primary keys of a to-many field in one query."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pk_field = queryset.model._meta.pk
+        pks = []
+        for item in data:
+            try:
+                if isinstance(item, bool):
+                    raise DRFValidationError("")
+                pks.append(pk_field.to_python(item))
+            except DRFValidationError:
+                child.fail("incorrect_type", data_type=type(item).__name__)
+
+        found = queryset.in_bulk(pks)
+        for item, pk in zip(data, pks):
+            if pk not in found:
+                child.fail("does_not_exist", pk_value=item)
+        return [found[pk] for pk in pks]
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+
 class FlightSerializer(serializers.ModelSerializer):
+    crew = BulkPrimaryKeyRelatedField(
+        many=True, queryset=Crew.objects.all(), allow_empty=False
+    )
+
     class Meta:
         model = Flight
         fields = (
@@ -267,9 +347,11 @@ class FlightSerializer(serializers.ModelSerializer):
         read_only_fields = ("duration", "is_active")
 
     def validate(self, attrs):
-        departure = attrs.get("departure_time")
-        arrival = attrs.get("arrival_time")
-        airplane = attrs.get("airplane")
+        # A partial update is checked against the current values.
+        departure, arrival, airplane = (
+            attrs.get(field, getattr(self.instance, field, None))
+            for field in ("departure_time", "arrival_time", "airplane")
+        )
 
         if arrival <= departure:
             raise serializers.ValidationError(
@@ -277,6 +359,8 @@ class FlightSerializer(serializers.ModelSerializer):
             )
 
         crew = attrs.get("crew")
+        if "crew" not in attrs and self.instance is not None:
+            crew = list(self.instance.crew.all())
         if not crew:
             raise serializers.ValidationError("Crew is required.")
 
@@ -303,23 +387,32 @@ class FlightSerializer(serializers.ModelSerializer):
 
         current_id = self.instance.id if self.instance else None
 
-        def check_overlapping_flights(obj, obj_type):
-            overlapping_flights = obj.flights.filter(
+        def overlapping(flights):
+            return flights.filter(
                 departure_time__lt=arrival,
                 arrival_time__gt=departure,
             ).exclude(id=current_id)
 
-            if overlapping_flights.exists():
-                raise serializers.ValidationError(
-                    f"{obj_type} {obj} is already scheduled "
-                    f"for another flight during this time."
-                )
+        def already_scheduled(obj, obj_type):
+            return serializers.ValidationError(
+                f"{obj_type} {obj} is already scheduled "
+                f"for another flight during this time."
+            )
 
+        # One query for the whole crew, the first busy member in the given
+        # order is reported.
+        busy = set(
+            Crew.objects.filter(
+                pk__in=[member.pk for member in crew],
+                flights__in=overlapping(Flight.objects.all()),
+            ).values_list("pk", flat=True)
+        )
         for crew_member in crew:
-            check_overlapping_flights(crew_member, "Crew member")
+            if crew_member.pk in busy:
+                raise already_scheduled(crew_member, "Crew member")
 
-        if airplane:
-            check_overlapping_flights(airplane, "Airplane")
+        if airplane and overlapping(airplane.flights).exists():
+            raise already_scheduled(airplane, "Airplane")
 
         return attrs
 
@@ -349,6 +442,51 @@ class FlightListSerializer(serializers.ModelSerializer):
         }
 
 
+class DepartureBoardSerializer(serializers.ModelSerializer):
+    destination = serializers.CharField(
+        source="route.destination.name", read_only=True
+    )
+    city = serializers.CharField(
+        source="route.destination.city.name", read_only=True
+    )
+    airplane = serializers.CharField(source="airplane.name", read_only=True)
+
+    class Meta:
+        model = Flight
+        fields = (
+            "id",
+            "departure_time",
+            "destination",
+            "city",
+            "airplane",
+            "is_active",
+        )
+
+
+class ArrivalBoardSerializer(serializers.ModelSerializer):
+    source = serializers.CharField(source="route.source.name", read_only=True)
+    city = serializers.CharField(
+        source="route.source.city.name", read_only=True
+    )
+    airplane = serializers.CharField(source="airplane.name", read_only=True)
+
+    class Meta:
+        model = Flight
+        fields = (
+            "id",
+            "arrival_time",
+            "source",
+            "city",
+            "airplane",
+            "is_active",
+        )
+
+
+class AirportBoardSerializer(serializers.Serializer):
+    departures = DepartureBoardSerializer(many=True)
+    arrivals = ArrivalBoardSerializer(many=True)
+
+
 class FlightRetrieveSerializer(serializers.ModelSerializer):
     route = serializers.SerializerMethodField()
     airplane = AirplaneRetrieveSerializer()
@@ -393,6 +531,42 @@ class FlightRetrieveSerializer(serializers.ModelSerializer):
         ]
 
 
+class FlightSearchSerializer(serializers.Serializer):
+    source = serializers.IntegerField(min_value=1)
+    destination = serializers.IntegerField(min_value=1)
+    date = serializers.DateField()
+    return_date = serializers.DateField(required=False)
+    flex_days = serializers.IntegerField(
+        min_value=0, max_value=3, default=0
+    )
+    sort = serializers.ChoiceField(
+        choices=["earliest", "shortest"], default="earliest"
+    )
+
+    def validate(self, attrs):
+        if attrs["source"] == attrs["destination"]:
+            raise serializers.ValidationError(
+                "Source and destination airports must be different."
+            )
+
+        return_date = attrs.get("return_date")
+        if return_date and return_date < attrs["date"]:
+            raise serializers.ValidationError(
+                "Return date can't be earlier than the outbound date."
+            )
+        return attrs
+
+
+class FlightSearchDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    flight = FlightListSerializer()
+
+
+class FlightSearchResultSerializer(serializers.Serializer):
+    outbound = FlightSearchDaySerializer(many=True)
+    inbound = FlightSearchDaySerializer(many=True)
+
+
 class TicketSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ticket
@@ -440,6 +614,25 @@ class OrderSerializer(serializers.ModelSerializer):
             order = Order.objects.create(**validated_data)
             for ticket_data in tickets_data:
                 Ticket.objects.create(order=order, **ticket_data)
+            refresh_route_days(
+                flight_route_day(ticket_data["flight"])
+                for ticket_data in tickets_data
+            )
+
+            taken = defaultdict(list)
+            for ticket_data in tickets_data:
+                taken[ticket_data["flight"].id].append(
+                    [ticket_data["row"], ticket_data["seat"]]
+                )
+            for flight_id, seats in taken.items():
+                publish_event(
+                    seats_topic(flight_id),
+                    {
+                        "type": "seats.taken",
+                        "flight": flight_id,
+                        "seats": seats,
+                    },
+                )
             return order
 
 
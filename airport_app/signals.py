@@ -0,0 +1,268 @@
+from collections import defaultdict
+from itertools import chain
+
+from django.db import models, transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+
+from airport_app.models import (
+    Country,
+    City,
+    Airport,
+    Route,
+    AirplaneType,
+    Airplane,
+    Crew,
+    Flight,
+    Order,
+    Ticket,
+)
+from airport_app.utils.availability import (
+    flight_route_day,
+    refresh_route_days,
+)
+from airport_app.utils.board import invalidate_boards
+from airport_app.utils.cache import bump_generation
+from airport_app.utils.events import (
+    board_topic,
+    publish_event,
+    seats_topic,
+)
+
+FLIGHT_CACHE_SOURCES = (
+    Country,
+    City,
+    Airport,
+    Route,
+    AirplaneType,
+    Airplane,
+    Crew,
+    Flight,
+)
+
+
+AIRPORT_INDEX_SOURCES = (Country, City, Airport)
+
+
+# Generations are bumped once the write commits, so a request that reads
+# the old rows in the meantime cannot cache them under the new generation.
+def invalidate_flight_cache(sender, **kwargs):
+    transaction.on_commit(lambda: bump_generation("flights"))
+
+
+def invalidate_airport_index(sender, **kwargs):
+    transaction.on_commit(lambda: bump_generation("airports"))
+
+
+for model in FLIGHT_CACHE_SOURCES:
+    post_save.connect(invalidate_flight_cache, sender=model)
+    post_delete.connect(invalidate_flight_cache, sender=model)
+
+for model in AIRPORT_INDEX_SOURCES:
+    post_save.connect(invalidate_airport_index, sender=model)
+    post_delete.connect(invalidate_airport_index, sender=model)
+
+m2m_changed.connect(invalidate_flight_cache, sender=Flight.crew.through)
+
+
+def remember_flight_route_day(sender, instance, **kwargs):
+    previous = (
+        Flight.objects.filter(pk=instance.pk)
+        .only("route_id", "departure_time")
+        .first()
+        if instance.pk
+        else None
+    )
+    instance._previous_route_day = (
+        flight_route_day(previous) if previous else None
+    )
+
+
+def refresh_flight_availability(sender, instance, **kwargs):
+    route_days = [flight_route_day(instance)]
+    previous = getattr(instance, "_previous_route_day", None)
+    if previous:
+        route_days.append(previous)
+    refresh_route_days(route_days)
+
+
+def remember_airplane_layout(sender, instance, **kwargs):
+    instance._previous_layout = (
+        Airplane.objects.filter(pk=instance.pk)
+        .values_list("rows", "seats_in_row")
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+def refresh_airplane_availability(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_layout", None)
+    # Only the seat layout changes the free seats of its flights.
+    if previous and previous != (instance.rows, instance.seats_in_row):
+        # Not instance.flights: the related manager reads each flight's
+        # deferred airplane_id back to attach the instance to it.
+        refresh_route_days(
+            flight_route_day(flight)
+            for flight in Flight.objects.filter(airplane=instance).only(
+                "route_id", "departure_time"
+            )
+        )
+
+
+def remember_order_route_days(sender, instance, **kwargs):
+    instance._route_days = [
+        flight_route_day(flight)
+        for flight in Flight.objects.filter(
+            tickets__order=instance
+        ).only("route_id", "departure_time")
+    ]
+
+
+def refresh_order_availability(sender, instance, **kwargs):
+    refresh_route_days(getattr(instance, "_route_days", []))
+
+
+pre_save.connect(remember_flight_route_day, sender=Flight)
+post_save.connect(refresh_flight_availability, sender=Flight)
+pre_save.connect(remember_airplane_layout, sender=Airplane)
+post_save.connect(refresh_airplane_availability, sender=Airplane)
+pre_delete.connect(remember_order_route_days, sender=Order)
+post_delete.connect(refresh_order_availability, sender=Order)
+
+
+def publish_flight_events(event_type, flight_routes, deleted_routes=()):
+    """
+    Invalidate the boards of the airports the flights' routes connect and
+    publish an event for each flight to them. flight_routes pairs each
+    flight with the ids of its routes, deleted_routes are routes already
+    gone from the database.
+    """
+    route_airports = {
+        route.pk: (route.source_id, route.destination_id)
+        for route in deleted_routes
+    }
+    route_ids = set(chain.from_iterable(ids for _, ids in flight_routes))
+    route_airports.update(
+        (route_id, (source_id, destination_id))
+        for route_id, source_id, destination_id in Route.objects.filter(
+            pk__in=route_ids - route_airports.keys()
+        ).values_list("id", "source_id", "destination_id")
+    )
+    invalidate_boards(*chain.from_iterable(route_airports.values()))
+
+    for flight, ids in flight_routes:
+        event = {
+            "type": event_type,
+            "flight": flight.id,
+            "route": flight.route_id,
+            "departure_time": flight.departure_time,
+            "arrival_time": flight.arrival_time,
+            "is_active": flight.is_active,
+        }
+        for airport_id in set(
+            chain.from_iterable(route_airports.get(pk, ()) for pk in ids)
+        ):
+            publish_event(board_topic(airport_id), event)
+
+
+def update_flight_boards(sender, instance, **kwargs):
+    route_ids = {instance.route_id}
+    previous = getattr(instance, "_previous_route_day", None)
+    if previous:
+        route_ids.add(previous[0])
+    publish_flight_events(
+        "flight.changed" if "created" in kwargs else "flight.removed",
+        [(instance, route_ids)],
+    )
+
+
+def invalidate_route_boards(sender, instance, **kwargs):
+    invalidate_boards(instance.source_id, instance.destination_id)
+
+
+def invalidate_airport_board(sender, instance, **kwargs):
+    invalidate_boards(instance.pk)
+
+
+post_save.connect(update_flight_boards, sender=Flight)
+post_save.connect(invalidate_route_boards, sender=Route)
+post_delete.connect(invalidate_route_boards, sender=Route)
+post_save.connect(invalidate_airport_board, sender=Airport)
+post_delete.connect(invalidate_airport_board, sender=Airport)
+
+
+# A delete that cascades from another row, such as a route or an
+# airplane, sends post_delete for each of its flights and routes before
+# its own. Those leave their follow-up work to that row, which does it
+# once for all of them instead of a few queries per flight.
+def defer_to_origin(instance, origin, name) -> bool:
+    if not isinstance(origin, models.Model) or isinstance(
+        origin, type(instance)
+    ):
+        return False
+    origin.__dict__.setdefault(name, []).append(instance)
+    return True
+
+
+def remove_flight(sender, instance, origin=None, **kwargs):
+    if defer_to_origin(instance, origin, "_deleted_flights"):
+        return
+    refresh_flight_availability(sender, instance)
+    update_flight_boards(sender, instance)
+
+
+def remember_deleted_route(sender, instance, origin=None, **kwargs):
+    defer_to_origin(instance, origin, "_deleted_routes")
+
+
+def remove_cascaded_flights(sender, instance, **kwargs):
+    flights = instance.__dict__.pop("_deleted_flights", [])
+    routes = instance.__dict__.pop("_deleted_routes", [])
+    if not flights:
+        return
+    if isinstance(instance, Route):
+        routes.append(instance)
+    # The availability of a deleted route went with it.
+    deleted = {route.pk for route in routes}
+    refresh_route_days(
+        flight_route_day(flight)
+        for flight in flights
+        if flight.route_id not in deleted
+    )
+    publish_flight_events(
+        "flight.removed",
+        [(flight, {flight.route_id}) for flight in flights],
+        routes,
+    )
+
+
+post_delete.connect(remove_flight, sender=Flight)
+post_delete.connect(remember_deleted_route, sender=Route)
+post_delete.connect(remove_cascaded_flights)
+
+
+def remember_order_seats(sender, instance, **kwargs):
+    seats = defaultdict(list)
+    for flight_id, row, seat in Ticket.objects.filter(
+        order=instance
+    ).values_list("flight_id", "row", "seat"):
+        seats[flight_id].append([row, seat])
+    instance._released_seats = seats
+
+
+def publish_released_seats(sender, instance, **kwargs):
+    for flight_id, seats in getattr(instance, "_released_seats", {}).items():
+        publish_event(
+            seats_topic(flight_id),
+            {"type": "seats.released", "flight": flight_id, "seats": seats},
+        )
+
+
+pre_delete.connect(remember_order_seats, sender=Order)
+post_delete.connect(publish_released_seats, sender=Order)
@@ -1,6 +1,7 @@
 from django.utils import timezone
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
@@ -30,6 +31,12 @@ FLIGHT_URL = reverse("airport_app:flight-list")
 ORDER_URL = reverse("airport_app:order-list")
 
 
+AIRPORT_AUTOCOMPLETE_URL = reverse("airport_app:airport-autocomplete")
+FLIGHT_SEARCH_URL = reverse("airport_app:flight-search")
+ASYNC_FLIGHT_URL = reverse("airport_app:async-flight-list")
+ASYNC_FLIGHT_SEARCH_URL = reverse("airport_app:async-flight-search")
+
+
 def detail_country_url(country_id):
     return reverse("airport_app:country-detail", args=[country_id])
 
@@ -62,10 +69,22 @@ def detail_route_url(route_id):
     return reverse("airport_app:route-detail", args=[route_id])
 
 
+def airport_board_url(airport_id):
+    return reverse("airport_app:airport-board", args=[airport_id])
+
+
+def route_calendar_url(route_id):
+    return reverse("airport_app:route-calendar", args=[route_id])
+
+
 def detail_flight_url(flight_id):
     return reverse("airport_app:flight-detail", args=[flight_id])
 
 
+def async_detail_flight_url(flight_id):
+    return reverse("airport_app:async-flight-detail", args=[flight_id])
+
+
 def detail_order_url(order_id):
     return reverse("airport_app:order-detail", args=[order_id])
 
@@ -190,8 +209,12 @@ def sample_ticket(order, flight, row=1, seat=1) -> Ticket:
     )
 
 
+# Replicas are test mirrors of default and cannot see the rows created
+# inside a test's transaction, so reads stay on the primary here.
+@override_settings(AIRPORT_REPLICAS={"DATABASES": []})
 class BaseApiTestCase(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
 
     def authenticate_user(self, is_admin=False):
@@ -0,0 +1,154 @@
+import asyncio
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncClient, SimpleTestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from airport_app.tests.base import (
+    BaseApiTestCase,
+    User,
+    ASYNC_FLIGHT_SEARCH_URL,
+    ASYNC_FLIGHT_URL,
+    FLIGHT_SEARCH_URL,
+    FLIGHT_URL,
+    async_detail_flight_url,
+    detail_flight_url,
+    sample_flight,
+    sample_route,
+)
+from airport_app.utils.cache import AsyncSingleFlight
+
+
+class AsyncFlightViewTests(BaseApiTestCase):
+    def setUp(self):
+        super().setUp()
+        route = sample_route()
+        self.flights = [sample_flight(route=route) for _ in range(3)]
+        self.flights[2].is_active = False
+        self.flights[2].save()
+        self.async_client = AsyncClient()
+
+    async def sync_get(self, url, params=None):
+        res = await sync_to_async(self.client.get)(url, params or {})
+        return res.json()
+
+    async def test_matches_sync_list(self):
+        params = {"is_active": True, "ordering": "departure_time"}
+        expected = await self.sync_get(FLIGHT_URL, params)
+
+        res = await self.async_client.get(ASYNC_FLIGHT_URL, params)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), expected)
+        self.assertEqual(res.json()["total"], 2)
+        self.assertIn("public", res["Cache-Control"])
+
+    async def test_matches_sync_retrieve(self):
+        flight_id = self.flights[0].id
+        expected = await self.sync_get(detail_flight_url(flight_id))
+
+        res = await self.async_client.get(async_detail_flight_url(flight_id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), expected)
+
+    async def test_matches_sync_search(self):
+        flight = self.flights[0]
+        params = {
+            "source": flight.route.source_id,
+            "destination": flight.route.destination_id,
+            "date": flight.departure_time.date().isoformat(),
+        }
+
+        res = await self.async_client.get(ASYNC_FLIGHT_SEARCH_URL, params)
+        expected = await self.sync_get(FLIGHT_SEARCH_URL, params)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), expected)
+        self.assertEqual(len(res.json()["outbound"]), 1)
+
+    async def test_errors(self):
+        missing = await self.async_client.get(
+            async_detail_flight_url(self.flights[2].id + 100)
+        )
+        invalid = await self.async_client.get(
+            ASYNC_FLIGHT_URL, {"departure_after": "soon"}
+        )
+        out_of_range = await self.async_client.get(
+            ASYNC_FLIGHT_URL, {"page": 9}
+        )
+        bad_search = await self.async_client.get(
+            ASYNC_FLIGHT_SEARCH_URL, {"source": 1}
+        )
+
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("departure_after", invalid.json())
+        self.assertEqual(out_of_range.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(bad_search.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cache_headers_match_sync(self):
+        user = User.objects.create_user(
+            email="test@gmail.com", password="test_password123"
+        )
+        token = RefreshToken.for_user(user).access_token
+        flight_id = self.flights[0].id
+        get = async_to_sync(self.async_client.get)
+
+        for headers in ({}, {"Authorization": f"Bearer {token}"}):
+            for sync_url, async_url in (
+                (FLIGHT_URL, ASYNC_FLIGHT_URL),
+                (
+                    detail_flight_url(flight_id),
+                    async_detail_flight_url(flight_id),
+                ),
+            ):
+                with self.subTest(url=async_url, headers=bool(headers)):
+                    expected = self.client.get(sync_url, headers=headers)
+                    res = get(async_url, headers=headers)
+
+                    self.assertEqual(res.status_code, status.HTTP_200_OK)
+                    self.assertEqual(
+                        res["Cache-Control"], expected["Cache-Control"]
+                    )
+                    # Only the sync views negotiate, and vary on, Accept.
+                    self.assertIn("Authorization", expected["Vary"])
+                    self.assertEqual(res["Vary"], "Authorization")
+                    self.assertEqual(
+                        "private" in res["Cache-Control"], bool(headers)
+                    )
+
+    def test_list_is_cached_and_invalidated(self):
+        get = async_to_sync(self.async_client.get)
+        get(ASYNC_FLIGHT_URL)
+
+        with self.assertNumQueries(0):
+            get(ASYNC_FLIGHT_URL)
+
+        flight = self.flights[0]
+        flight.departure_time -= timedelta(minutes=5)
+        with self.captureOnCommitCallbacks(execute=True):
+            flight.save()
+        with self.assertNumQueries(2):
+            get(ASYNC_FLIGHT_URL)
+
+
+class AsyncSingleFlightTests(SimpleTestCase):
+    async def test_concurrent_calls_share_one_computation(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        results = await asyncio.gather(
+            *(single_flight.do("key", compute) for _ in range(10))
+        )
+
+        self.assertEqual(results, [1] * 10)
+        self.assertEqual(calls, [1])
+        self.assertFalse(single_flight.is_running("key"))
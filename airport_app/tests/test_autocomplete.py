@@ -0,0 +1,144 @@
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+
+from airport_app.models import Airport
+from airport_app.tests.base import (
+    BaseApiTestCase,
+    AIRPORT_AUTOCOMPLETE_URL,
+    sample_airport,
+    sample_city,
+    sample_country,
+)
+from airport_app.utils.autocomplete import AirportAutocomplete, PrefixIndex
+
+
+class PrefixIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = PrefixIndex(
+            [
+                ("Heathrow", 0, 1),
+                ("London", 1, 1),
+                ("Gatwick", 0, 2),
+                ("London", 1, 2),
+                ("Zürich Airport", 0, 3),
+                ("New York", 1, 4),
+            ]
+        )
+
+    def test_prefix_match(self):
+        self.assertEqual(self.index.search("hea", 10), [1])
+        self.assertEqual(self.index.search("lon", 10), [1, 2])
+        self.assertEqual(self.index.search("xyz", 10), [])
+        self.assertEqual(self.index.search("", 10), [])
+
+    def test_matches_inner_words_and_ignores_accents(self):
+        self.assertEqual(self.index.search("airp", 10), [3])
+        self.assertEqual(self.index.search("zuri", 10), [3])
+        self.assertEqual(self.index.search("new  Y", 10), [4])
+
+    def test_limit(self):
+        self.assertEqual(len(self.index.search("lon", 1)), 1)
+
+
+class AirportAutocompleteTests(BaseApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_user()
+        ukraine = sample_country()
+        uk = sample_country(name="United Kingdom", code="GBR")
+        self.boryspil = sample_airport(sample_city(ukraine))
+        london = sample_city(uk, name="London")
+        self.heathrow = sample_airport(london, name="Heathrow")
+        self.luton = sample_airport(london, name="Luton")
+
+    def test_autocomplete_ranks_airport_before_city(self):
+        res = self.client.get(AIRPORT_AUTOCOMPLETE_URL, {"q": "lu"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data[0],
+            {
+                "id": self.luton.id,
+                "name": "Luton",
+                "city": "London",
+                "country": "United Kingdom",
+                "country_code": "GBR",
+            },
+        )
+
+    def test_autocomplete_by_city_and_country_code(self):
+        by_city = self.client.get(AIRPORT_AUTOCOMPLETE_URL, {"q": "lond"})
+        by_code = self.client.get(AIRPORT_AUTOCOMPLETE_URL, {"q": "ukr"})
+
+        self.assertEqual(
+            {airport["id"] for airport in by_city.data},
+            {self.heathrow.id, self.luton.id},
+        )
+        self.assertEqual(
+            [airport["id"] for airport in by_code.data], [self.boryspil.id]
+        )
+
+    def test_autocomplete_served_without_database(self):
+        self.client.get(AIRPORT_AUTOCOMPLETE_URL, {"q": "he"})
+
+        with self.assertNumQueries(0):
+            res = self.client.get(AIRPORT_AUTOCOMPLETE_URL, {"q": "hea"})
+
+        self.assertEqual(len(res.data), 1)
+
+    def test_index_rebuilt_on_model_change(self):
+        self.client.get(AIRPORT_AUTOCOMPLETE_URL, {"q": "he"})
+        self.heathrow.name = "Stansted"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.heathrow.save()
+
+        res = self.client.get(AIRPORT_AUTOCOMPLETE_URL, {"q": "sta"})
+
+        self.assertEqual(
+            [airport["id"] for airport in res.data], [self.heathrow.id]
+        )
+
+    def test_index_rebuilt_once_too_old(self):
+        self.client.get(AIRPORT_AUTOCOMPLETE_URL, {"q": "he"})
+        # A queryset update sends no signal, the generation stays the same.
+        Airport.objects.filter(id=self.heathrow.id).update(name="Stansted")
+
+        cached = self.client.get(AIRPORT_AUTOCOMPLETE_URL, {"q": "sta"})
+        with override_settings(AIRPORT_CACHE={"INDEX_MAX_AGE": 0}):
+            rebuilt = self.client.get(AIRPORT_AUTOCOMPLETE_URL, {"q": "sta"})
+
+        self.assertEqual(cached.data, [])
+        self.assertEqual(
+            [airport["id"] for airport in rebuilt.data], [self.heathrow.id]
+        )
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.dummy.DummyCache"
+            }
+        }
+    )
+    def test_index_built_without_a_cache(self):
+        autocomplete = AirportAutocomplete()
+
+        self.assertEqual(autocomplete.search("hea")[0]["id"], self.heathrow.id)
+        self.assertEqual(autocomplete.search("hea")[0]["id"], self.heathrow.id)
+
+    def test_autocomplete_limit(self):
+        res = self.client.get(
+            AIRPORT_AUTOCOMPLETE_URL, {"q": "lond", "limit": 1}
+        )
+        invalid = self.client.get(
+            AIRPORT_AUTOCOMPLETE_URL, {"q": "lond", "limit": "x"}
+        )
+
+        self.assertEqual(len(res.data), 1)
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_autocomplete_requires_authentication(self):
+        self.client.force_authenticate(None)
+
+        res = self.client.get(AIRPORT_AUTOCOMPLETE_URL, {"q": "he"})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,164 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+
+from airport_app.models import RouteAvailability
+from airport_app.utils.availability import refresh_route_days
+from airport_app.tests.base import (
+    BaseApiTestCase,
+    ORDER_URL,
+    route_calendar_url,
+    sample_flight,
+    sample_order,
+    sample_route,
+    sample_ticket,
+)
+
+
+class RouteCalendarTests(BaseApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_user()
+        self.route = sample_route()
+        self.day = (timezone.now() + timedelta(days=40)).date()
+        self.month = self.day.strftime("%Y-%m")
+        self.first = self.flight_at(8)
+        self.second = self.flight_at(18)
+
+    def flight_at(self, hour, day=None):
+        flight = sample_flight(route=self.route)
+        flight.departure_time = datetime.combine(
+            day or self.day, datetime.min.time(), tzinfo=dt_timezone.utc
+        ) + timedelta(hours=hour)
+        flight.arrival_time = flight.departure_time + timedelta(hours=2)
+        flight.save()
+        return flight
+
+    def calendar(self, month=None):
+        res = self.client.get(
+            route_calendar_url(self.route.id), {"month": month or self.month}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.data)
+        return res.data
+
+    def test_calendar_of_an_unknown_route(self):
+        for pk in (self.route.id + 100, "abc"):
+            with self.subTest(pk=pk):
+                res = self.client.get(route_calendar_url(pk))
+
+                self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_calendar_tracks_flights(self):
+        data = self.calendar()
+
+        self.assertEqual(data["month"], self.month)
+        self.assertEqual(
+            data["days"],
+            [
+                {
+                    "date": self.day.isoformat(),
+                    "flights_count": 2,
+                    "min_free_seats": 180,
+                    "max_free_seats": 180,
+                }
+            ],
+        )
+
+    def test_calendar_updated_on_order(self):
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": 1, "flight": self.first.id},
+                {"row": 1, "seat": 2, "flight": self.first.id},
+            ]
+        }
+        res = self.client.post(ORDER_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        day = self.calendar()["days"][0]
+
+        self.assertEqual(day["min_free_seats"], 178)
+        self.assertEqual(day["max_free_seats"], 180)
+
+    def test_calendar_updated_on_order_deletion(self):
+        order = sample_order(self.user)
+        sample_ticket(order, self.first)
+        call_command("rebuild_availability", stdout=open("/dev/null", "w"))
+        self.assertEqual(self.calendar()["days"][0]["min_free_seats"], 179)
+
+        order.delete()
+
+        self.assertEqual(self.calendar()["days"][0]["min_free_seats"], 180)
+
+    def test_calendar_follows_rescheduled_and_deleted_flights(self):
+        next_day = self.day + timedelta(days=1)
+        self.second.departure_time += timedelta(days=1)
+        self.second.arrival_time += timedelta(days=1)
+        self.second.save()
+
+        days = self.calendar()["days"]
+        self.assertEqual(
+            [(day["date"], day["flights_count"]) for day in days],
+            [(self.day.isoformat(), 1), (next_day.isoformat(), 1)],
+        )
+
+        self.first.delete()
+        self.assertEqual(
+            [day["date"] for day in self.calendar()["days"]],
+            [next_day.isoformat()],
+        )
+
+    def test_calendar_follows_deleted_airplanes(self):
+        self.first.airplane.delete()
+
+        self.assertEqual(self.calendar()["days"][0]["flights_count"], 1)
+
+    def test_calendar_does_not_scan_tickets(self):
+        with self.assertNumQueries(2):
+            self.calendar()
+
+    def test_calendar_month_bounds_and_validation(self):
+        other_month = (self.day.replace(day=1) + timedelta(days=40)).strftime(
+            "%Y-%m"
+        )
+
+        self.assertEqual(self.calendar(other_month)["days"], [])
+        res = self.client.get(
+            route_calendar_url(self.route.id), {"month": "June"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        missing = self.client.get(route_calendar_url(self.route.id + 100))
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_rebuild_command(self):
+        RouteAvailability.objects.all().delete()
+
+        call_command("rebuild_availability", stdout=open("/dev/null", "w"))
+
+        self.assertEqual(self.calendar()["days"][0]["flights_count"], 2)
+
+    def test_refresh_locks_the_routes(self):
+        with CaptureQueriesContext(connection) as queries:
+            refresh_route_days([(self.route.id, self.day)])
+
+        lock = next(q["sql"] for q in queries if "FOR UPDATE" in q["sql"])
+        self.assertIn('FROM "airport_app_route"', lock)
+
+    def test_only_seat_layout_changes_refresh_the_calendar(self):
+        airplane = self.first.airplane
+        airplane.name = "Renamed"
+        with CaptureQueriesContext(connection) as queries:
+            airplane.save()
+        self.assertFalse(
+            any("airport_app_routeavailability" in q["sql"] for q in queries)
+        )
+
+        airplane.rows = 20
+        airplane.save()
+
+        day = self.calendar()["days"][0]
+        self.assertEqual(day["min_free_seats"], 120)
+        self.assertEqual(day["max_free_seats"], 180)
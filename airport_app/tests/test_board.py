@@ -0,0 +1,129 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.utils import timezone
+from rest_framework import status
+
+from airport_app.tests.base import (
+    BaseApiTestCase,
+    airport_board_url,
+    sample_flight,
+    sample_route,
+)
+from airport_app.utils.events import board_topic
+
+
+class AirportBoardTests(BaseApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.route = sample_route()
+        self.source = self.route.source
+        self.destination = self.route.destination
+        self.later = self.flight_in(hours=3)
+        self.sooner = self.flight_in(hours=1)
+        self.departed = self.flight_in(hours=-5)
+
+    def flight_in(self, hours):
+        flight = sample_flight(route=self.route)
+        flight.departure_time = timezone.now() + timedelta(hours=hours)
+        flight.arrival_time = flight.departure_time + timedelta(hours=2)
+        flight.save()
+        return flight
+
+    def board(self, airport, **params):
+        res = self.client.get(airport_board_url(airport.id), params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res
+
+    def test_board_lists_upcoming_departures_and_arrivals(self):
+        departures = self.board(self.source).data
+        arrivals = self.board(self.destination).data
+
+        self.assertEqual(
+            [row["id"] for row in departures["departures"]],
+            [self.sooner.id, self.later.id],
+        )
+        self.assertEqual(departures["arrivals"], [])
+        self.assertEqual(
+            departures["departures"][0]["destination"], self.destination.name
+        )
+        self.assertEqual(
+            [row["id"] for row in arrivals["arrivals"]],
+            [self.sooner.id, self.later.id],
+        )
+        self.assertEqual(arrivals["arrivals"][0]["source"], self.source.name)
+
+    def test_board_limit(self):
+        data = self.board(self.source, limit=1).data
+
+        self.assertEqual(len(data["departures"]), 1)
+        res = self.client.get(
+            airport_board_url(self.source.id), {"limit": "x"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_polling_is_served_without_database(self):
+        self.board(self.source)
+
+        with self.assertNumQueries(0):
+            self.board(self.source)
+
+    def test_board_refreshed_on_flight_change(self):
+        self.board(self.source)
+
+        departure = timezone.now() + timedelta(minutes=30)
+        self.later.departure_time = departure
+        self.later.arrival_time = departure + timedelta(hours=2)
+        self.later.save()
+        self.sooner.delete()
+
+        self.assertEqual(
+            [row["id"] for row in self.board(self.source).data["departures"]],
+            [self.later.id],
+        )
+
+    def test_board_refreshed_when_an_airplane_is_deleted(self):
+        self.board(self.source)
+
+        with mock.patch("airport_app.signals.publish_event") as publish:
+            self.sooner.airplane.delete()
+
+        self.assertEqual(
+            [row["id"] for row in self.board(self.source).data["departures"]],
+            [self.later.id],
+        )
+        self.assertEqual(
+            {
+                (topic, event["type"], event["flight"])
+                for (topic, event), _ in publish.call_args_list
+            },
+            {
+                (board_topic(airport.id), "flight.removed", self.sooner.id)
+                for airport in (self.source, self.destination)
+            },
+        )
+
+    def test_departed_flights_drop_off_cached_window(self):
+        self.board(self.source)
+        in_two_hours = timezone.now() + timedelta(hours=2)
+
+        with mock.patch(
+            "airport_app.utils.board.timezone.now", return_value=in_two_hours
+        ):
+            with self.assertNumQueries(0):
+                data = self.board(self.source).data
+
+        self.assertEqual(
+            [row["id"] for row in data["departures"]], [self.later.id]
+        )
+
+    def test_unknown_airport(self):
+        res = self.client.get(airport_board_url(self.destination.id + 100))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_board_is_publicly_cacheable(self):
+        res = self.board(self.source)
+
+        self.assertIn("public", res["Cache-Control"])
+        self.assertIn("max-age=5", res["Cache-Control"])
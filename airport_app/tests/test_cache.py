@@ -0,0 +1,182 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+
+from airport_app.models import Airplane, Flight
+from airport_app.tests.base import (
+    BaseApiTestCase,
+    FLIGHT_URL,
+    detail_flight_url,
+    sample_flight,
+)
+from airport_app.utils.cache import (
+    SingleFlight,
+    bump_generation,
+    get_or_compute,
+)
+
+
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_calls_share_one_computation(self):
+        group = SingleFlight()
+        calls = []
+        results = []
+        started = threading.Event()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return "value"
+
+        def worker():
+            results.append(group.do("key", compute))
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 10)
+
+    def test_error_is_shared_and_not_cached(self):
+        group = SingleFlight()
+
+        def compute():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            group.do("key", compute)
+        self.assertFalse(group.is_running("key"))
+        self.assertEqual(group.do("key", lambda: 1), 1)
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return len(calls)
+
+        threads = [
+            threading.Thread(
+                target=get_or_compute, args=("hot", compute, 60, "test")
+            )
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(get_or_compute("hot", compute, 60, "test"), 1)
+
+    @override_settings(AIRPORT_CACHE={"STALE_WHILE_REVALIDATE": 30})
+    def test_stale_value_served_while_refreshing(self):
+        self.assertEqual(
+            get_or_compute("swr", lambda: "old", 60, "swr"), "old"
+        )
+        bump_generation("swr")
+
+        refreshing = threading.Event()
+        release = threading.Event()
+
+        def slow_refresh():
+            refreshing.set()
+            release.wait()
+            return "new"
+
+        leader = threading.Thread(
+            target=get_or_compute, args=("swr", slow_refresh, 60, "swr")
+        )
+        leader.start()
+        refreshing.wait()
+
+        self.assertEqual(
+            get_or_compute("swr", lambda: "unexpected", 60, "swr"), "old"
+        )
+
+        release.set()
+        leader.join()
+        self.assertEqual(get_or_compute("swr", lambda: "x", 60, "swr"), "new")
+
+    @override_settings(AIRPORT_CACHE={"CROSS_PROCESS_LOCK": True})
+    def test_waits_for_lock_held_by_other_process(self):
+        key = "locked"
+        cache.add(f"{key}:lock", 1, 10)
+
+        def peer():
+            time.sleep(0.1)
+            cache.delete(f"{key}:lock")
+
+        threading.Thread(target=peer).start()
+        self.assertEqual(get_or_compute(key, lambda: "mine", 60), "mine")
+
+
+class FlightResponseCacheTests(BaseApiTestCase):
+    def test_flight_list_served_from_cache(self):
+        sample_flight()
+        self.client.get(FLIGHT_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["total"], 1)
+
+    def test_flight_change_invalidates_cache(self):
+        flight = sample_flight()
+        self.client.get(FLIGHT_URL)
+        self.client.get(detail_flight_url(flight.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Flight.objects.filter(id=flight.id).first().delete()
+
+        self.assertEqual(self.client.get(FLIGHT_URL).data["total"], 0)
+        res = self.client.get(detail_flight_url(flight.id))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalidation_waits_for_the_commit(self):
+        flight = sample_flight()
+        self.client.get(FLIGHT_URL)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Flight.objects.filter(id=flight.id).delete()
+        # Before the commit, readers may still see and cache the old rows.
+        self.assertEqual(self.client.get(FLIGHT_URL).data["total"], 1)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(FLIGHT_URL).data["total"], 0)
+
+    def test_scheme_is_part_of_key(self):
+        flight = sample_flight()
+        Airplane.objects.filter(id=flight.airplane_id).update(
+            image="uploads/airplanes/boeing.jpg"
+        )
+        self.client.get(detail_flight_url(flight.id))
+
+        res = self.client.get(detail_flight_url(flight.id), secure=True)
+
+        self.assertTrue(
+            res.data["airplane"]["image"].startswith("https://")
+        )
+
+    def test_query_params_are_part_of_key(self):
+        sample_flight()
+        self.client.get(FLIGHT_URL)
+
+        res = self.client.get(FLIGHT_URL, {"is_active": False})
+
+        self.assertEqual(res.data["total"], 0)
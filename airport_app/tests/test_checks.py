@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from airport_app.checks import (
+    refuse_debug_tooling,
+    refuse_public_metrics,
+    refuse_unshared_cache_lock,
+)
+
+TOOLBAR_MIDDLEWARE = "debug_toolbar.middleware.DebugToolbarMiddleware"
+
+
+@override_settings(
+    DJANGO_ENV="prod", DEBUG=False, AIRPORT_METRICS={"TOKEN": "s3cret"}
+)
+class RefuseDebugToolingTests(SimpleTestCase):
+    def test_clean_production_settings_pass(self):
+        refuse_debug_tooling()
+
+    @override_settings(DEBUG=True)
+    def test_debug_is_refused(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, "DEBUG is on"):
+            refuse_debug_tooling()
+
+    def test_debug_toolbar_is_refused(self):
+        with self.modify_settings(
+            INSTALLED_APPS={"append": "debug_toolbar"},
+            MIDDLEWARE={"prepend": TOOLBAR_MIDDLEWARE},
+        ):
+            with self.assertRaisesMessage(
+                ImproperlyConfigured, f"{TOOLBAR_MIDDLEWARE} is in MIDDLEWARE"
+            ):
+                refuse_debug_tooling()
+
+    @override_settings(DJANGO_ENV="dev", DEBUG=True)
+    def test_other_profiles_are_not_checked(self):
+        refuse_debug_tooling()
+
+
+@override_settings(AIRPORT_CACHE={"CROSS_PROCESS_LOCK": True})
+class RefuseUnsharedCacheLockTests(SimpleTestCase):
+    def test_lock_needs_a_shared_cache(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, "LocMemCache"):
+            refuse_unshared_cache_lock()
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://localhost:6379/0",
+            }
+        }
+    )
+    def test_shared_cache_passes(self):
+        refuse_unshared_cache_lock()
+
+
+@override_settings(DJANGO_ENV="prod", AIRPORT_METRICS={"ENABLED": True})
+class RefusePublicMetricsTests(SimpleTestCase):
+    def test_production_metrics_need_a_token(self):
+        with self.assertRaisesMessage(
+            ImproperlyConfigured, "AIRPORT_METRICS_TOKEN"
+        ):
+            refuse_public_metrics()
+
+    @override_settings(AIRPORT_METRICS={"ENABLED": True, "TOKEN": "s3cret"})
+    def test_metrics_with_a_token_pass(self):
+        refuse_public_metrics()
+
+    @override_settings(AIRPORT_METRICS={"ENABLED": False})
+    def test_disabled_metrics_pass(self):
+        refuse_public_metrics()
+
+    @override_settings(DJANGO_ENV="dev")
+    def test_other_profiles_are_not_checked(self):
+        refuse_public_metrics()
+
+
+class TestProfileTests(SimpleTestCase):
+    def test_tests_run_without_debug_tooling(self):
+        self.assertEqual(settings.DJANGO_ENV, "test")
+        self.assertNotIn("debug_toolbar", settings.INSTALLED_APPS)
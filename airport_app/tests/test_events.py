@@ -0,0 +1,203 @@
+import asyncio
+import json
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import (
+    AsyncClient,
+    SimpleTestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.urls import reverse
+from rest_framework import status
+
+from airport_app.tests.base import (
+    BaseApiTestCase,
+    ORDER_URL,
+    sample_flight,
+    sample_order,
+    sample_ticket,
+)
+from airport_app.utils import events
+from airport_app.utils.events import (
+    InProcessBroker,
+    PostgresBroker,
+    RESYNC_EVENT,
+)
+
+
+def seats_stream_url(flight_id):
+    return reverse("airport_app:flight-seats-stream", args=[flight_id])
+
+
+def board_stream_url(airport_id):
+    return reverse("airport_app:airport-board-stream", args=[airport_id])
+
+
+def parse_event(chunk):
+    lines = dict(
+        line.split(": ", 1) for line in chunk.decode().strip().splitlines()
+    )
+    return lines["event"], json.loads(lines["data"])
+
+
+async def next_event(response, timeout=5):
+    chunk = await asyncio.wait_for(
+        anext(aiter(response.streaming_content)), timeout
+    )
+    return parse_event(chunk)
+
+
+class InProcessBrokerTests(SimpleTestCase):
+    async def test_publish_reaches_topic_subscribers_only(self):
+        broker = InProcessBroker()
+
+        async with broker.subscribe("a") as first:
+            async with broker.subscribe("b") as second:
+                broker.publish("a", {"type": "ping"})
+                event = await asyncio.wait_for(first.get(), 1)
+
+                self.assertEqual(event, {"type": "ping"})
+                self.assertTrue(second.empty())
+
+        self.assertEqual(broker._subscribers, {})
+
+    async def test_slow_subscriber_is_asked_to_resync(self):
+        broker = InProcessBroker(queue_size=2)
+
+        async with broker.subscribe("a") as queue:
+            for number in range(3):
+                broker.publish("a", {"type": "ping", "number": number})
+            await asyncio.sleep(0)
+
+            self.assertIs(await queue.get(), RESYNC_EVENT)
+            self.assertTrue(queue.empty())
+
+
+@mock.patch.object(events, "_broker", None)
+class EventStreamTests(BaseApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.flight = sample_flight()
+        self.async_client = AsyncClient()
+
+    async def test_seat_map_snapshot_and_deltas(self):
+        response = await self.async_client.get(
+            seats_stream_url(self.flight.id)
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        name, data = await next_event(response)
+        self.assertEqual(name, "snapshot")
+        self.assertEqual(data["taken"], [])
+        self.assertEqual(data["rows"], 30)
+
+        user = await sync_to_async(self.create_order)()
+        name, data = await next_event(response)
+        self.assertEqual(name, "seats.taken")
+        self.assertEqual(data["seats"], [[2, 3]])
+
+        await sync_to_async(self.delete_orders)(user)
+        name, data = await next_event(response)
+        self.assertEqual(name, "seats.released")
+        self.assertEqual(data["seats"], [[2, 3]])
+
+    def create_order(self):
+        self.authenticate_user()
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket = {"row": 2, "seat": 3, "flight": self.flight.id}
+            res = self.client.post(
+                ORDER_URL, {"tickets": [ticket]}, format="json"
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return self.user
+
+    def delete_orders(self, user):
+        with self.captureOnCommitCallbacks(execute=True):
+            user.orders.all().delete()
+
+    async def test_board_stream_publishes_flight_changes(self):
+        response = await self.async_client.get(
+            board_stream_url(self.flight.route.destination_id)
+        )
+        name, data = await next_event(response)
+        self.assertEqual(name, "snapshot")
+        self.assertEqual(
+            [row["id"] for row in data["arrivals"]], [self.flight.id]
+        )
+
+        await sync_to_async(self.cancel_flight)()
+        name, data = await next_event(response)
+        self.assertEqual(name, "flight.changed")
+        self.assertEqual(data["flight"], self.flight.id)
+        self.assertFalse(data["is_active"])
+
+    def cancel_flight(self):
+        self.flight.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight.save()
+
+    async def test_unknown_flight(self):
+        response = await self.async_client.get(
+            seats_stream_url(self.flight.id + 100)
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_board_stream_rejects_an_invalid_limit(self):
+        response = await self.async_client.get(
+            board_stream_url(self.flight.route.destination_id),
+            {"limit": "x"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"limit": "A valid integer is required."},
+        )
+
+    def test_streams_require_asgi(self):
+        res = self.client.get(seats_stream_url(self.flight.id))
+
+        self.assertEqual(res.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    def test_events_are_published_after_commit(self):
+        self.authenticate_user()
+        order = sample_order(self.user)
+        sample_ticket(order, self.flight)
+
+        with mock.patch.object(InProcessBroker, "publish") as publish:
+            with self.captureOnCommitCallbacks() as callbacks:
+                order.delete()
+            publish.assert_not_called()
+
+            for callback in callbacks:
+                callback()
+        publish.assert_called_once()
+
+
+@override_settings(
+    AIRPORT_EVENTS={"BROKER": "airport_app.utils.events.PostgresBroker"}
+)
+class PostgresBrokerTests(TransactionTestCase):
+    async def test_notifications_reach_local_subscribers(self):
+        broker = PostgresBroker()
+        broker.poll_interval = 0.1
+        self.addCleanup(broker.close)
+
+        async with broker.subscribe("flight:1:seats") as queue:
+            # The listener connects in a background thread.
+            event = None
+            for _ in range(50):
+                await sync_to_async(broker.publish)(
+                    "flight:1:seats", {"type": "ping"}
+                )
+                try:
+                    event = await asyncio.wait_for(queue.get(), 0.1)
+                    break
+                except asyncio.TimeoutError:
+                    continue
+
+        self.assertEqual(event, {"type": "ping"})
@@ -0,0 +1,229 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import connection
+from django.utils import timezone
+from rest_framework import status
+
+from airport_app.models import Airplane, Flight
+from airport_app.tests.base import (
+    BaseApiTestCase,
+    AIRPLANE_URL,
+    FLIGHT_URL,
+    sample_airplane,
+    sample_airplane_type,
+    sample_flight,
+    sample_route,
+)
+
+
+class AirplaneCapacityFilterTests(BaseApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_user(is_admin=True)
+        airplane_type = sample_airplane_type()
+        self.small = sample_airplane(
+            airplane_type, name="Small", rows=10, seats_in_row=4
+        )
+        self.medium = sample_airplane(
+            airplane_type, name="Medium", rows=30, seats_in_row=6
+        )
+        self.large = sample_airplane(
+            airplane_type, name="Large", rows=40, seats_in_row=10
+        )
+
+    def ids(self, res):
+        return [airplane["id"] for airplane in res.data["results"]]
+
+    def test_filter_is_large(self):
+        large = self.client.get(AIRPLANE_URL, {"is_large": True})
+        not_large = self.client.get(AIRPLANE_URL, {"is_large": False})
+
+        self.assertEqual(self.ids(large), [self.large.id])
+        self.assertEqual(
+            sorted(self.ids(not_large)), [self.small.id, self.medium.id]
+        )
+
+    def test_filter_capacity_range(self):
+        res = self.client.get(
+            AIRPLANE_URL, {"capacity_min": 100, "capacity_max": 300}
+        )
+
+        self.assertEqual(self.ids(res), [self.medium.id])
+
+    def test_order_by_capacity(self):
+        res = self.client.get(AIRPLANE_URL, {"ordering": "-capacity"})
+
+        self.assertEqual(
+            self.ids(res), [self.large.id, self.medium.id, self.small.id]
+        )
+
+    def test_capacity_follows_updates(self):
+        self.small.rows = 100
+        self.small.save()
+
+        res = self.client.get(AIRPLANE_URL, {"is_large": True})
+
+        self.assertEqual(
+            sorted(self.ids(res)), [self.small.id, self.large.id]
+        )
+
+    def test_capacity_filter_uses_index(self):
+        queryset = Airplane.objects.filter(seat_capacity__gt=200)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        self.assertIn("seat_capacity", plan)
+        self.assertIn("Index", plan)
+
+
+class FlightCapacityFilterTests(BaseApiTestCase):
+    def test_filter_flights_by_min_capacity(self):
+        flight = sample_flight()
+
+        res = self.client.get(FLIGHT_URL, {"min_capacity": 180})
+        empty = self.client.get(FLIGHT_URL, {"min_capacity": 181})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]], [flight.id]
+        )
+        self.assertEqual(empty.data["total"], 0)
+
+
+class FlightDurationFilterTests(BaseApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.short = sample_flight()
+        self.long = sample_flight(route=self.short.route)
+        departure = timezone.now() + timedelta(days=1)
+        Flight.objects.filter(id=self.long.id).update(
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=5),
+        )
+
+    def ids(self, res):
+        return [flight["id"] for flight in res.data["results"]]
+
+    def test_filter_by_duration_range(self):
+        short = self.client.get(FLIGHT_URL, {"duration_max": "02:00:00"})
+        long = self.client.get(FLIGHT_URL, {"duration_min": "04:00:00"})
+
+        self.assertEqual(self.ids(short), [self.short.id])
+        self.assertEqual(self.ids(long), [self.long.id])
+
+    def test_order_by_duration(self):
+        shortest = self.client.get(FLIGHT_URL, {"ordering": "duration"})
+        longest = self.client.get(FLIGHT_URL, {"ordering": "-duration"})
+
+        self.assertEqual(self.ids(shortest), [self.short.id, self.long.id])
+        self.assertEqual(self.ids(longest), [self.long.id, self.short.id])
+
+    def test_invalid_duration(self):
+        res = self.client.get(FLIGHT_URL, {"duration_max": "soon"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_shortest_flights_use_index(self):
+        queryset = Flight.objects.order_by("scheduled_duration")[:5]
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_sort = off")
+            plan = queryset.explain()
+
+        self.assertIn("Index Scan using airport_app_flight_scheduled", plan)
+
+
+class FlightDateFilterTests(BaseApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.day = (timezone.now() + timedelta(days=10)).date()
+        self.route = sample_route()
+        self.morning = self.flight_at(7)
+        self.evening = self.flight_at(19)
+        self.next_day = self.flight_at(31)
+
+    def flight_at(self, hour):
+        flight = sample_flight(route=self.route)
+        departure = datetime.combine(
+            self.day, datetime.min.time(), tzinfo=dt_timezone.utc
+        ) + timedelta(hours=hour)
+        Flight.objects.filter(id=flight.id).update(
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=2),
+        )
+        return flight
+
+    def ids(self, params):
+        res = self.client.get(
+            FLIGHT_URL, {**params, "ordering": "departure_time"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.data)
+        return [flight["id"] for flight in res.data["results"]]
+
+    def test_filter_by_departure_date(self):
+        self.assertEqual(
+            self.ids({"departure_date": self.day}),
+            [self.morning.id, self.evening.id],
+        )
+
+    def test_filter_by_departure_range(self):
+        params = {
+            "departure_after": f"{self.day}T12:00:00Z",
+            "departure_before": f"{self.day + timedelta(days=2)}T00:00:00Z",
+        }
+
+        self.assertEqual(
+            self.ids(params), [self.evening.id, self.next_day.id]
+        )
+
+    def test_time_of_day_window(self):
+        on_day = {
+            "departure_date": self.day,
+            "departure_time_from": "06:00",
+            "departure_time_to": "12:00",
+        }
+        over_range = {
+            "departure_after": f"{self.day}T00:00:00Z",
+            "departure_before": f"{self.day + timedelta(days=2)}T00:00:00Z",
+            "departure_time_from": "05:00",
+            "departure_time_to": "08:00",
+        }
+
+        self.assertEqual(self.ids(on_day), [self.morning.id])
+        self.assertEqual(
+            self.ids(over_range), [self.morning.id, self.next_day.id]
+        )
+
+    def test_time_window_crossing_midnight(self):
+        params = {
+            "departure_date": self.day,
+            "departure_time_from": "18:00",
+            "departure_time_to": "08:00",
+        }
+
+        self.assertEqual(
+            self.ids(params), [self.evening.id, self.next_day.id]
+        )
+
+    def test_time_window_requires_date_bounds(self):
+        res = self.client.get(FLIGHT_URL, {"departure_time_from": "06:00"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_date_filter_uses_departure_index(self):
+        start = datetime.combine(
+            self.day, datetime.min.time(), tzinfo=dt_timezone.utc
+        )
+        queryset = Flight.objects.filter(
+            departure_time__gte=start,
+            departure_time__lt=start + timedelta(days=1),
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        self.assertIn("flight_departure_idx", plan)
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+from rest_framework import status
+
+from airport_app.models import Flight
+from airport_app.tests.base import (
+    BaseApiTestCase,
+    FLIGHT_SEARCH_URL,
+    sample_airport,
+    sample_city,
+    sample_country,
+    sample_flight,
+    sample_route,
+)
+
+
+class FlightSearchTests(BaseApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.day = (timezone.now() + timedelta(days=10)).date()
+        self.kyiv = sample_airport(sample_city(sample_country()))
+        self.paris = sample_airport(
+            sample_city(
+                sample_country(name="France", code="FRA"), name="Paris"
+            ),
+            name="Orly",
+        )
+        self.outbound = sample_route(
+            source=self.kyiv, destination=self.paris
+        )
+        self.inbound = sample_route(source=self.paris, destination=self.kyiv)
+
+    def flight(self, route, day_offset, hour, hours=2):
+        flight = sample_flight(route=route)
+        departure = datetime.combine(
+            self.day + timedelta(days=day_offset),
+            datetime.min.time(),
+            tzinfo=dt_timezone.utc,
+        ) + timedelta(hours=hour)
+        Flight.objects.filter(id=flight.id).update(
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=hours),
+        )
+        return flight
+
+    def search(self, **params):
+        params = {
+            "source": self.kyiv.id,
+            "destination": self.paris.id,
+            "date": self.day,
+            **params,
+        }
+        return self.client.get(FLIGHT_SEARCH_URL, params)
+
+    def ids(self, days):
+        return [day["flight"]["id"] for day in days]
+
+    def test_best_flight_per_day(self):
+        early = self.flight(self.outbound, 0, 6, hours=4)
+        short = self.flight(self.outbound, 0, 9, hours=1)
+        self.flight(self.outbound, 5, 9)
+
+        earliest = self.search()
+        shortest = self.search(sort="shortest")
+
+        self.assertEqual(earliest.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.ids(earliest.data["outbound"]), [early.id])
+        self.assertEqual(earliest.data["outbound"][0]["date"], self.day)
+        self.assertEqual(self.ids(shortest.data["outbound"]), [short.id])
+        self.assertEqual(earliest.data["inbound"], [])
+
+    def test_flexible_dates_and_return_in_one_query(self):
+        before = self.flight(self.outbound, -2, 10)
+        on_day = self.flight(self.outbound, 0, 10)
+        self.flight(self.outbound, 4, 10)
+        back = self.flight(self.inbound, 7, 10)
+        self.flight(self.inbound, 0, 10)
+
+        with self.assertNumQueries(1):
+            res = self.search(
+                flex_days=3, return_date=self.day + timedelta(days=7)
+            )
+
+        self.assertEqual(
+            self.ids(res.data["outbound"]), [before.id, on_day.id]
+        )
+        self.assertEqual(self.ids(res.data["inbound"]), [back.id])
+
+    def test_search_results_are_cached(self):
+        self.flight(self.outbound, 0, 10)
+        self.search()
+
+        with self.assertNumQueries(0):
+            res = self.search()
+
+        self.assertEqual(len(res.data["outbound"]), 1)
+
+    def test_invalid_search(self):
+        cases = [
+            {"flex_days": 4},
+            {"sort": "cheapest"},
+            {"destination": self.kyiv.id},
+            {"return_date": self.day - timedelta(days=1)},
+        ]
+        for params in cases:
+            res = self.search(**params)
+            self.assertEqual(
+                res.status_code, status.HTTP_400_BAD_REQUEST, params
+            )
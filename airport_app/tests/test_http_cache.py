@@ -0,0 +1,122 @@
+import time
+
+from django.utils.cache import get_max_age
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from airport_app.tests.base import (
+    BaseApiTestCase,
+    FLIGHT_URL,
+    ORDER_URL,
+    User,
+    detail_flight_url,
+    sample_flight,
+)
+
+
+class CachingProxy:
+    """
+    Minimal shared cache in front of the test client. It honours
+    Cache-Control and Vary the way a reverse proxy would.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.vary = {}
+        self.store = {}
+        self.backend_hits = 0
+
+    @staticmethod
+    def _directives(response):
+        directives = {}
+        for directive in response.get("Cache-Control", "").split(","):
+            name, _, value = directive.strip().partition("=")
+            directives[name] = value
+        return directives
+
+    def _key(self, path, headers):
+        return path, tuple(
+            headers.get(f"HTTP_{name}") for name in self.vary.get(path, [])
+        )
+
+    def get(self, path, **headers):
+        cached = self.store.get(self._key(path, headers))
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+        self.backend_hits += 1
+        response = self.client.get(path, **headers)
+        directives = self._directives(response)
+        if (
+            response.status_code == 200
+            and "public" in directives
+            and not {"private", "no-store"} & directives.keys()
+        ):
+            self.vary[path] = [
+                name.strip().upper().replace("-", "_")
+                for name in response.get("Vary", "").split(",")
+                if name.strip()
+            ]
+            self.store[self._key(path, headers)] = (
+                response,
+                time.monotonic()
+                + int(directives.get("s-maxage") or get_max_age(response)),
+            )
+        return response
+
+
+class HttpCacheHeadersTests(BaseApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.proxy = CachingProxy(self.client)
+        self.flight = sample_flight()
+
+    def auth_header(self, email="test@gmail.com"):
+        user = User.objects.create_user(email=email, password="pass12345")
+        token = RefreshToken.for_user(user).access_token
+        return {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def test_anonymous_flight_responses_are_shareable(self):
+        for url in (FLIGHT_URL, detail_flight_url(self.flight.id)):
+            res = self.client.get(url)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertIn("public", res["Cache-Control"])
+            self.assertIn("s-maxage=300", res["Cache-Control"])
+            self.assertIn("stale-while-revalidate=30", res["Cache-Control"])
+            self.assertIn("Authorization", res["Vary"])
+
+    def test_proxy_absorbs_repeated_anonymous_requests(self):
+        for _ in range(3):
+            res = self.proxy.get(FLIGHT_URL)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.proxy.backend_hits, 1)
+
+    def test_authenticated_flight_responses_are_private(self):
+        headers = self.auth_header()
+        self.proxy.get(FLIGHT_URL)
+
+        res = self.proxy.get(FLIGHT_URL, **headers)
+        self.proxy.get(FLIGHT_URL, **headers)
+
+        self.assertIn("private", res["Cache-Control"])
+        self.assertNotIn("s-maxage", res["Cache-Control"])
+        self.assertEqual(self.proxy.backend_hits, 3)
+
+    def test_order_responses_are_not_stored(self):
+        headers = self.auth_header()
+
+        res = self.proxy.get(ORDER_URL, **headers)
+        self.proxy.get(ORDER_URL, **headers)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("no-store", res["Cache-Control"])
+        self.assertIn("private", res["Cache-Control"])
+        self.assertEqual(self.proxy.backend_hits, 2)
+
+    def test_error_responses_are_not_cacheable(self):
+        res = self.client.get(detail_flight_url(self.flight.id + 100))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(res.has_header("Cache-Control"))
@@ -0,0 +1,107 @@
+from django.test import LiveServerTestCase, SimpleTestCase, TestCase
+
+from airport_app.models import Flight
+from airport_app.utils.loadtest import (
+    SEED_PASSWORD,
+    Results,
+    Targets,
+    parse_mix,
+    percentile,
+    run,
+    seed,
+)
+from user.models import User
+
+SMALL_SEED = {"airports": 6, "routes": 10, "flights": 40, "users": 3}
+
+
+class LoadTestResultsTests(SimpleTestCase):
+    def test_percentiles_use_the_nearest_rank(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([7], 0.95), 7)
+        self.assertIsNone(percentile([], 0.5))
+
+    def test_summary_separates_errors_from_rejections(self):
+        results = Results()
+        results.record("orders.create", 0.1, 201)
+        results.record("orders.create", 0.2, 400)
+        results.record("orders.create", 0.3, 500)
+        results.record("flights.list", 0.4, 0)
+
+        summary = results.summary(elapsed=2)
+
+        orders = summary["endpoints"]["orders.create"]
+        self.assertEqual(orders["requests"], 3)
+        self.assertEqual(orders["throughput_rps"], 1.5)
+        self.assertEqual(orders["errors"], 1)
+        self.assertEqual(orders["rejected"], 1)
+        self.assertEqual(orders["p50_ms"], 200)
+        self.assertEqual(summary["total"]["errors"], 2)
+        self.assertEqual(summary["total"]["error_rate"], 0.5)
+
+    def test_mix_names_known_scenarios(self):
+        self.assertEqual(
+            parse_mix("browse=3,order=1"), {"browse": 3, "order": 1}
+        )
+        with self.assertRaises(ValueError):
+            parse_mix("checkout=1")
+
+    def test_mix_weights_cannot_be_negative(self):
+        with self.assertRaisesMessage(ValueError, "negative"):
+            parse_mix("browse=3,order=-1")
+
+
+class SeedTests(TestCase):
+    def test_seeding_again_replaces_the_seeded_rows(self):
+        seed(**SMALL_SEED)
+        seed(**SMALL_SEED)
+
+        self.assertEqual(Flight.objects.count(), 40)
+        user = User.objects.get(email="user0@loadtest.invalid")
+        self.assertTrue(user.check_password(SEED_PASSWORD))
+        self.assertEqual(len(Targets(hot_flights=2).hot_flights), 2)
+
+    def test_seed_sizes_are_checked_up_front(self):
+        with self.assertRaisesMessage(ValueError, "2 airports"):
+            seed(**{**SMALL_SEED, "airports": 1})
+        with self.assertRaisesMessage(ValueError, "flights"):
+            seed(**{**SMALL_SEED, "flights": 0})
+
+        self.assertFalse(Flight.objects.exists())
+
+    def test_orders_need_a_hot_flight(self):
+        seed(**SMALL_SEED)
+
+        with self.assertRaisesMessage(ValueError, "hot flight"):
+            Targets(hot_flights=0)
+
+
+class LoadTestRunTests(LiveServerTestCase):
+    # The browsing scenarios read from the replicas.
+    databases = "__all__"
+
+    def test_every_scenario_runs_without_errors(self):
+        seed(**SMALL_SEED)
+
+        summary = run(
+            self.live_server_url,
+            Targets(),
+            {"browse": 1, "search": 1, "login": 1, "order": 1},
+            threads=2,
+            requests=40,
+        )
+
+        self.assertEqual(
+            set(summary["endpoints"]),
+            {
+                "auth.token",
+                "flights.list",
+                "flights.retrieve",
+                "flights.search",
+                "orders.create",
+            },
+        )
+        self.assertEqual(summary["total"]["errors"], 0, summary)
@@ -0,0 +1,108 @@
+from django.test import override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+
+from airport_app.tests.base import (
+    BaseApiTestCase,
+    FLIGHT_URL,
+    ORDER_URL,
+    sample_flight,
+    sample_order,
+    sample_ticket,
+)
+
+METRICS_URL = reverse("metrics")
+TOKEN_URL = reverse("user:token_obtain_pair")
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsMiddlewareTests(BaseApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.flight = sample_flight()
+
+    def test_viewset_actions_are_labelled(self):
+        labels = {"view": "FlightViewSet", "action": "list", "status": "200"}
+        before = sample(
+            "airport_http_request_duration_seconds_count", **labels
+        )
+        queries = sample("airport_http_request_queries_sum", **labels)
+
+        res = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sample("airport_http_request_duration_seconds_count", **labels),
+            before + 1,
+        )
+        self.assertGreater(
+            sample("airport_http_request_queries_sum", **labels), queries
+        )
+        self.assertGreater(
+            sample("airport_http_response_size_bytes_sum", **labels), 0
+        )
+
+    def test_serializer_time_is_recorded(self):
+        self.authenticate_user()
+        sample_ticket(sample_order(self.user), self.flight)
+        labels = {"view": "OrderViewSet", "action": "list", "status": "200"}
+        before = sample(
+            "airport_http_request_serializer_duration_seconds_sum", **labels
+        )
+
+        self.client.get(ORDER_URL)
+
+        self.assertGreater(
+            sample(
+                "airport_http_request_serializer_duration_seconds_sum",
+                **labels,
+            ),
+            before,
+        )
+
+    def test_token_view_failures_are_labelled_by_status(self):
+        labels = {
+            "view": "CustomTokenObtainPairView",
+            "action": "post",
+            "status": "401",
+        }
+        before = sample(
+            "airport_http_request_duration_seconds_count", **labels
+        )
+
+        self.client.post(
+            TOKEN_URL, {"email": "nobody@gmail.com", "password": "wrong"}
+        )
+
+        self.assertEqual(
+            sample("airport_http_request_duration_seconds_count", **labels),
+            before + 1,
+        )
+
+
+class MetricsEndpointTests(BaseApiTestCase):
+    def test_exposition_format(self):
+        self.client.get(FLIGHT_URL)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["Content-Type"].startswith("text/plain"))
+        self.assertIn(
+            b"# TYPE airport_http_request_duration_seconds histogram",
+            res.content,
+        )
+
+    @override_settings(AIRPORT_METRICS={"TOKEN": "scraper"})
+    def test_token_is_required_when_configured(self):
+        res = self.client.get(METRICS_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        res = self.client.get(
+            METRICS_URL, HTTP_AUTHORIZATION="Bearer scraper"
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
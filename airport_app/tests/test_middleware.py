@@ -0,0 +1,14 @@
+from django.http import HttpResponse
+from django.test import SimpleTestCase
+
+from airport_app.middleware import RequestHookMiddleware
+
+
+class RequestHookMiddlewareTests(SimpleTestCase):
+    def test_subclasses_must_provide_the_hooks(self):
+        class NoAround(RequestHookMiddleware):
+            def enabled(self) -> bool:
+                return True
+
+        with self.assertRaises(TypeError):
+            NoAround(lambda request: HttpResponse())
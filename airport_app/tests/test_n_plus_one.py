@@ -0,0 +1,97 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from airport_app.models import Order, Ticket
+from airport_app.serializers import OrderListSerializer
+from airport_app.tests.base import (
+    BaseApiTestCase,
+    ORDER_URL,
+    sample_airport,
+    sample_city,
+    sample_country,
+    sample_flight,
+    sample_order,
+    sample_route,
+    sample_ticket,
+)
+from airport_app.utils.n_plus_one import (
+    detect_n_plus_one,
+    install_n_plus_one_detector,
+)
+from airport_app.views import OrderViewSet
+
+
+def make_airport(name):
+    return sample_airport(
+        sample_city(sample_country(name=name), name=name), name=name
+    )
+
+
+class NPlusOneDetectorTests(BaseApiTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        install_n_plus_one_detector()
+
+    def setUp(self):
+        super().setUp()
+        self.authenticate_user()
+        for number in range(2):
+            order = sample_order(self.user)
+            for seat in (1, 2):
+                route = sample_route(
+                    source=make_airport(f"Source {number}-{seat}"),
+                    destination=make_airport(f"Destination {number}-{seat}"),
+                )
+                sample_ticket(order, sample_flight(route=route), seat=seat)
+
+    def detect(self, queryset):
+        with detect_n_plus_one() as detector:
+            OrderListSerializer(queryset, many=True).data
+        return {
+            detection.path: detection for detection in detector.detections(2)
+        }
+
+    def test_lazy_loads_are_reported_with_their_lookup_path(self):
+        detections = self.detect(Order.objects.all())
+
+        self.assertEqual(detections["tickets"].count, 2)
+        self.assertEqual(detections["tickets__flight"].count, 4)
+        path = "tickets__flight__route__source__city__country"
+        self.assertEqual(detections[path].fix, f'prefetch_related("{path}")')
+        self.assertIn(
+            "tickets__flight__route__destination__city__country", detections
+        )
+
+    def test_to_one_paths_suggest_select_related(self):
+        with detect_n_plus_one() as detector:
+            for ticket in Ticket.objects.select_related("flight"):
+                ticket.flight.route
+
+        [detection] = detector.detections(2)
+        self.assertEqual(detection.relation, "Flight.route")
+        self.assertEqual(detection.fix, 'select_related("flight__route")')
+
+    def test_order_viewset_queryset_loads_nothing_lazily(self):
+        self.assertEqual(self.detect(OrderViewSet.queryset.all()), {})
+
+    @override_settings(
+        AIRPORT_N_PLUS_ONE={"ENABLED": True},
+        AIRPORT_QUERY_BUDGETS={"MODE": "off"},
+    )
+    def test_middleware_logs_the_detections_of_a_request(self):
+        cache.clear()
+        with mock.patch.object(
+            OrderViewSet, "queryset", Order.objects.order_by("id")
+        ), self.assertLogs("airport_app.utils.n_plus_one") as logs:
+            self.client.get(ORDER_URL)
+
+        self.assertIn("OrderViewSet.list", logs.output[0])
+        self.assertTrue(
+            any(
+                "tickets__flight__route__source__city__country" in line
+                for line in logs.output
+            )
+        )
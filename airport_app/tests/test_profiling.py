@@ -0,0 +1,110 @@
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from airport_app.tests.base import BaseApiTestCase, FLIGHT_URL, sample_flight
+from airport_app.utils import profiling
+from airport_app.utils.profiling import ProfileStore
+from user.models import User
+
+PROFILES_URL = reverse("admin-profiles")
+
+
+class ProfileStoreTests(SimpleTestCase):
+    def test_keeps_the_latest_profiles(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = ProfileStore(directory, keep=2)
+            ids = [
+                store.save("alloc", "header", f"report {number}")
+                for number in range(3)
+            ]
+
+            self.assertEqual(len(store.profiles()), 2)
+            self.assertNotIn(min(ids), store.profiles())
+
+    def test_paths_outside_the_store_are_refused(self):
+        store = ProfileStore(tempfile.gettempdir(), keep=1)
+
+        self.assertIsNone(store.path("../secret", ".txt"))
+
+
+class ProfilingMiddlewareTests(BaseApiTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            AIRPORT_PROFILING={"ENABLED": True, "DIRECTORY": directory.name}
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        sample_flight()
+
+    def get(self, profiler, is_staff=True):
+        user = User.objects.create_user(
+            email=f"{profiler}-{is_staff}@gmail.com",
+            password="test_password123",
+            is_staff=is_staff,
+        )
+        token = RefreshToken.for_user(user).access_token
+        return self.client.get(
+            FLIGHT_URL,
+            {"_profile": profiler},
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+
+    def test_cprofile_returns_and_stores_the_call_tree(self):
+        res = self.get("cprofile")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "text/plain")
+        report = res.content.decode()
+        self.assertIn("profiled with cprofile", report)
+        self.assertIn("cumulative", report)
+        self.assertIn("airport_app/views.py", report)
+        store = profiling.get_store()
+        profile_id = res["X-Profile-Id"]
+        self.assertEqual(store.profiles(), [profile_id])
+        self.assertIsNotNone(store.path(profile_id, profiling.STATS_SUFFIX))
+
+    def test_alloc_returns_the_top_allocations(self):
+        res = self.get("alloc")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("Peak traced memory", res.content.decode())
+
+    def test_other_users_get_the_normal_response(self):
+        res = self.get("cprofile", is_staff=False)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "application/json")
+        self.assertEqual(profiling.get_store().profiles(), [])
+
+    def test_one_request_is_profiled_at_a_time(self):
+        with profiling._profiling:
+            res = self.get("cprofile")
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+    def test_admin_lists_and_downloads_profiles(self):
+        profile_id = self.get("cprofile")["X-Profile-Id"]
+        staff = User.objects.get(is_staff=True)
+        self.client.force_login(staff)
+
+        res = self.client.get(PROFILES_URL)
+        self.assertContains(res, profile_id)
+
+        res = self.client.get(reverse("admin-profile", args=[profile_id]))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn(b"cumulative", b"".join(res.streaming_content))
+
+        res = self.client.get(
+            reverse("admin-profile-stats", args=[profile_id])
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.get(reverse("admin-profile", args=["missing"]))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,538 @@
+from datetime import time, timedelta
+from itertools import count as numbers
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from airport_app.filters import departure_window
+from airport_app.models import Crew, Flight
+from airport_app.tests.base import (
+    BaseApiTestCase,
+    sample_airplane,
+    sample_airplane_type,
+    sample_airport,
+    sample_city,
+    sample_country,
+    sample_crew,
+    sample_order,
+    sample_route,
+    sample_ticket,
+)
+from airport_app.utils.query_budget import (
+    QueryBudgetExceeded,
+    QueryLog,
+    capture_queries,
+    check_query_budget,
+    get_query_budget,
+)
+from airport_app.views import (
+    AirplaneTypeViewSet,
+    AirplaneViewSet,
+    AirportViewSet,
+    CityViewSet,
+    CountryViewSet,
+    CrewViewSet,
+    FlightViewSet,
+    OrderViewSet,
+    RouteViewSet,
+)
+
+SMALL = 1
+LARGE = 50
+
+
+def make_country(number):
+    return sample_country(name=f"Country {number}")
+
+
+def make_city(number):
+    return sample_city(make_country(number), name=f"City {number}")
+
+
+def make_airport(number):
+    return sample_airport(make_city(number), name=f"Airport {number}")
+
+
+def make_route(number):
+    return sample_route(
+        source=make_airport(number),
+        destination=make_airport(number + 1000),
+    )
+
+
+def make_airplane(number):
+    return sample_airplane(
+        sample_airplane_type(name=f"Type {number}"), name=f"Plane {number}"
+    )
+
+
+def make_flight(number, crew=1):
+    flight = Flight.objects.create(
+        route=make_route(number),
+        airplane=make_airplane(number),
+        departure_time=timezone.now() + timezone.timedelta(hours=1),
+        arrival_time=timezone.now() + timezone.timedelta(hours=2),
+    )
+    flight.crew.add(
+        *(
+            sample_crew(
+                first_name=f"Crew {number}-{member}",
+                position=Crew.Position.STEWARDESS,
+            )
+            for member in range(crew)
+        )
+    )
+    return flight
+
+
+def make_flights(number, count, route=None, airplane=None):
+    """
+    count flights a minute apart on one route, airplane and day, as
+    availability is kept per route and day.
+    """
+    route = route or make_route(number)
+    airplane = airplane or make_airplane(number)
+    departure, _ = departure_window(
+        timezone.localdate() + timedelta(days=2), time(8)
+    )
+    return [
+        Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=departure + timedelta(minutes=minute),
+            arrival_time=departure + timedelta(minutes=minute, hours=1),
+        )
+        for minute in range(count)
+    ]
+
+
+class QueryBudgetTests(SimpleTestCase):
+    def test_report_lists_each_query_with_its_origin(self):
+        log = QueryLog()
+        log.append("SELECT 1", [])
+        log.append("SELECT 2", [])
+
+        with self.assertRaisesMessage(
+            QueryBudgetExceeded, "OrderViewSet.list ran 2 queries"
+        ):
+            check_query_budget("OrderViewSet.list", 1, log)
+        check_query_budget("OrderViewSet.list", 2, log)
+        check_query_budget("OrderViewSet.list", None, log)
+
+    def test_read_actions_have_budgets(self):
+        for viewset in (
+            CountryViewSet,
+            CityViewSet,
+            CrewViewSet,
+            AirportViewSet,
+            RouteViewSet,
+            AirplaneTypeViewSet,
+            AirplaneViewSet,
+            FlightViewSet,
+            OrderViewSet,
+        ):
+            for action in ("list", "retrieve"):
+                with self.subTest(viewset=viewset.__name__, action=action):
+                    self.assertIsNotNone(get_query_budget(viewset, action))
+
+
+class ActionQueryCountTests(BaseApiTestCase):
+    """
+    Each action runs as many queries for 1 object, or an object with 1
+    related row, as for 50, and stays within the budget of its viewset.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.authenticate_user(is_admin=True)
+
+    def count_queries(self, url, payload=None, method=None):
+        method = method or ("get" if payload is None else "post")
+        cache.clear()
+        # Autovacuum may have analyzed the tables while they were empty
+        # between tests, and plans built on that nest loops over every
+        # row created here.
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        with capture_queries() as log:
+            if method == "get":
+                res = self.client.get(url)
+            else:
+                res = getattr(self.client, method)(
+                    url, payload, format="json"
+                )
+        self.assertIn(
+            res.status_code,
+            (
+                status.HTTP_200_OK,
+                status.HTTP_201_CREATED,
+                status.HTTP_204_NO_CONTENT,
+            ),
+            res.data,
+        )
+        return log
+
+    def assert_flat(self, viewset, action, request_for):
+        """
+        request_for(count) creates count objects and returns the URL, the
+        URL and the payload to post, or the URL, payload and method.
+        """
+        counts = {}
+        for count in (SMALL, LARGE):
+            request = request_for(count)
+            if isinstance(request, str):
+                request = (request,)
+            counts[count] = self.count_queries(*request)
+        self.assertEqual(
+            len(counts[SMALL]),
+            len(counts[LARGE]),
+            f"{viewset.__name__}.{action} scales with the data:\n"
+            f"{counts[LARGE].report()}",
+        )
+        self.assertLessEqual(
+            len(counts[LARGE]), get_query_budget(viewset, action)
+        )
+
+    def assert_list_flat(self, viewset, basename, make):
+        offset = 0
+
+        def url_for(count):
+            nonlocal offset
+            for number in range(offset, offset + count):
+                make(number)
+            offset += count
+            return reverse(f"airport_app:{basename}-list")
+
+        self.assert_flat(viewset, "list", url_for)
+
+    def assert_retrieve_flat(self, viewset, basename, make):
+        offset = 0
+
+        def url_for(count):
+            nonlocal offset
+            instance = make(offset, count)
+            offset += count
+            return reverse(
+                f"airport_app:{basename}-detail", args=[instance.pk]
+            )
+
+        self.assert_flat(viewset, "retrieve", url_for)
+
+    def assert_writes_flat(self, viewset, basename, make, payload):
+        """
+        make(number, count) creates an object with count dependent rows,
+        e.g. a country with count cities, and payload(number) is the body
+        that creates or replaces one. Creates run next to count objects.
+        """
+        bases = numbers(10_000, 10_000)
+
+        def detail_url(instance):
+            return reverse(
+                f"airport_app:{basename}-detail", args=[instance.pk]
+            )
+
+        def create(count):
+            for _ in range(count):
+                make(next(bases), 0)
+            return reverse(f"airport_app:{basename}-list"), payload(
+                next(bases)
+            )
+
+        def update(count):
+            instance = make(next(bases), count)
+            return detail_url(instance), payload(next(bases)), "put"
+
+        def partial_update(count):
+            instance = make(next(bases), count)
+            field, value = next(iter(payload(next(bases)).items()))
+            return detail_url(instance), {field: value}, "patch"
+
+        def destroy(count):
+            return detail_url(make(next(bases), count)), None, "delete"
+
+        for action, request_for in (
+            ("create", create),
+            ("update", update),
+            ("partial_update", partial_update),
+            ("destroy", destroy),
+        ):
+            with self.subTest(viewset=viewset.__name__, action=action):
+                self.assert_flat(viewset, action, request_for)
+
+    def test_countries(self):
+        self.assert_list_flat(CountryViewSet, "country", make_country)
+        self.assert_retrieve_flat(
+            CountryViewSet, "country", lambda number, count: make_country(
+                number + 500
+            )
+        )
+
+    def test_cities(self):
+        self.assert_list_flat(CityViewSet, "city", make_city)
+        self.assert_retrieve_flat(
+            CityViewSet, "city", lambda number, count: make_city(number + 500)
+        )
+
+    def test_crew(self):
+        self.assert_list_flat(
+            CrewViewSet, "crew", lambda number: sample_crew()
+        )
+        self.assert_retrieve_flat(
+            CrewViewSet, "crew", lambda number, count: sample_crew()
+        )
+
+    def test_airports(self):
+        self.assert_list_flat(AirportViewSet, "airport", make_airport)
+        self.assert_retrieve_flat(
+            AirportViewSet,
+            "airport",
+            lambda number, count: make_airport(number + 500),
+        )
+
+    def test_routes(self):
+        self.assert_list_flat(RouteViewSet, "route", make_route)
+        self.assert_retrieve_flat(
+            RouteViewSet,
+            "route",
+            lambda number, count: make_route(number + 500),
+        )
+
+    def test_airplane_types(self):
+        self.assert_list_flat(
+            AirplaneTypeViewSet,
+            "airplanetype",
+            lambda number: sample_airplane_type(name=f"Type {number}"),
+        )
+        self.assert_retrieve_flat(
+            AirplaneTypeViewSet,
+            "airplanetype",
+            lambda number, count: sample_airplane_type(
+                name=f"Type {number + 500}"
+            ),
+        )
+
+    def test_airplanes(self):
+        self.assert_list_flat(AirplaneViewSet, "airplane", make_airplane)
+        self.assert_retrieve_flat(
+            AirplaneViewSet,
+            "airplane",
+            lambda number, count: make_airplane(number + 500),
+        )
+
+    def test_flights(self):
+        self.assert_list_flat(FlightViewSet, "flight", make_flight)
+        # A flight with 1 and then 50 crew members.
+        self.assert_retrieve_flat(
+            FlightViewSet,
+            "flight",
+            lambda number, count: make_flight(number + 500, crew=count),
+        )
+
+    def test_flight_create(self):
+        pilot = sample_crew(position=Crew.Position.MAIN_PILOT)
+
+        def request_for(count):
+            flight = make_flight(count)
+            crew = [pilot] + [
+                sample_crew(position=Crew.Position.STEWARDESS)
+                for _ in range(count)
+            ]
+            return reverse("airport_app:flight-list"), {
+                "route": flight.route_id,
+                "airplane": flight.airplane_id,
+                "departure_time": flight.departure_time
+                + timezone.timedelta(days=count),
+                "arrival_time": flight.arrival_time
+                + timezone.timedelta(days=count),
+                "crew": [member.id for member in crew],
+            }
+
+        self.assert_flat(FlightViewSet, "create", request_for)
+
+    def test_country_writes(self):
+        def make(number, count):
+            country = make_country(number)
+            for city in range(count):
+                sample_city(country, name=f"City {number + city}")
+            return country
+
+        self.assert_writes_flat(
+            CountryViewSet,
+            "country",
+            make,
+            lambda number: {
+                "name": f"Country {number}",
+                "code": f"C{number // 10_000:02d}",
+            },
+        )
+
+    def test_city_writes(self):
+        def make(number, count):
+            city = make_city(number)
+            for airport in range(count):
+                sample_airport(city, name=f"Airport {number + airport}")
+            return city
+
+        self.assert_writes_flat(
+            CityViewSet,
+            "city",
+            make,
+            lambda number: {
+                "name": f"City {number}",
+                "country": make_country(number).id,
+            },
+        )
+
+    def test_crew_writes(self):
+        def make(number, count):
+            member = sample_crew(position=Crew.Position.STEWARDESS)
+            for flight in make_flights(number, count):
+                flight.crew.add(member)
+            return member
+
+        self.assert_writes_flat(
+            CrewViewSet,
+            "crew",
+            make,
+            lambda number: {
+                "first_name": f"Crew {number}",
+                "last_name": "Doe",
+                "position": Crew.Position.MEDIC,
+            },
+        )
+
+    def test_airport_writes(self):
+        def make(number, count):
+            airport = make_airport(number)
+            for route in range(count):
+                sample_route(
+                    source=airport,
+                    destination=make_airport(number + route + 1),
+                )
+            return airport
+
+        self.assert_writes_flat(
+            AirportViewSet,
+            "airport",
+            make,
+            lambda number: {
+                "name": f"Airport {number}",
+                "city": make_city(number).id,
+            },
+        )
+
+    def test_route_writes(self):
+        def make(number, count):
+            route = make_route(number)
+            make_flights(number, count, route=route)
+            return route
+
+        self.assert_writes_flat(
+            RouteViewSet,
+            "route",
+            make,
+            lambda number: {
+                "source": make_airport(number).id,
+                "destination": make_airport(number + 1).id,
+                "distance": 700,
+            },
+        )
+
+    def test_airplane_type_writes(self):
+        def make(number, count):
+            airplane_type = sample_airplane_type(name=f"Type {number}")
+            for airplane in range(count):
+                sample_airplane(
+                    airplane_type, name=f"Plane {number + airplane}"
+                )
+            return airplane_type
+
+        self.assert_writes_flat(
+            AirplaneTypeViewSet,
+            "airplanetype",
+            make,
+            lambda number: {"name": f"Type {number}"},
+        )
+
+    def test_airplane_writes(self):
+        def make(number, count):
+            airplane = make_airplane(number)
+            make_flights(number, count, airplane=airplane)
+            return airplane
+
+        self.assert_writes_flat(
+            AirplaneViewSet,
+            "airplane",
+            make,
+            lambda number: {
+                "name": f"Plane {number}",
+                "rows": 20,
+                "seats_in_row": 4,
+                "airplane_type": sample_airplane_type(
+                    name=f"Type {number}"
+                ).id,
+            },
+        )
+
+    def test_flight_writes(self):
+        def make(number, count):
+            # A flight with count crew members and count tickets.
+            flight = make_flight(number, crew=count)
+            flight.crew.add(sample_crew(position=Crew.Position.MAIN_PILOT))
+            order = sample_order(self.user)
+            for ticket in range(count):
+                sample_ticket(
+                    order, flight, row=ticket // 6 + 1, seat=ticket % 6 + 1
+                )
+            return flight
+
+        def payload(number):
+            departure = timezone.now() + timezone.timedelta(days=1)
+            return {
+                "route": make_route(number).id,
+                "airplane": make_airplane(number).id,
+                "departure_time": departure,
+                "arrival_time": departure + timezone.timedelta(hours=2),
+                "crew": [
+                    sample_crew(position=position).id
+                    for position in (
+                        Crew.Position.MAIN_PILOT,
+                        Crew.Position.STEWARDESS,
+                    )
+                ],
+            }
+
+        self.assert_writes_flat(FlightViewSet, "flight", make, payload)
+
+    def test_orders(self):
+        def make_order(number):
+            sample_ticket(sample_order(self.user), make_flight(number))
+
+        def make_order_with_tickets(number, count):
+            order = sample_order(self.user)
+            for ticket in range(count):
+                sample_ticket(order, make_flight(number + 500 + ticket))
+            return order
+
+        self.assert_list_flat(OrderViewSet, "order", make_order)
+        self.assert_retrieve_flat(
+            OrderViewSet, "order", make_order_with_tickets
+        )
+
+
+@override_settings(AIRPORT_QUERY_BUDGETS={"MODE": "raise"})
+class QueryBudgetMiddlewareTests(BaseApiTestCase):
+    def test_requests_over_budget_fail_with_the_queries(self):
+        self.authenticate_user(is_admin=True)
+        make_flight(1)
+
+        with mock.patch.dict(FlightViewSet.action_query_budgets, list=1):
+            with self.assertRaisesMessage(
+                QueryBudgetExceeded, "FlightViewSet.list ran"
+            ):
+                self.client.get(reverse("airport_app:flight-list"))
@@ -0,0 +1,134 @@
+from contextlib import ExitStack
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import (
+    SimpleTestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_app.models import Flight
+from airport_app.tests.base import (
+    FLIGHT_URL,
+    ORDER_URL,
+    sample_flight,
+)
+from airport_app.utils.replicas import (
+    ReplicaRouter,
+    get_replica_settings,
+    read_from_replica,
+)
+from airport_app.views import FlightViewSet
+
+REPLICAS = get_replica_settings()["DATABASES"]
+
+User = get_user_model()
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    @override_settings(AIRPORT_REPLICAS={"DATABASES": ["replica1"]})
+    def test_reads_follow_the_request_policy(self):
+        self.assertIsNone(self.router.db_for_read(Flight))
+
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_read(Flight), "replica1")
+            self.assertEqual(self.router.db_for_write(Flight), "default")
+
+        self.assertIsNone(self.router.db_for_read(Flight))
+
+    @override_settings(AIRPORT_REPLICAS={"DATABASES": []})
+    def test_without_replicas_reads_stay_on_primary(self):
+        with read_from_replica():
+            self.assertIsNone(self.router.db_for_read(Flight))
+
+    def test_only_primary_is_migrated(self):
+        self.assertTrue(self.router.allow_migrate("default", "airport_app"))
+        self.assertFalse(self.router.allow_migrate("replica1", "airport_app"))
+
+
+@skipUnless(REPLICAS, "No replica alias to test the routing against.")
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Committed rows are visible through the replica connections, which
+    mirror the primary's test database.
+    """
+
+    databases = {"default", *REPLICAS}
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.flight = sample_flight()
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="test_password123"
+        )
+
+    def capture(self, method, *args, **kwargs):
+        """Return the response and the primary and replica query counts."""
+        with ExitStack() as stack:
+            primary = stack.enter_context(
+                CaptureQueriesContext(connections["default"])
+            )
+            replicas = [
+                stack.enter_context(CaptureQueriesContext(connections[alias]))
+                for alias in REPLICAS
+            ]
+            res = method(*args, **kwargs)
+        return res, len(primary), sum(len(context) for context in replicas)
+
+    def test_safe_requests_read_from_replica(self):
+        res, primary, replica = self.capture(self.client.get, FLIGHT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["id"], self.flight.id)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_user_reads_own_writes_after_order(self):
+        self.client.force_authenticate(self.user)
+        payload = {
+            "tickets": [{"row": 1, "seat": 1, "flight": self.flight.id}]
+        }
+
+        res, primary, replica = self.capture(
+            self.client.post, ORDER_URL, payload, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(replica, 0)
+
+        res, primary, replica = self.capture(self.client.get, ORDER_URL)
+        self.assertEqual(res.data["total"], 1)
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_replica_routing_ends_with_the_request(self):
+        with mock.patch.object(
+            FlightViewSet, "list", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                self.client.get(FLIGHT_URL)
+
+        self.assertIsNone(ReplicaRouter().db_for_read(Flight))
+
+    def test_other_users_still_read_from_replica(self):
+        self.client.force_authenticate(self.user)
+        self.client.post(
+            ORDER_URL,
+            {"tickets": [{"row": 1, "seat": 1, "flight": self.flight.id}]},
+            format="json",
+        )
+        self.client.force_authenticate(None)
+
+        res, primary, replica = self.capture(self.client.get, FLIGHT_URL)
+
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
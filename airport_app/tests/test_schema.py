@@ -0,0 +1,117 @@
+import gzip
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+SCHEMA_URL = reverse("schema")
+JSON_MEDIA_TYPE = "application/vnd.oai.openapi+json"
+
+LOADED_SPECTACULAR_MODULES = """
+import json, sys
+import airport.wsgi
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps(sorted(
+    name for name in sys.modules if name.startswith("drf_spectacular.")
+)))
+"""
+
+
+class SchemaArtifactTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        cls.enterClassContext(
+            override_settings(AIRPORT_SCHEMA={"DIRECTORY": directory.name})
+        )
+        call_command("build_schema", stdout=StringIO(), stderr=StringIO())
+
+    def test_schema_is_served_from_the_artifact(self):
+        res = self.client.get(SCHEMA_URL, HTTP_ACCEPT=JSON_MEDIA_TYPE)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], JSON_MEDIA_TYPE)
+        paths = json.loads(res.content)["paths"]
+        self.assertIn("/api/airport/flights/", paths)
+        self.assertIn("ETag", res)
+
+    def test_autocomplete_takes_q_and_limit_and_returns_a_list(self):
+        res = self.client.get(SCHEMA_URL, HTTP_ACCEPT=JSON_MEDIA_TYPE)
+
+        operation = json.loads(res.content)["paths"][
+            "/api/airport/airports/autocomplete/"
+        ]["get"]
+        self.assertEqual(
+            {parameter["name"] for parameter in operation["parameters"]},
+            {"q", "limit"},
+        )
+        schema = operation["responses"]["200"]["content"][
+            "application/json"
+        ]["schema"]
+        self.assertEqual(schema["type"], "array")
+
+    def test_gzip_clients_get_the_compressed_file(self):
+        plain = self.client.get(SCHEMA_URL)
+        res = self.client.get(SCHEMA_URL, HTTP_ACCEPT_ENCODING="gzip, br")
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(res.content), plain.content)
+        self.assertEqual(res["ETag"], plain["ETag"])
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.client.get(SCHEMA_URL)["ETag"]
+
+        res = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b"")
+
+
+@override_settings(AIRPORT_SCHEMA={"DIRECTORY": "/nonexistent/schema"})
+class MissingSchemaArtifactTests(SimpleTestCase):
+    def test_production_refuses_live_generation(self):
+        res = self.client.get(SCHEMA_URL, HTTP_ACCEPT=JSON_MEDIA_TYPE)
+
+        self.assertEqual(
+            res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+    @override_settings(DEBUG=True)
+    def test_debug_generates_the_schema(self):
+        res = self.client.get(SCHEMA_URL, HTTP_ACCEPT=JSON_MEDIA_TYPE)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("paths", json.loads(res.content))
+
+
+class LazySchemaTests(SimpleTestCase):
+    def test_workers_boot_without_the_schema_generator(self):
+        result = subprocess.run(
+            [sys.executable, "-c", LOADED_SPECTACULAR_MODULES],
+            cwd=settings.BASE_DIR,
+            env={
+                **os.environ,
+                "DJANGO_ENV": "prod",
+                "SECRET_KEY": "test",
+                "AIRPORT_METRICS_TOKEN": "test",
+            },
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        modules = json.loads(result.stdout)
+
+        self.assertNotIn("drf_spectacular.openapi", modules)
+        self.assertNotIn("drf_spectacular.utils", modules)
@@ -0,0 +1,96 @@
+from django.db import connection
+
+from airport_app.models import Airport, Crew
+from airport_app.tests.base import (
+    BaseApiTestCase,
+    AIRPORT_URL,
+    CREW_URL,
+    FLIGHT_URL,
+    ROUTE_URL,
+    sample_airport,
+    sample_city,
+    sample_country,
+    sample_crew,
+    sample_flight,
+    sample_route,
+)
+
+
+class TrigramSearchTests(BaseApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_user()
+        city = sample_city(sample_country())
+        self.heathrow = sample_airport(city, name="Heathrow")
+        self.heathrow_terminal = sample_airport(
+            city, name="Heathrow Terminal Express Station"
+        )
+        self.gatwick = sample_airport(city, name="Gatwick")
+
+    def test_airport_search_ranked_by_similarity(self):
+        res = self.client.get(AIRPORT_URL, {"search": "heathrow"})
+
+        self.assertEqual(
+            [airport["name"] for airport in res.data["results"]],
+            ["Heathrow", "Heathrow Terminal Express Station"],
+        )
+
+    def test_route_search_matches_source_and_destination(self):
+        sample_route(source=self.heathrow, destination=self.gatwick)
+        sample_route(source=self.gatwick, destination=self.heathrow_terminal)
+
+        res = self.client.get(ROUTE_URL, {"search": "gatw"})
+
+        self.assertEqual(res.data["total"], 2)
+
+    def test_flight_search_by_airport_name(self):
+        sample_flight(
+            route=sample_route(source=self.heathrow, destination=self.gatwick)
+        )
+
+        res = self.client.get(FLIGHT_URL, {"search": "Gatwick"})
+        empty = self.client.get(FLIGHT_URL, {"search": "Boryspil"})
+
+        self.assertEqual(res.data["total"], 1)
+        self.assertEqual(empty.data["total"], 0)
+
+    def test_search_uses_trigram_index(self):
+        queryset = Airport.objects.filter(name__icontains="heath")
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        self.assertIn("airport_name_trgm_idx", plan)
+
+
+class CrewSearchTests(BaseApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_user(is_admin=True)
+        self.john = sample_crew(first_name="John", last_name="Smith")
+        sample_crew(first_name="Jane", last_name="Doe")
+
+    def test_search_by_full_name(self):
+        res = self.client.get(CREW_URL, {"search": "john smi"})
+
+        self.assertEqual(
+            [member["id"] for member in res.data["results"]], [self.john.id]
+        )
+
+    def test_search_column_follows_renames(self):
+        self.john.last_name = "Walker"
+        self.john.save()
+
+        res = self.client.get(CREW_URL, {"search": "john walker"})
+
+        self.assertEqual(res.data["total"], 1)
+
+    def test_search_uses_trigram_index(self):
+        queryset = Crew.objects.filter(search_full_name__icontains="n smi")
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        self.assertIn("crew_full_name_trgm_idx", plan)
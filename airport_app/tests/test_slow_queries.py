@@ -0,0 +1,123 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from airport_app.models import Flight
+from airport_app.tests.base import (
+    BaseApiTestCase,
+    FLIGHT_URL,
+    sample_flight,
+)
+from airport_app.utils import slow_queries
+from airport_app.utils.slow_queries import (
+    SlowQueryBuffer,
+    explain,
+    log_slow_queries,
+)
+
+SLOW_QUERIES_URL = reverse("admin-slow-queries")
+
+
+class SlowQueryBufferTests(SimpleTestCase):
+    def test_keeps_the_latest_records(self):
+        buffer = SlowQueryBuffer(2)
+        for number in range(3):
+            buffer.append({"number": number})
+
+        self.assertEqual(
+            [record["number"] for record in buffer.records()], [1, 2]
+        )
+
+
+@override_settings(
+    AIRPORT_SLOW_QUERIES={"ENABLED": True, "THRESHOLD_MS": 0}
+)
+class SlowQueryLogTests(BaseApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.flight = sample_flight()
+        self.buffer = SlowQueryBuffer(50)
+        self.logger = mock.Mock()
+        for name, value in (("_buffer", self.buffer), ("logger", self.logger)):
+            patcher = mock.patch.object(slow_queries, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_queries_are_recorded_with_view_and_plan(self):
+        with connection.execute_wrapper(log_slow_queries):
+            res = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        record = next(
+            record
+            for record in self.buffer.records()
+            if 'FROM "airport_app_flight"' in record["sql"]
+        )
+        self.assertEqual(record["view"], "FlightViewSet")
+        self.assertEqual(record["action"], "list")
+        self.assertEqual(record["path"], FLIGHT_URL)
+        self.assertIn("Plan", record["plan"][0])
+        self.logger.warning.assert_called()
+
+    def test_log_lines_leave_out_the_params(self):
+        with connection.execute_wrapper(log_slow_queries):
+            list(Flight.objects.filter(route__source__name="Secret"))
+
+        self.assertIn("Secret", self.buffer.records()[-1]["params"])
+        self.assertNotIn("Secret", str(self.logger.warning.call_args))
+
+    def test_params_are_logged_when_enabled(self):
+        with override_settings(
+            AIRPORT_SLOW_QUERIES={"THRESHOLD_MS": 0, "LOG_PARAMS": True}
+        ):
+            with connection.execute_wrapper(log_slow_queries):
+                list(Flight.objects.filter(route__source__name="Secret"))
+
+        self.assertIn("Secret", str(self.logger.warning.call_args))
+
+    def test_fast_queries_are_not_recorded(self):
+        with override_settings(
+            AIRPORT_SLOW_QUERIES={"ENABLED": True, "THRESHOLD_MS": 10_000}
+        ):
+            with connection.execute_wrapper(log_slow_queries):
+                list(Flight.objects.all())
+
+        self.assertEqual(self.buffer.records(), [])
+
+    def test_failed_explain_keeps_the_transaction_usable(self):
+        self.assertIsNone(
+            explain(connection, "SELECT * FROM missing_table", None)
+        )
+        self.assertEqual(Flight.objects.count(), 1)
+
+    def test_writes_are_not_explained(self):
+        with connection.execute_wrapper(log_slow_queries):
+            Flight.objects.update(is_active=False)
+
+        self.assertIsNone(self.buffer.records()[-1]["plan"])
+
+    def test_admin_lists_slow_queries_for_staff(self):
+        with connection.execute_wrapper(log_slow_queries):
+            list(Flight.objects.all())
+        self.authenticate_user(is_admin=True)
+        self.client.force_login(self.user)
+
+        res = self.client.get(SLOW_QUERIES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertContains(res, "airport_app_flight")
+        self.assertContains(res, "EXPLAIN")
+
+        self.client.post(SLOW_QUERIES_URL)
+        self.assertEqual(self.buffer.records(), [])
+
+    def test_admin_page_requires_staff(self):
+        self.authenticate_user()
+        self.client.force_login(self.user)
+
+        res = self.client.get(SLOW_QUERIES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_302_FOUND)
@@ -0,0 +1,132 @@
+import json
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from airport_app.middleware import TracingMiddleware
+from airport_app.tests.base import BaseApiTestCase, FLIGHT_URL, sample_flight
+from airport_app.utils import tracing
+from airport_app.utils.tracing import (
+    JsonFileExporter,
+    Span,
+    Trace,
+    install_tracing,
+    trace_sql,
+)
+from user.models import User
+
+
+class JsonFileExporterTests(SimpleTestCase):
+    def test_appends_one_otlp_trace_per_line(self):
+        trace = Trace()
+        request = Span(trace, "request", None, {"method": "GET"})
+        trace.spans = [Span(trace, "sql", request, {}), request]
+        for finished in trace.spans:
+            finished.end = finished.start
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "traces.jsonl"
+            with override_settings(AIRPORT_TRACING={"FILE": str(path)}):
+                exporter = JsonFileExporter()
+            exporter.export(trace)
+            exporter.export(trace)
+
+            lines = path.read_text().splitlines()
+
+        self.assertEqual(len(lines), 2)
+        spans = json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0][
+            "spans"
+        ]
+        sql, request = spans
+        self.assertEqual(sql["parentSpanId"], request["spanId"])
+        self.assertEqual(sql["traceId"], trace.trace_id)
+        self.assertEqual(
+            request["attributes"],
+            [{"key": "method", "value": {"stringValue": "GET"}}],
+        )
+
+
+@override_settings(AIRPORT_TRACING={"ENABLED": True, "SAMPLE_RATE": 1})
+class TracingMiddlewareTests(BaseApiTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        install_tracing()
+
+    def setUp(self):
+        super().setUp()
+        sample_flight()
+        self.exporter = mock.Mock()
+        patcher = mock.patch.object(tracing, "_exporter", self.exporter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        user = User.objects.create_user(
+            email="test@gmail.com", password="test_password123"
+        )
+        token = RefreshToken.for_user(user).access_token
+        self.headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def test_request_phases_are_spans_of_one_trace(self):
+        with connection.execute_wrapper(trace_sql):
+            res = self.client.get(FLIGHT_URL, **self.headers)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        [trace] = [call.args[0] for call in self.exporter.export.mock_calls]
+        spans = {span.name: span for span in trace.spans}
+        root = spans["GET FlightViewSet.list"]
+        self.assertEqual(root.attributes["status"], 200)
+        for name in (
+            "authenticate",
+            "permissions",
+            "queryset.count",
+            "queryset",
+            "serialize",
+            "render",
+            "sql",
+        ):
+            with self.subTest(name=name):
+                self.assertIn(name, spans)
+        self.assertEqual(
+            spans["authenticate.user"].parent_id,
+            spans["authenticate"].span_id,
+        )
+        self.assertEqual(
+            spans["serialize"].attributes["class"], "ListSerializer"
+        )
+        self.assertEqual(spans["queryset"].attributes["model"], "Flight")
+
+    def test_requests_outside_the_sample_are_not_traced(self):
+        with override_settings(
+            AIRPORT_TRACING={"ENABLED": True, "SAMPLE_RATE": 0}
+        ):
+            self.client.get(FLIGHT_URL, **self.headers)
+
+        self.exporter.export.assert_not_called()
+
+
+@override_settings(AIRPORT_TRACING={"ENABLED": True, "SAMPLE_RATE": 1})
+class AsyncTracingMiddlewareTests(SimpleTestCase):
+    async def test_async_requests_export_off_the_event_loop(self):
+        exporting_threads = []
+        exporter = mock.Mock()
+        exporter.export.side_effect = lambda trace: exporting_threads.append(
+            threading.get_ident()
+        )
+
+        async def get_response(request):
+            return HttpResponse()
+
+        with mock.patch.object(tracing, "_exporter", exporter):
+            response = await TracingMiddleware(get_response)(
+                RequestFactory().get("/")
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(exporting_threads), 1)
+        self.assertNotEqual(exporting_threads[0], threading.get_ident())
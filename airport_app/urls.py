@@ -11,6 +11,9 @@ from airport_app.views import (
     OrderViewSet,
     AirplaneTypeViewSet,
     CrewViewSet,
+    AsyncFlightView,
+    airport_board_stream,
+    flight_seats_stream,
 )
 
 router = routers.DefaultRouter()
@@ -24,6 +27,33 @@ router.register("airplanes", AirplaneViewSet)
 router.register("flights", FlightViewSet)
 router.register("orders", OrderViewSet)
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path(
+        "async/flights/",
+        AsyncFlightView.as_view(action="list"),
+        name="async-flight-list",
+    ),
+    path(
+        "async/flights/search/",
+        AsyncFlightView.as_view(action="search"),
+        name="async-flight-search",
+    ),
+    path(
+        "async/flights/<int:pk>/",
+        AsyncFlightView.as_view(action="retrieve"),
+        name="async-flight-detail",
+    ),
+    path(
+        "flights/<int:pk>/seats/stream/",
+        flight_seats_stream,
+        name="flight-seats-stream",
+    ),
+    path(
+        "airports/<int:pk>/board/stream/",
+        airport_board_stream,
+        name="airport-board-stream",
+    ),
+    path("", include(router.urls)),
+]
 
 app_name = "airport_app"
@@ -0,0 +1,124 @@
+import heapq
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+
+from airport_app.models import Airport
+from airport_app.serializers import AirportAutocompleteSerializer
+from airport_app.utils.cache import get_cache_settings, get_generation
+
+# Lower rank wins: an airport name match beats a city match,
+# which beats a country name or code match.
+AIRPORT_RANK, CITY_RANK, COUNTRY_RANK = 0, 1, 2
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(text.casefold().split())
+
+
+def word_suffixes(text: str) -> list:
+    """'New York JFK' -> ['new york jfk', 'york jfk', 'jfk']"""
+    words = normalize(text).split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class PrefixIndex:
+    """
+    Immutable sorted-array index. A lookup bisects to the first key that
+    is >= the prefix and walks forward while keys still match.
+    """
+
+    def __init__(self, entries):
+        keys = {}
+        for text, rank, item_id in entries:
+            for key in word_suffixes(text):
+                keys[key, item_id] = min(rank, keys.get((key, item_id), rank))
+        self._entries = sorted(
+            (key, rank, item_id) for (key, item_id), rank in keys.items()
+        )
+        self._keys = [key for key, _, _ in self._entries]
+
+    def search(self, prefix: str, limit: int) -> list:
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        best = {}
+        position = bisect_left(self._keys, prefix)
+        for key, rank, item_id in self._entries[position:]:
+            if not key.startswith(prefix):
+                break
+            partial = key != prefix
+            score = (rank, partial, len(key))
+            if item_id not in best or score < best[item_id]:
+                best[item_id] = score
+
+        return [
+            item_id
+            for item_id, _ in heapq.nsmallest(
+                limit, best.items(), key=lambda item: (item[1], item[0])
+            )
+        ]
+
+
+class AirportAutocomplete:
+    """
+    Process-local autocomplete over airport, city and country names and
+    country codes. The index is rebuilt lazily once the ``airports``
+    cache generation is bumped by the model signals, or once it is older
+    than ``INDEX_MAX_AGE`` seconds: a bump can be missed, e.g. by a worker
+    whose cache is not shared with the writer.
+    """
+
+    namespace = "airports"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = None
+        self._built_at = None
+        self._state = None
+
+    def build(self):
+        airports = Airport.objects.select_related("city__country")
+        entries = []
+        payloads = {}
+        for airport in airports:
+            city = airport.city
+            entries += [
+                (airport.name, AIRPORT_RANK, airport.id),
+                (city.name, CITY_RANK, airport.id),
+                (city.country.name, COUNTRY_RANK, airport.id),
+                (city.country.code, COUNTRY_RANK, airport.id),
+            ]
+            payloads[airport.id] = AirportAutocompleteSerializer(airport).data
+        return PrefixIndex(entries), payloads
+
+    def _is_current(self, generation, now) -> bool:
+        # Without a cache, e.g. DummyCache, the generation is always None.
+        if self._built_at is None:
+            return False
+        max_age = get_cache_settings()["INDEX_MAX_AGE"]
+        return self._generation == generation and (
+            now - self._built_at < max_age
+        )
+
+    def _get_state(self):
+        generation = get_generation(self.namespace)
+        now = time.monotonic()
+        if not self._is_current(generation, now):
+            with self._lock:
+                if not self._is_current(generation, now):
+                    self._state = self.build()
+                    self._generation = generation
+                    self._built_at = now
+        return self._state
+
+    def search(self, query: str, limit: int = 10) -> list:
+        index, payloads = self._get_state()
+        return [payloads[item_id] for item_id in index.search(query, limit)]
+
+
+airport_autocomplete = AirportAutocomplete()
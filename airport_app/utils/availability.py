@@ -0,0 +1,73 @@
+from django.db import transaction
+from django.db.models import Count, F, Max, Min
+from django.utils import timezone
+
+from airport_app.filters import departure_window
+from airport_app.models import Flight, Route, RouteAvailability
+
+
+def flight_route_day(flight) -> tuple:
+    return flight.route_id, timezone.localdate(flight.departure_time)
+
+
+def refresh_route_days(route_days) -> None:
+    """
+    Recompute the availability rows of the given (route_id, date) pairs
+    from that day's flights only, so writes never rescan a whole route.
+
+    The routes stay locked until the calling transaction ends. A
+    concurrent order on the same route waits for it to commit, then
+    counts its tickets too, instead of overwriting the row with counts
+    that miss them.
+    """
+    route_days = set(route_days)
+    if not route_days:
+        return
+    with transaction.atomic(savepoint=False):
+        list(
+            Route.objects.select_for_update()
+            .filter(id__in={route_id for route_id, _ in route_days})
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        for route_id, day in route_days:
+            refresh_route_day(route_id, day)
+
+
+def refresh_route_day(route_id, day) -> None:
+    start, end = departure_window(day)
+    stats = (
+        Flight.objects.filter(
+            route_id=route_id,
+            departure_time__gte=start,
+            departure_time__lt=end,
+        )
+        .annotate(
+            free_seats=F("airplane__seat_capacity") - Count("tickets")
+        )
+        .aggregate(
+            flights_count=Count("id"),
+            min_free_seats=Min("free_seats"),
+            max_free_seats=Max("free_seats"),
+        )
+    )
+
+    if not stats["flights_count"]:
+        RouteAvailability.objects.filter(
+            route_id=route_id, date=day
+        ).delete()
+        return
+
+    RouteAvailability.objects.update_or_create(
+        route_id=route_id, date=day, defaults=stats
+    )
+
+
+def rebuild_availability() -> int:
+    RouteAvailability.objects.all().delete()
+    route_days = {
+        flight_route_day(flight)
+        for flight in Flight.objects.only("route_id", "departure_time")
+    }
+    refresh_route_days(route_days)
+    return len(route_days)
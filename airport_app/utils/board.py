@@ -0,0 +1,92 @@
+from django.utils import timezone
+
+from airport_app.models import Airport, Flight
+from airport_app.serializers import (
+    ArrivalBoardSerializer,
+    DepartureBoardSerializer,
+)
+from airport_app.utils.cache import bump_generation, get_or_compute
+
+# Largest ``limit`` a client may ask for. The cached window holds twice
+# as many rows so that flights leaving it between two refreshes do not
+# shorten the board.
+BOARD_MAX_LIMIT = 50
+BOARD_WINDOW_SIZE = 2 * BOARD_MAX_LIMIT
+
+# Upper bound on how stale a board can get for changes that do not go
+# through the Flight signals (renamed airplanes, bulk updates, ...).
+BOARD_REFRESH_SECONDS = 30
+
+
+def board_namespace(airport_id) -> str:
+    return f"board:{airport_id}"
+
+
+def invalidate_boards(*airport_ids) -> None:
+    bump_generation(*(board_namespace(pk) for pk in set(airport_ids)))
+
+
+def _upcoming(flights, time_field, serializer_class, now):
+    flights = flights.filter(**{f"{time_field}__gte": now}).order_by(
+        time_field, "id"
+    )[:BOARD_WINDOW_SIZE]
+    return [
+        (
+            getattr(flight, time_field).timestamp(),
+            serializer_class(flight).data,
+        )
+        for flight in flights
+    ]
+
+
+def build_board(airport_id):
+    """
+    Compute the departures and arrivals window of an airport.
+    Return None when the airport does not exist.
+    """
+    if not Airport.objects.filter(pk=airport_id).exists():
+        return None
+
+    now = timezone.now()
+    flights = Flight.objects.select_related(
+        "airplane", "route__source__city", "route__destination__city"
+    )
+    return {
+        "departures": _upcoming(
+            flights.filter(route__source_id=airport_id),
+            "departure_time",
+            DepartureBoardSerializer,
+            now,
+        ),
+        "arrivals": _upcoming(
+            flights.filter(route__destination_id=airport_id),
+            "arrival_time",
+            ArrivalBoardSerializer,
+            now,
+        ),
+    }
+
+
+def get_board(airport_id, limit=10):
+    """
+    Return the next ``limit`` departures and arrivals of an airport, or
+    None for an unknown airport.
+
+    The window is precomputed per airport and kept in the cache, so a
+    poll costs a few cache reads and no database access. Flight changes
+    invalidate the boards of both airports of the route.
+    """
+    board = get_or_compute(
+        f"airport:board:{airport_id}",
+        lambda: build_board(airport_id),
+        timeout=BOARD_REFRESH_SECONDS,
+        namespace=board_namespace(airport_id),
+    )
+    if board is None:
+        return None
+
+    now = timezone.now().timestamp()
+    return {
+        direction: [row for at, row in rows if at >= now][:limit]
+        for direction, rows in board.items()
+    }
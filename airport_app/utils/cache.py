@@ -0,0 +1,242 @@
+import asyncio
+import hashlib
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+CacheEntry = namedtuple("CacheEntry", ["value", "generation", "fresh_until"])
+
+DEFAULT_CACHE_SETTINGS = {
+    "TIMEOUT": 60,
+    "STALE_WHILE_REVALIDATE": 0,
+    "CROSS_PROCESS_LOCK": False,
+    "LOCK_TIMEOUT": 10,
+    "LOCK_POLL_INTERVAL": 0.05,
+    # Seconds before a process-local index, e.g. the airport
+    # autocomplete, is rebuilt even though its generation is unchanged.
+    "INDEX_MAX_AGE": 300,
+}
+
+
+def get_cache_settings() -> dict:
+    return {**DEFAULT_CACHE_SETTINGS, **getattr(settings, "AIRPORT_CACHE", {})}
+
+
+def make_cache_key(*parts) -> str:
+    digest = hashlib.sha1(
+        "|".join(str(part) for part in parts).encode()
+    ).hexdigest()
+    return f"airport:{parts[0]}:{digest}"
+
+
+def get_generation(namespace: str) -> str:
+    """
+    Return the current generation token of a namespace.
+    Entries computed under an older generation are treated as stale.
+    """
+    key = f"airport:generation:{namespace}"
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        generation = cache.get(key)
+    return generation
+
+
+async def aget_generation(namespace: str) -> str:
+    key = f"airport:generation:{namespace}"
+    generation = await cache.aget(key)
+    if generation is None:
+        await cache.aadd(key, uuid.uuid4().hex, None)
+        generation = await cache.aget(key)
+    return generation
+
+
+def bump_generation(*namespaces: str) -> None:
+    for namespace in namespaces:
+        cache.set(f"airport:generation:{namespace}", uuid.uuid4().hex, None)
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one computation.
+    The first caller computes, the rest wait and share its result.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def is_running(self, key) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key, compute):
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = compute()
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.value
+
+
+single_flight = SingleFlight()
+
+
+class AsyncSingleFlight:
+    """
+    ``SingleFlight`` for coroutines sharing an event loop. Waiters are
+    shielded, so a cancelled request does not abort the shared task.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+
+    def is_running(self, key) -> bool:
+        task = self._tasks.get(key)
+        return task is not None and not task.done()
+
+    def _forget(self, key, task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    async def do(self, key, compute):
+        task = self._tasks.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(compute())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+
+async_single_flight = AsyncSingleFlight()
+
+
+def _is_fresh(entry, generation) -> bool:
+    return (
+        entry is not None
+        and entry.generation == generation
+        and entry.fresh_until > time.time()
+    )
+
+
+def _wait_for_peer(key, generation, config):
+    deadline = time.time() + config["LOCK_TIMEOUT"]
+    while time.time() < deadline:
+        time.sleep(config["LOCK_POLL_INTERVAL"])
+        entry = cache.get(key)
+        if _is_fresh(entry, generation):
+            return entry
+        if cache.get(f"{key}:lock") is None:
+            break
+    return None
+
+
+def get_or_compute(key, compute, timeout=None, namespace=None):
+    """
+    Return the cached value for ``key`` or compute and store it.
+
+    Concurrent misses for the same key in this process share a single
+    ``compute()`` call. With ``CROSS_PROCESS_LOCK`` enabled, workers of
+    other processes wait on a lock key in the shared cache instead of
+    hitting the database. With ``STALE_WHILE_REVALIDATE`` set, an expired
+    or invalidated value keeps being served while one worker refreshes it.
+    """
+    config = get_cache_settings()
+    timeout = config["TIMEOUT"] if timeout is None else timeout
+    stale_timeout = config["STALE_WHILE_REVALIDATE"]
+    generation = get_generation(namespace) if namespace else None
+
+    entry = cache.get(key)
+    if _is_fresh(entry, generation):
+        return entry.value
+    stale = entry if stale_timeout else None
+    if stale is not None and single_flight.is_running(key):
+        return stale.value
+
+    def refresh():
+        current = cache.get(key)
+        if _is_fresh(current, generation):
+            return current.value
+
+        lock_key = f"{key}:lock"
+        locked = False
+        if config["CROSS_PROCESS_LOCK"]:
+            locked = cache.add(lock_key, 1, config["LOCK_TIMEOUT"])
+            if not locked:
+                if stale is not None:
+                    return stale.value
+                current = _wait_for_peer(key, generation, config)
+                if current is not None:
+                    return current.value
+
+        try:
+            value = compute()
+            cache.set(
+                key,
+                CacheEntry(value, generation, time.time() + timeout),
+                timeout + stale_timeout,
+            )
+        finally:
+            if locked:
+                cache.delete(lock_key)
+        return value
+
+    return single_flight.do(key, refresh)
+
+
+async def aget_or_compute(key, compute, timeout=None, namespace=None):
+    """
+    Async counterpart of ``get_or_compute`` for a coroutine ``compute``.
+    Entries are shared with the sync path. Concurrent misses on the same
+    event loop await one computation; ``CROSS_PROCESS_LOCK`` is not
+    applied here.
+    """
+    config = get_cache_settings()
+    timeout = config["TIMEOUT"] if timeout is None else timeout
+    stale_timeout = config["STALE_WHILE_REVALIDATE"]
+    generation = await aget_generation(namespace) if namespace else None
+
+    entry = await cache.aget(key)
+    if _is_fresh(entry, generation):
+        return entry.value
+    stale = entry if stale_timeout else None
+    if stale is not None and async_single_flight.is_running(key):
+        return stale.value
+
+    async def refresh():
+        value = await compute()
+        await cache.aset(
+            key,
+            CacheEntry(value, generation, time.time() + timeout),
+            timeout + stale_timeout,
+        )
+        return value
+
+    return await async_single_flight.do(key, refresh)
@@ -0,0 +1,219 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, connections, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EVENTS_SETTINGS = {
+    "BROKER": "airport_app.utils.events.InProcessBroker",
+    "HEARTBEAT": 15,
+    "QUEUE_SIZE": 100,
+}
+
+# Sent instead of the queued deltas when a subscriber falls behind.
+# Clients drop their state and wait for the fresh snapshot.
+RESYNC_EVENT = {"type": "resync"}
+
+
+def get_events_settings() -> dict:
+    return {
+        **DEFAULT_EVENTS_SETTINGS,
+        **getattr(settings, "AIRPORT_EVENTS", {}),
+    }
+
+
+def seats_topic(flight_id) -> str:
+    return f"flight:{flight_id}:seats"
+
+
+def board_topic(airport_id) -> str:
+    return f"airport:{airport_id}:board"
+
+
+def _offer(queue, event):
+    if queue.full():
+        while not queue.empty():
+            queue.get_nowait()
+        event = RESYNC_EVENT
+    queue.put_nowait(event)
+
+
+class Subscription:
+    """Async context manager that registers a queue for one topic."""
+
+    def __init__(self, broker, topic):
+        self.broker = broker
+        self.topic = topic
+        self.subscriber = None
+
+    async def __aenter__(self):
+        queue = asyncio.Queue(maxsize=self.broker.queue_size)
+        self.subscriber = (asyncio.get_running_loop(), queue)
+        with self.broker._lock:
+            self.broker._subscribers[self.topic].add(self.subscriber)
+        return queue
+
+    async def __aexit__(self, *exc_info):
+        with self.broker._lock:
+            subscribers = self.broker._subscribers[self.topic]
+            subscribers.discard(self.subscriber)
+            if not subscribers:
+                del self.broker._subscribers[self.topic]
+
+
+class InProcessBroker:
+    """
+    Fan events out to the subscribers of this process. Enough for a
+    single ASGI worker; multi-worker setups need a shared backend such
+    as ``PostgresBroker``.
+    """
+
+    def __init__(self, queue_size=None):
+        self.queue_size = queue_size or get_events_settings()["QUEUE_SIZE"]
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, topic):
+        return Subscription(self, topic)
+
+    def publish(self, topic, event):
+        """Deliver ``event`` to local subscribers. Safe from any thread."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, event)
+            except RuntimeError:
+                # The subscriber's event loop is already closed.
+                pass
+
+
+class PostgresBroker(InProcessBroker):
+    """
+    Share events between processes and nodes with LISTEN/NOTIFY on the
+    default database. Each process keeps one listening connection that
+    feeds its local subscribers.
+    """
+
+    channel = "airport_events"
+    poll_interval = 5
+
+    def __init__(self, queue_size=None):
+        super().__init__(queue_size)
+        self._listener = None
+        self._closed = threading.Event()
+
+    def subscribe(self, topic):
+        self._ensure_listener()
+        return super().subscribe(topic)
+
+    def publish(self, topic, event):
+        payload = json.dumps(
+            {"topic": topic, "event": event}, cls=DjangoJSONEncoder
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, %s)", [self.channel, payload]
+            )
+
+    def close(self):
+        """Stop the listener thread and close its connection."""
+        self._closed.set()
+        if self._listener is not None:
+            self._listener.join()
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(
+                    target=self._listen, name="airport-events", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self):
+        import psycopg2
+        import psycopg2.extensions
+
+        wrapper = connections["default"]
+        while not self._closed.is_set():
+            try:
+                conn = psycopg2.connect(**wrapper.get_connection_params())
+            except psycopg2.Error:
+                logger.exception("Event listener could not connect")
+                self._closed.wait(self.poll_interval)
+                continue
+            try:
+                conn.set_isolation_level(
+                    psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT
+                )
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+                self._dispatch_notifications(conn)
+            except psycopg2.Error:
+                logger.exception("Event listener lost its connection")
+            finally:
+                conn.close()
+
+    def _dispatch_notifications(self, conn):
+        while not self._closed.is_set():
+            select.select([conn], [], [], self.poll_interval)
+            conn.poll()
+            while conn.notifies:
+                message = json.loads(conn.notifies.pop(0).payload)
+                InProcessBroker.publish(
+                    self, message["topic"], message["event"]
+                )
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(get_events_settings()["BROKER"])()
+    return _broker
+
+
+def format_event(event) -> str:
+    return (
+        f"event: {event['type']}\n"
+        f"data: {json.dumps(event, cls=DjangoJSONEncoder)}\n\n"
+    )
+
+
+async def event_stream(topic, snapshot):
+    """
+    Yield Server-Sent Events for ``topic``: a ``snapshot`` event built by
+    the async ``snapshot()`` callable, then the published deltas, with
+    comment heartbeats in between to keep proxies from closing the
+    connection. Subscribing happens first so no delta is missed.
+    """
+    heartbeat = get_events_settings()["HEARTBEAT"]
+    async with get_broker().subscribe(topic) as queue:
+        yield format_event({"type": "snapshot", **await snapshot()})
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is RESYNC_EVENT:
+                event = {"type": "snapshot", **await snapshot()}
+            yield format_event(event)
+
+
+def publish_event(topic, event):
+    """Publish ``event`` once the current transaction commits."""
+    transaction.on_commit(lambda: get_broker().publish(topic, event))
@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.db.models import Case, F, Q, Value, When, Window
+from django.db.models.functions import RowNumber, TruncDate
+
+from airport_app.filters import departure_window
+from airport_app.models import Flight
+from airport_app.serializers import FlightListSerializer
+
+SEARCH_ORDERINGS = {
+    "earliest": ("departure_time",),
+    "shortest": ("scheduled_duration", "departure_time"),
+}
+
+
+def leg_window(day, flex_days):
+    start, _ = departure_window(day - timedelta(days=flex_days))
+    _, end = departure_window(day + timedelta(days=flex_days))
+    return start, end
+
+
+def best_flights_queryset(
+    source, destination, date, flex_days=0, return_date=None, sort="earliest"
+):
+    """
+    Rank flights per (direction, day) with ROW_NUMBER() and keep the
+    best one of each, so both legs are answered by one query.
+    """
+    start, end = leg_window(date, flex_days)
+    legs = Q(
+        route__source=source,
+        route__destination=destination,
+        departure_time__gte=start,
+        departure_time__lt=end,
+    )
+    if return_date:
+        start, end = leg_window(return_date, flex_days)
+        legs |= Q(
+            route__source=destination,
+            route__destination=source,
+            departure_time__gte=start,
+            departure_time__lt=end,
+        )
+
+    return (
+        Flight.objects.filter(legs, is_active=True)
+        .select_related("route__source", "route__destination", "airplane")
+        .annotate(
+            direction=Case(
+                When(route__source=source, then=Value("outbound")),
+                default=Value("inbound"),
+            ),
+            day=TruncDate("departure_time"),
+            day_rank=Window(
+                RowNumber(),
+                partition_by=[F("route__source"), TruncDate("departure_time")],
+                order_by=[F(field).asc() for field in SEARCH_ORDERINGS[sort]],
+            ),
+        )
+        .filter(day_rank=1)
+        .order_by("departure_time")
+    )
+
+
+def search_result(flights):
+    result = {"outbound": [], "inbound": []}
+    for flight in flights:
+        result[flight.direction].append(
+            {"date": flight.day, "flight": FlightListSerializer(flight).data}
+        )
+    return result
+
+
+def search_best_flights(**params):
+    """
+    Return the best flight per day for the outbound leg and, for round
+    trips, the inbound leg.
+    """
+    return search_result(best_flights_queryset(**params))
+
+
+async def asearch_best_flights(**params):
+    return search_result(
+        [flight async for flight in best_flights_queryset(**params)]
+    )
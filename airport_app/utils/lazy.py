@@ -0,0 +1,86 @@
+import sys
+from importlib import import_module
+
+from django.utils.module_loading import import_string
+from rest_framework.schemas.inspectors import DefaultSchema
+from rest_framework.settings import api_settings
+
+
+def lazy_view(view_path, **initkwargs):
+    """
+    Return a view for the class at ``view_path`` that is imported on the
+    first request instead of when the URLconf loads. Meant for rarely
+    used views whose modules are expensive to import.
+    """
+    view = None
+
+    def dispatch(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(view_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    # Like APIView.as_view(); DRF enforces CSRF for session auth itself.
+    dispatch.csrf_exempt = True
+    dispatch.__name__ = view_path.rpartition(".")[2]
+    return dispatch
+
+
+class LazySchemas:
+    """
+    Stand-in for a module of ``extend_schema`` decorators, e.g.
+    ``schemas = LazySchemas("airport_app.utils.schema_descriptions")``.
+    ``@schemas.country_list_schema`` only records the decorator's name on
+    the view method; ``attach_lazy_schemas`` applies it when a schema is
+    generated. Serving requests then never imports the descriptions or
+    drf-spectacular's AutoSchema, which ``extend_schema`` pulls in.
+    """
+
+    def __init__(self, module_path):
+        self.module_path = module_path
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def decorator(func):
+            func.lazy_schema = (self.module_path, name)
+            return func
+
+        return decorator
+
+
+def attach_lazy_schemas(view_class):
+    """Apply the schema decorators recorded by ``LazySchemas``."""
+    for klass in view_class.__mro__:
+        for func in list(vars(klass).values()):
+            target = getattr(func, "lazy_schema", None)
+            if target is None:
+                continue
+            module_path, name = target
+            getattr(import_module(module_path), name)(func)
+            # extend_schema() changes the method in place, applying it
+            # twice would duplicate its parameters.
+            func.lazy_schema = None
+
+
+class LazyDefaultSchema(DefaultSchema):
+    """
+    ``DefaultSchema`` that leaves DEFAULT_SCHEMA_CLASS unimported when read
+    from the view class. DRF's router lists every attribute of a viewset
+    to find its extra actions, which would otherwise import
+    drf-spectacular's AutoSchema while the URLconf loads. Once a schema
+    generator has imported it, access behaves as usual.
+    """
+
+    def __get__(self, instance, owner):
+        if instance is None and not schema_class_loaded():
+            return self
+        return super().__get__(instance, owner)
+
+
+def schema_class_loaded() -> bool:
+    path = api_settings.user_settings.get(
+        "DEFAULT_SCHEMA_CLASS", api_settings.defaults["DEFAULT_SCHEMA_CLASS"]
+    )
+    return path.rpartition(".")[0] in sys.modules
@@ -0,0 +1,430 @@
+import json
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from airport_app.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Flight,
+    Route,
+)
+from airport_app.utils.availability import rebuild_availability
+from airport_app.utils.cache import bump_generation
+from user.models import User
+
+DEFAULT_MIX = {"browse": 50, "search": 20, "login": 10, "order": 20}
+
+# Seeded rows are recognised by these, so a new seed replaces the old one.
+SEED_PREFIX = "Loadtest"
+SEED_EMAIL_DOMAIN = "loadtest.invalid"
+SEED_PASSWORD = "loadtest-password"
+
+FLIGHTS_URL = "/api/airport/flights/"
+ORDERS_URL = "/api/airport/orders/"
+TOKEN_URL = "/api/user/token/"
+
+
+def parse_mix(value) -> dict:
+    """Parse "browse=50,order=20" into scenario weights."""
+    mix = {}
+    for part in filter(None, value.split(",")):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(
+                f"Unknown scenario {name!r}, "
+                f"expected one of {', '.join(DEFAULT_MIX)}."
+            )
+        mix[name] = int(weight or 1)
+        if mix[name] < 0:
+            raise ValueError(f"The weight of {name} cannot be negative.")
+    if not any(mix.values()):
+        raise ValueError("The mix needs at least one scenario.")
+    return mix
+
+
+def delete_seed():
+    Country.objects.filter(name__startswith=SEED_PREFIX).delete()
+    AirplaneType.objects.filter(name__startswith=SEED_PREFIX).delete()
+    User.objects.filter(email__endswith=f"@{SEED_EMAIL_DOMAIN}").delete()
+
+
+def seed(airports=50, routes=200, flights=2000, users=100, days=30):
+    """
+    Replace the seeded data with airports, routes, flights departing
+    over the next days and users who log in with SEED_PASSWORD. Rows are
+    bulk created, so the availability calendar is rebuilt and the flight
+    caches invalidated at the end.
+    """
+    if airports < 2:
+        raise ValueError("Seeding needs at least 2 airports for a route.")
+    for name, count in (
+        ("routes", routes),
+        ("flights", flights),
+        ("users", users),
+        ("days", days),
+    ):
+        if count < 1:
+            raise ValueError(f"Seeding needs at least 1 of {name}.")
+    rng = random.Random(0)
+    with transaction.atomic():
+        delete_seed()
+        countries = Country.objects.bulk_create(
+            Country(name=f"{SEED_PREFIX} Country {number}", code="LDT")
+            for number in range(max(airports // 5, 1))
+        )
+        cities = City.objects.bulk_create(
+            City(
+                name=f"{SEED_PREFIX} City {number}",
+                country=countries[number % len(countries)],
+            )
+            for number in range(airports)
+        )
+        seeded_airports = Airport.objects.bulk_create(
+            Airport(name=f"{SEED_PREFIX} Airport {number}", city=city)
+            for number, city in enumerate(cities)
+        )
+        pairs = set()
+        while len(pairs) < min(routes, airports * (airports - 1)):
+            pairs.add(tuple(rng.sample(seeded_airports, 2)))
+        seeded_routes = Route.objects.bulk_create(
+            Route(
+                source=source,
+                destination=destination,
+                distance=rng.randint(300, 9000),
+            )
+            for source, destination in pairs
+        )
+        airplane_types = AirplaneType.objects.bulk_create(
+            AirplaneType(name=f"{SEED_PREFIX} Type {number}")
+            for number in range(5)
+        )
+        airplanes = Airplane.objects.bulk_create(
+            Airplane(
+                name=f"{SEED_PREFIX} Airplane {number}",
+                rows=rng.randint(20, 40),
+                seats_in_row=rng.choice((4, 6, 8)),
+                airplane_type=airplane_types[number % len(airplane_types)],
+            )
+            for number in range(max(flights // 20, 1))
+        )
+        now = timezone.now()
+        departures = [
+            now + timedelta(minutes=rng.randint(60, days * 24 * 60))
+            for _ in range(flights)
+        ]
+        Flight.objects.bulk_create(
+            Flight(
+                route=rng.choice(seeded_routes),
+                airplane=rng.choice(airplanes),
+                departure_time=departure,
+                arrival_time=departure + timedelta(
+                    minutes=rng.randint(45, 12 * 60)
+                ),
+            )
+            for departure in departures
+        )
+        # Hashing is slow on purpose, every seeded user shares one hash.
+        password = make_password(SEED_PASSWORD)
+        User.objects.bulk_create(
+            User(
+                email=f"user{number}@{SEED_EMAIL_DOMAIN}",
+                password=password,
+            )
+            for number in range(users)
+        )
+    rebuild_availability()
+    bump_generation("flights", "airports")
+    return {
+        "airports": airports,
+        "routes": len(seeded_routes),
+        "flights": flights,
+        "users": users,
+    }
+
+
+class Targets:
+    """The seeded rows that the scenarios pick their requests from."""
+
+    def __init__(self, hot_flights=5):
+        if hot_flights < 1:
+            raise ValueError("The orders need at least 1 hot flight.")
+        now = timezone.now()
+        flights = list(
+            Flight.objects.filter(
+                route__source__name__startswith=SEED_PREFIX,
+                departure_time__gt=now + timedelta(minutes=10),
+                is_active=True,
+            )
+            .select_related("route", "airplane")
+            .order_by("departure_time")
+        )
+        if not flights:
+            raise ValueError("No seeded flights, run with --seed first.")
+        self.flight_ids = [flight.id for flight in flights]
+        self.searches = [
+            (
+                flight.route.source_id,
+                flight.route.destination_id,
+                timezone.localdate(flight.departure_time),
+            )
+            for flight in flights
+        ]
+        # Every order books a seat on one of these, so they contend.
+        self.hot_flights = [
+            (flight.id, flight.airplane.rows, flight.airplane.seats_in_row)
+            for flight in flights[-hot_flights:]
+        ]
+        self.emails = list(
+            User.objects.filter(
+                email__endswith=f"@{SEED_EMAIL_DOMAIN}"
+            ).values_list("email", flat=True)
+        )
+        if not self.emails:
+            raise ValueError("No seeded users, run with --seed first.")
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return None
+    rank = max(math.ceil(fraction * len(values)), 1)
+    return values[rank - 1]
+
+
+class Results:
+    """Latencies and outcomes of the requests, per endpoint."""
+
+    def __init__(self):
+        self._latencies = defaultdict(list)
+        self._statuses = defaultdict(Counter)
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds, status):
+        """status is the HTTP status, or 0 when no response came back."""
+        with self._lock:
+            self._latencies[endpoint].append(seconds)
+            self._statuses[endpoint][status] += 1
+
+    def __len__(self):
+        with self._lock:
+            return sum(map(len, self._latencies.values()))
+
+    def summary(self, elapsed) -> dict:
+        with self._lock:
+            endpoints = {
+                endpoint: self.endpoint_summary(
+                    sorted(latencies), self._statuses[endpoint], elapsed
+                )
+                for endpoint, latencies in sorted(self._latencies.items())
+            }
+            total = self.endpoint_summary(
+                sorted(
+                    latency
+                    for latencies in self._latencies.values()
+                    for latency in latencies
+                ),
+                sum(self._statuses.values(), Counter()),
+                elapsed,
+            )
+        return {
+            "elapsed_seconds": elapsed,
+            "total": total,
+            "endpoints": endpoints,
+        }
+
+    @staticmethod
+    def endpoint_summary(latencies, statuses, elapsed) -> dict:
+        count = len(latencies)
+        # No response or a server error. 4xx are answers, e.g. a seat
+        # that another order took first.
+        errors = sum(
+            number
+            for status, number in statuses.items()
+            if status == 0 or status >= 500
+        )
+        rejected = sum(
+            number
+            for status, number in statuses.items()
+            if 400 <= status < 500
+        )
+
+        def milliseconds(fraction):
+            value = percentile(latencies, fraction)
+            return None if value is None else round(value * 1000, 2)
+
+        return {
+            "requests": count,
+            "throughput_rps": round(count / elapsed, 2) if elapsed else 0,
+            "p50_ms": milliseconds(0.50),
+            "p95_ms": milliseconds(0.95),
+            "p99_ms": milliseconds(0.99),
+            "errors": errors,
+            "error_rate": round(errors / count, 4) if count else 0,
+            "rejected": rejected,
+            "statuses": {
+                str(status): number
+                for status, number in sorted(statuses.items())
+            },
+        }
+
+
+class Client:
+    """One virtual user: an HTTP client that times every request."""
+
+    def __init__(self, base_url, results, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.results = results
+        self.timeout = timeout
+        self.token = None
+
+    def request(self, endpoint, method, path, params=None, payload=None):
+        url = f"{self.base_url}{path}"
+        if params:
+            url = f"{url}?{urllib.parse.urlencode(params)}"
+        headers = {"Accept": "application/json"}
+        data = None
+        if payload is not None:
+            data = json.dumps(payload).encode()
+            headers["Content-Type"] = "application/json"
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        request = urllib.request.Request(
+            url, data=data, headers=headers, method=method
+        )
+
+        started = time.perf_counter()
+        body = None
+        try:
+            with urllib.request.urlopen(
+                request, timeout=self.timeout
+            ) as response:
+                status = response.status
+                body = response.read()
+        except urllib.error.HTTPError as error:
+            status = error.code
+            error.read()
+        except OSError:
+            status = 0
+        self.results.record(endpoint, time.perf_counter() - started, status)
+        if body and 200 <= status < 300:
+            return json.loads(body)
+        return None
+
+
+def browse(client, targets, rng):
+    client.request(
+        "flights.list", "GET", FLIGHTS_URL, {"page": rng.randint(1, 5)}
+    )
+    client.request(
+        "flights.retrieve",
+        "GET",
+        f"{FLIGHTS_URL}{rng.choice(targets.flight_ids)}/",
+    )
+
+
+def search(client, targets, rng):
+    source, destination, date = rng.choice(targets.searches)
+    client.request(
+        "flights.search",
+        "GET",
+        f"{FLIGHTS_URL}search/",
+        {
+            "source": source,
+            "destination": destination,
+            "date": date.isoformat(),
+            "flex_days": rng.choice((0, 0, 1)),
+        },
+    )
+
+
+def login(client, targets, rng):
+    client.token = None
+    tokens = client.request(
+        "auth.token",
+        "POST",
+        TOKEN_URL,
+        payload={
+            "email": rng.choice(targets.emails),
+            "password": SEED_PASSWORD,
+        },
+    )
+    if tokens:
+        client.token = tokens["access"]
+
+
+def order(client, targets, rng):
+    if client.token is None:
+        login(client, targets, rng)
+    flight, rows, seats_in_row = rng.choice(targets.hot_flights)
+    client.request(
+        "orders.create",
+        "POST",
+        ORDERS_URL,
+        payload={
+            "tickets": [
+                {
+                    "flight": flight,
+                    "row": rng.randint(1, rows),
+                    "seat": rng.randint(1, seats_in_row),
+                }
+            ]
+        },
+    )
+
+
+SCENARIOS = {
+    "browse": browse,
+    "search": search,
+    "login": login,
+    "order": order,
+}
+
+
+def run(base_url, targets, mix, threads=8, duration=30, requests=0):
+    """
+    Run the scenarios of mix from threads virtual users until duration
+    seconds have passed or, when requests is set, that many requests were
+    made. Returns the summary of the results.
+    """
+    results = Results()
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    deadline = time.monotonic() + duration
+
+    def finished():
+        if requests and len(results) >= requests:
+            return True
+        return time.monotonic() >= deadline
+
+    def virtual_user(number):
+        rng = random.Random(number)
+        client = Client(base_url, results)
+        while not finished():
+            name = rng.choices(names, weights)[0]
+            SCENARIOS[name](client, targets, rng)
+
+    workers = [
+        threading.Thread(target=virtual_user, args=(number,), daemon=True)
+        for number in range(threads)
+    ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results.summary(round(time.perf_counter() - started, 3))
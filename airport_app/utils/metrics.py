@@ -0,0 +1,173 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from rest_framework.serializers import BaseSerializer
+
+DEFAULT_METRICS_SETTINGS = {
+    "ENABLED": True,
+    "TOKEN": "",
+}
+
+LABELS = ("view", "action", "status")
+
+REQUEST_DURATION = Histogram(
+    "airport_http_request_duration_seconds",
+    "Time to produce a response, without streaming its body.",
+    LABELS,
+)
+REQUEST_QUERIES = Histogram(
+    "airport_http_request_queries",
+    "SQL queries run per request.",
+    LABELS,
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, float("inf")),
+)
+REQUEST_QUERY_DURATION = Histogram(
+    "airport_http_request_query_duration_seconds",
+    "Time spent in SQL queries per request.",
+    LABELS,
+)
+REQUEST_SERIALIZER_DURATION = Histogram(
+    "airport_http_request_serializer_duration_seconds",
+    "Time spent building serializer data per request.",
+    LABELS,
+)
+RESPONSE_SIZE = Histogram(
+    "airport_http_response_size_bytes",
+    "Size of non-streaming response bodies.",
+    LABELS,
+    buckets=tuple(256 * 4**power for power in range(9)) + (float("inf"),),
+)
+
+_request_stats = ContextVar("airport_request_stats", default=None)
+
+
+def get_metrics_settings() -> dict:
+    return {
+        **DEFAULT_METRICS_SETTINGS,
+        **getattr(settings, "AIRPORT_METRICS", {}),
+    }
+
+
+class RequestStats:
+    """What one request has spent so far, shared with the threads that
+    ``sync_to_async`` runs its queries in."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializing = False
+
+
+@contextmanager
+def track_request():
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+
+
+def count_queries(execute, sql, params, many, context):
+    """Database execute wrapper that adds each query to the request."""
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.query_seconds += time.perf_counter() - started
+
+
+def install_query_counter(sender, connection, **kwargs):
+    """``connection_created`` receiver, runs again on every reconnect."""
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+def instrument_serializers():
+    """
+    Time ``serializer.data`` for the current request. Nested serializers
+    built inside ``SerializerMethodField`` are part of the outer time.
+    """
+    data = BaseSerializer.data.fget
+    if getattr(data, "instrumented", False):
+        return
+
+    def timed_data(self):
+        stats = _request_stats.get()
+        if stats is None or stats.serializing:
+            return data(self)
+        stats.serializing = True
+        started = time.perf_counter()
+        try:
+            return data(self)
+        finally:
+            stats.serializer_seconds += time.perf_counter() - started
+            stats.serializing = False
+
+    timed_data.instrumented = True
+    BaseSerializer.data = property(timed_data)
+
+
+def view_labels(request) -> tuple:
+    """Return the (view, action) labels of the view that served request."""
+    match = request.resolver_match
+    if match is None:
+        return "unresolved", ""
+    func = match.func
+    view_class = getattr(func, "view_class", None)
+    view = view_class.__name__ if view_class else func.__name__
+
+    method = request.method.lower()
+    actions = getattr(func, "actions", None)
+    if actions:
+        return view, actions.get(method, method)
+    initkwargs = getattr(func, "view_initkwargs", None) or {}
+    return view, initkwargs.get("action") or method
+
+
+def record_request(request, response, stats):
+    view, action = view_labels(request)
+    labels = {
+        "view": view,
+        "action": action,
+        "status": str(response.status_code),
+    }
+    REQUEST_DURATION.labels(**labels).observe(
+        time.perf_counter() - stats.started
+    )
+    REQUEST_QUERIES.labels(**labels).observe(stats.queries)
+    REQUEST_QUERY_DURATION.labels(**labels).observe(stats.query_seconds)
+    REQUEST_SERIALIZER_DURATION.labels(**labels).observe(
+        stats.serializer_seconds
+    )
+    if not response.streaming:
+        RESPONSE_SIZE.labels(**labels).observe(len(response.content))
+
+
+def render_metrics() -> bytes:
+    """
+    Render the metrics in the Prometheus text format. With
+    PROMETHEUS_MULTIPROC_DIR set, the samples of every worker process are
+    read from that directory and merged.
+    """
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
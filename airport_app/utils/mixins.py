@@ -1,8 +1,21 @@
+from django.utils.cache import patch_cache_control, patch_vary_headers
 from rest_framework import serializers, viewsets
 from rest_framework.permissions import (
+    SAFE_METHODS,
     IsAdminUser,
     IsAuthenticated
 )
+from rest_framework.response import Response
+
+from airport_app.utils.cache import get_or_compute, make_cache_key
+from airport_app.utils.lazy import LazyDefaultSchema
+from airport_app.utils.replicas import (
+    choose_replica,
+    is_pinned_to_primary,
+    pin_to_primary,
+    start_replica_reads,
+    stop_replica_reads,
+)
 
 
 class UniqueFieldsValidatorMixin:
@@ -22,6 +35,9 @@ class UniqueFieldsValidatorMixin:
 
 class ActionMixin(viewsets.ModelViewSet):
     action_serializers = {}
+    # Most SQL queries an action may run, checked by QueryBudgetMiddleware.
+    action_query_budgets = {}
+    schema = LazyDefaultSchema()
 
     def get_serializer_class(self):
         if (
@@ -56,3 +72,125 @@ class CustomPermissionMixin(viewsets.ModelViewSet):
                 self.action, [IsAdminUser]
             )
         ]
+
+
+class CachedResponseMixin(viewsets.ModelViewSet):
+    """
+    Serve the configured read actions from the cache. Only use it for
+    actions whose payload does not depend on the requesting user.
+    """
+
+    cache_actions = ()
+    cache_namespace = None
+
+    def get_response_cache_key(self, request, **kwargs):
+        return make_cache_key(
+            self.cache_namespace or self.basename,
+            self.action,
+            # Payloads hold absolute URLs, e.g. of airplane images.
+            request.scheme,
+            request.get_host(),
+            sorted(kwargs.items()),
+            sorted(request.query_params.lists()),
+        )
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.cache_actions:
+            return handler(request, *args, **kwargs)
+
+        data = get_or_compute(
+            self.get_response_cache_key(request, **kwargs),
+            lambda: handler(request, *args, **kwargs).data,
+            namespace=self.cache_namespace,
+        )
+        return Response(data)
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+def apply_cache_control(request, response, policy):
+    """
+    Emit the Cache-Control/Vary headers of policy on response. Anonymous
+    responses are shareable, authenticated ones are kept out of shared
+    caches.
+    """
+    directives = dict(policy)
+    if not directives.get("no_store"):
+        if (
+            request.method not in ("GET", "HEAD")
+            or response.status_code != 200
+        ):
+            return response
+        if request.user and request.user.is_authenticated:
+            directives.pop("s_maxage", None)
+            directives["private"] = True
+        elif not directives.get("private"):
+            directives["public"] = True
+
+    patch_cache_control(response, **directives)
+    patch_vary_headers(response, ["Authorization"])
+    return response
+
+
+class CacheControlMixin(viewsets.ModelViewSet):
+    """
+    Emit Cache-Control/Vary headers from per-action policies, e.g.
+    ``{"list": {"max_age": 60, "s_maxage": 300}}``, with
+    apply_cache_control.
+    """
+
+    action_cache_control = {}
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        policy = self.action_cache_control.get(self.action)
+        if not policy:
+            return response
+        return apply_cache_control(request, response, policy)
+
+
+class ReplicaReadMixin(viewsets.ModelViewSet):
+    """
+    Read from a replica while handling safe requests. Authentication and
+    permission checks still run on the primary, and a user whose write
+    succeeded is pinned to the primary to read their own writes.
+    """
+
+    _replica_token = None
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if self._replica_token is not None:
+                stop_replica_reads(self._replica_token)
+                self._replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not is_pinned_to_primary(
+            request.user
+        ):
+            self._replica_token = start_replica_reads(choose_replica())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            pin_to_primary(request.user)
+        return response
@@ -0,0 +1,187 @@
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db.models import Model, QuerySet
+from django.db.models.fields.related_descriptors import (
+    ForwardManyToOneDescriptor,
+    ReverseManyToOneDescriptor,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_N_PLUS_ONE_SETTINGS = {
+    "ENABLED": False,
+    # Lazy loads of the same relation in one request that are reported.
+    "THRESHOLD": 2,
+}
+
+# Where an instance was reached from the objects the request started with:
+# the lookup path and whether every step of it was a to-one relation.
+PATH_ATTRIBUTE = "_n_plus_one_path"
+ROOT = ("", True)
+
+_detector = ContextVar("airport_n_plus_one", default=None)
+
+
+def get_n_plus_one_settings() -> dict:
+    return {
+        **DEFAULT_N_PLUS_ONE_SETTINGS,
+        **getattr(settings, "AIRPORT_N_PLUS_ONE", {}),
+    }
+
+
+class Detection:
+    def __init__(self, path, relation, count, to_one):
+        self.path = path
+        self.relation = relation
+        self.count = count
+        self.to_one = to_one
+
+    @property
+    def fix(self) -> str:
+        method = "select_related" if self.to_one else "prefetch_related"
+        return f'{method}("{self.path}")'
+
+    def __str__(self):
+        return (
+            f"{self.count} queries loading {self.relation}, "
+            f"add {self.fix}"
+        )
+
+
+class NPlusOneDetector:
+    """Count the lazy loads of each relation path in one request."""
+
+    def __init__(self):
+        self.loads = Counter()
+        self.relations = {}
+
+    def record(self, path, to_one, relation):
+        self.loads[path] += 1
+        self.relations.setdefault(path, (relation, to_one))
+
+    def detections(self, threshold) -> list:
+        detections = []
+        for path, count in sorted(self.loads.items()):
+            if count >= threshold:
+                relation, to_one = self.relations[path]
+                detections.append(Detection(path, relation, count, to_one))
+        return detections
+
+
+def path_of(instance):
+    return instance.__dict__.get(PATH_ATTRIBUTE, ROOT)
+
+
+def child_path(instance, name, to_one):
+    path, parent_to_one = path_of(instance)
+    return (
+        f"{path}__{name}" if path else name,
+        parent_to_one and to_one,
+    )
+
+
+def tag(objects, path):
+    for obj in objects:
+        if isinstance(obj, Model):
+            obj.__dict__.setdefault(PATH_ATTRIBUTE, path)
+
+
+def forward_get(get):
+    def __get__(self, instance, cls=None):
+        detector = _detector.get()
+        if instance is None or detector is None:
+            return get(self, instance, cls)
+        cached = self.field.is_cached(instance)
+        value = get(self, instance, cls)
+        if value is not None:
+            path = child_path(instance, self.field.name, to_one=True)
+            if not cached:
+                detector.record(
+                    *path, f"{type(instance).__name__}.{self.field.name}"
+                )
+            tag([value], path)
+        return value
+
+    __get__.detects_n_plus_one = True
+    return __get__
+
+
+def related_manager_get(get):
+    def __get__(self, instance, cls=None):
+        manager = get(self, instance, cls)
+        if instance is None or _detector.get() is None:
+            return manager
+        if getattr(self, "reverse", True):
+            name = self.rel.get_accessor_name()
+        else:
+            name = self.field.name
+        path = child_path(instance, name, to_one=False)
+        relation = f"{type(instance).__name__}.{name}"
+        get_queryset = manager.get_queryset
+
+        def tagged_queryset():
+            queryset = get_queryset()
+            if queryset._result_cache is not None:
+                # Prefetched.
+                tag(queryset._result_cache, path)
+            else:
+                queryset._n_plus_one = (path, relation)
+            return queryset
+
+        manager.get_queryset = tagged_queryset
+        return manager
+
+    __get__.detects_n_plus_one = True
+    return __get__
+
+
+def fetch_all(fetch):
+    def _fetch_all(self):
+        lazy = self.__dict__.get("_n_plus_one")
+        if lazy is None or self._result_cache is not None:
+            return fetch(self)
+        fetch(self)
+        detector = _detector.get()
+        if detector is not None:
+            (path, to_one), relation = lazy
+            detector.record(path, to_one, relation)
+            tag(self._result_cache, (path, to_one))
+
+    _fetch_all.detects_n_plus_one = True
+    return _fetch_all
+
+
+def install_n_plus_one_detector():
+    """
+    Patch the related descriptors to track where instances come from.
+    They only do extra work inside ``detect_n_plus_one``.
+    """
+    if getattr(QuerySet._fetch_all, "detects_n_plus_one", False):
+        return
+    ForwardManyToOneDescriptor.__get__ = forward_get(
+        ForwardManyToOneDescriptor.__get__
+    )
+    ReverseManyToOneDescriptor.__get__ = related_manager_get(
+        ReverseManyToOneDescriptor.__get__
+    )
+    QuerySet._fetch_all = fetch_all(QuerySet._fetch_all)
+
+
+@contextmanager
+def detect_n_plus_one():
+    detector = NPlusOneDetector()
+    token = _detector.set(detector)
+    try:
+        yield detector
+    finally:
+        _detector.reset(token)
+
+
+def report_n_plus_one(label, detector):
+    threshold = get_n_plus_one_settings()["THRESHOLD"]
+    for detection in detector.detections(threshold):
+        logger.warning("Possible N+1 query in %s: %s", label, detection)
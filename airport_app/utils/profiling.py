@@ -0,0 +1,246 @@
+import cProfile
+import io
+import linecache
+import pstats
+import re
+import threading
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.settings import api_settings
+
+DEFAULT_PROFILING_SETTINGS = {
+    "ENABLED": False,
+    "DIRECTORY": "",
+    # Profiles kept on disk, the oldest are removed first.
+    "KEEP": 50,
+    # Functions or allocation sites in a report.
+    "TOP": 40,
+    # Frames kept per allocation by tracemalloc.
+    "ALLOC_FRAMES": 10,
+}
+
+QUERY_PARAMETER = "_profile"
+
+# Report and, for cProfile, the pstats dump that snakeviz or pstats read.
+REPORT_SUFFIX = ".txt"
+STATS_SUFFIX = ".prof"
+PROFILE_ID = re.compile(r"^\d{8}T\d{6}-(cprofile|alloc)-[0-9a-f]{8}$")
+
+# cProfile and tracemalloc trace the whole process: one request at a time.
+_profiling = threading.Lock()
+
+
+def get_profiling_settings() -> dict:
+    return {
+        **DEFAULT_PROFILING_SETTINGS,
+        **getattr(settings, "AIRPORT_PROFILING", {}),
+    }
+
+
+def requested_profiler(request):
+    """The profiler named by ``?_profile=``, or None."""
+    profiler = request.GET.get(QUERY_PARAMETER)
+    return profiler if profiler in PROFILERS else None
+
+
+def is_staff(request) -> bool:
+    """
+    Whether the request comes from a staff user, logged in to the admin
+    or sending an API token. Views authenticate API tokens only after the
+    middleware, so they are checked here with the API authentication
+    classes.
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authentication_class().authenticate(request)
+        except APIException:
+            return False
+        if result is not None:
+            return result[0].is_staff
+    return False
+
+
+@contextmanager
+def profile_cpu():
+    profile = {}
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profile
+    finally:
+        profiler.disable()
+        profile["stats"] = pstats.Stats(profiler)
+
+
+@contextmanager
+def profile_allocations():
+    profile = {}
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(get_profiling_settings()["ALLOC_FRAMES"])
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    try:
+        yield profile
+    finally:
+        after = tracemalloc.take_snapshot()
+        profile["peak"] = tracemalloc.get_traced_memory()[1]
+        if started:
+            tracemalloc.stop()
+        profile["differences"] = after.filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        ).compare_to(before, "traceback")
+
+
+PROFILERS = {"cprofile": profile_cpu, "alloc": profile_allocations}
+
+
+@contextmanager
+def profiling(profiler):
+    """
+    Profile the block with profiler. Yields None, and profiles nothing,
+    when another request is being profiled.
+    """
+    if not _profiling.acquire(blocking=False):
+        yield None
+        return
+    try:
+        with PROFILERS[profiler]() as profile:
+            yield profile
+    finally:
+        _profiling.release()
+
+
+def cpu_report(stats, top) -> str:
+    """The functions with the most cumulative time, then their callees."""
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.sort_stats("cumulative").print_stats(top)
+    stats.print_callees(top)
+    return stream.getvalue()
+
+
+def allocation_report(differences, peak, top) -> str:
+    """The call sites that allocated the most memory that is still held."""
+    lines = [
+        f"Peak traced memory: {peak / 1024:.1f} KiB",
+        f"Top {top} allocation sites by size held at the end:",
+        "",
+    ]
+    for number, difference in enumerate(differences[:top], 1):
+        lines.append(
+            f"{number}. {difference.size_diff / 1024:+.1f} KiB in "
+            f"{difference.count_diff:+d} blocks"
+        )
+        for frame in reversed(difference.traceback):
+            lines.append(f"    {frame.filename}:{frame.lineno}")
+            line = linecache.getline(frame.filename, frame.lineno).strip()
+            if line:
+                lines.append(f"        {line}")
+    return "\n".join(lines)
+
+
+class ProfileStore:
+    """The latest profiles, one report file and an optional stats dump."""
+
+    def __init__(self, directory, keep):
+        self.directory = Path(directory)
+        self.keep = keep
+
+    def path(self, profile_id, suffix):
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}{suffix}"
+        return path if path.is_file() else None
+
+    def save(self, profiler, header, report, stats=None) -> str:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile_id = "-".join(
+            (
+                timezone.now().strftime("%Y%m%dT%H%M%S"),
+                profiler,
+                uuid.uuid4().hex[:8],
+            )
+        )
+        (self.directory / f"{profile_id}{REPORT_SUFFIX}").write_text(
+            f"{header}\n\n{report}"
+        )
+        if stats is not None:
+            stats.dump_stats(self.directory / f"{profile_id}{STATS_SUFFIX}")
+        self.prune()
+        return profile_id
+
+    def profiles(self) -> list:
+        """Profile ids, newest first."""
+        if not self.directory.is_dir():
+            return []
+        return sorted(
+            (
+                path.stem
+                for path in self.directory.glob(f"*{REPORT_SUFFIX}")
+                if PROFILE_ID.match(path.stem)
+            ),
+            reverse=True,
+        )
+
+    def prune(self):
+        for profile_id in self.profiles()[self.keep:]:
+            for suffix in (REPORT_SUFFIX, STATS_SUFFIX):
+                (self.directory / f"{profile_id}{suffix}").unlink(
+                    missing_ok=True
+                )
+
+
+def get_store() -> ProfileStore:
+    config = get_profiling_settings()
+    return ProfileStore(config["DIRECTORY"], config["KEEP"])
+
+
+def busy_response():
+    return HttpResponse(
+        "Another request is being profiled, try again.",
+        status=status.HTTP_409_CONFLICT,
+        content_type="text/plain",
+    )
+
+
+def profile_response(request, profiler, profile, response):
+    """
+    Store the profile of request and answer with its report in place of
+    the response of the view.
+    """
+    top = get_profiling_settings()["TOP"]
+    if profiler == "cprofile":
+        stats = profile["stats"]
+        report = cpu_report(stats, top)
+    else:
+        stats = None
+        report = allocation_report(
+            profile["differences"], profile["peak"], top
+        )
+    header = (
+        f"{request.method} {request.get_full_path()} -> "
+        f"{response.status_code}, profiled with {profiler} at "
+        f"{timezone.now().isoformat()}"
+    )
+    profile_id = get_store().save(profiler, header, report, stats)
+    report_response = HttpResponse(
+        f"{header}\n\n{report}", content_type="text/plain"
+    )
+    report_response["X-Profile-Id"] = profile_id
+    report_response["Location"] = request.build_absolute_uri(
+        reverse("admin-profile", args=[profile_id])
+    )
+    return report_response
@@ -0,0 +1,136 @@
+import logging
+import traceback
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+from airport_app.utils.metrics import view_labels
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERY_BUDGET_SETTINGS = {
+    # "off", "warn" to log requests over budget, or "raise".
+    "MODE": "off",
+}
+
+MODES = ("off", "warn", "raise")
+
+_query_logs = ContextVar("airport_query_logs", default=())
+
+
+def get_query_budget_settings() -> dict:
+    return {
+        **DEFAULT_QUERY_BUDGET_SETTINGS,
+        **getattr(settings, "AIRPORT_QUERY_BUDGETS", {}),
+    }
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryLog:
+    """The queries run inside ``capture_queries`` and where they came from."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __len__(self):
+        return len(self.queries)
+
+    def append(self, sql, stack):
+        self.queries.append((sql, stack))
+
+    def report(self) -> str:
+        lines = []
+        for number, (sql, stack) in enumerate(self.queries, 1):
+            lines.append(f"{number}. {sql}")
+            lines.extend(
+                f"    {line}"
+                for line in "".join(traceback.format_list(stack)).splitlines()
+            )
+        return "\n".join(lines)
+
+
+def project_stack():
+    """The frames of the current stack that belong to this project."""
+    root = str(Path(settings.BASE_DIR).resolve())
+    return traceback.StackSummary.from_list(
+        frame
+        for frame in traceback.extract_stack()[:-2]
+        if frame.filename.startswith(root)
+        and "site-packages" not in frame.filename
+        and frame.filename != __file__
+    )
+
+
+def record_queries(execute, sql, params, many, context):
+    """Database execute wrapper that logs each query with its stack."""
+    logs = _query_logs.get()
+    if logs:
+        stack = project_stack()
+        for log in logs:
+            log.append(sql, stack)
+    return execute(sql, params, many, context)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """``connection_created`` receiver, runs again on every reconnect."""
+    if record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_queries)
+
+
+@contextmanager
+def capture_queries():
+    """
+    Collect the queries run inside the block, on any database, into a
+    ``QueryLog``. Blocks can be nested, each one sees all the queries run
+    inside it. Connections that are already open get the recorder for the
+    duration of the block.
+    """
+    log = QueryLog()
+    token = _query_logs.set((*_query_logs.get(), log))
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all(initialized_only=True):
+                if record_queries not in connection.execute_wrappers:
+                    stack.enter_context(
+                        connection.execute_wrapper(record_queries)
+                    )
+            yield log
+    finally:
+        _query_logs.reset(token)
+
+
+def get_query_budget(view_class, action):
+    budgets = getattr(view_class, "action_query_budgets", {})
+    return budgets.get(action)
+
+
+def check_query_budget(name, budget, log):
+    if budget is None or len(log) <= budget:
+        return
+    raise QueryBudgetExceeded(
+        f"{name} ran {len(log)} queries, its budget is {budget}:\n"
+        f"{log.report()}"
+    )
+
+
+def check_request_budget(request, log, mode):
+    """Compare the queries of a viewset request with its action budget."""
+    match = request.resolver_match
+    view_class = getattr(match.func, "cls", None) if match else None
+    if view_class is None:
+        return
+    view, action = view_labels(request)
+    try:
+        check_query_budget(
+            f"{view}.{action}", get_query_budget(view_class, action), log
+        )
+    except QueryBudgetExceeded as error:
+        if mode == "raise":
+            raise
+        logger.warning("%s", error)
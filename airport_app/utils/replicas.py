@@ -0,0 +1,86 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+DEFAULT_REPLICA_SETTINGS = {
+    "DATABASES": [],
+    "PIN_SECONDS": 10,
+}
+
+# Alias reads are routed to for the current request, None for the primary.
+_read_database = ContextVar("airport_read_database", default=None)
+
+
+def get_replica_settings() -> dict:
+    return {
+        **DEFAULT_REPLICA_SETTINGS,
+        **getattr(settings, "AIRPORT_REPLICAS", {}),
+    }
+
+
+def choose_replica():
+    replicas = get_replica_settings()["DATABASES"]
+    return random.choice(replicas) if replicas else None
+
+
+def start_replica_reads(alias):
+    return _read_database.set(alias)
+
+
+def stop_replica_reads(token):
+    _read_database.reset(token)
+
+
+@contextmanager
+def read_from_replica():
+    """Route the reads of the block to a replica, if any is configured."""
+    token = start_replica_reads(choose_replica())
+    try:
+        yield
+    finally:
+        stop_replica_reads(token)
+
+
+def _pin_key(user_id) -> str:
+    return f"airport:primary-pin:{user_id}"
+
+
+def pin_to_primary(user) -> None:
+    """
+    Keep ``user`` on the primary for a while after a write, so that the
+    following reads see it even if the replicas lag behind. The pin is
+    kept in the default cache, shared by every worker, so it holds
+    whichever process serves the next request.
+    """
+    cache.set(_pin_key(user.pk), 1, get_replica_settings()["PIN_SECONDS"])
+
+
+def is_pinned_to_primary(user) -> bool:
+    return bool(
+        user
+        and user.is_authenticated
+        and cache.get(_pin_key(user.pk)) is not None
+    )
+
+
+class ReplicaRouter:
+    """
+    Send reads to the replica chosen for the current request and
+    everything else to the primary. Replicas are never migrated, they
+    receive the schema through replication.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
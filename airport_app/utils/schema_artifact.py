@@ -0,0 +1,96 @@
+import gzip
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from drf_spectacular import generators
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from airport_app.utils.lazy import attach_lazy_schemas
+
+RENDERERS = {
+    "yaml": OpenApiYamlRenderer,
+    "json": OpenApiJsonRenderer,
+}
+
+_artifacts = {}
+_artifacts_lock = threading.Lock()
+
+
+class SchemaGenerator(generators.SchemaGenerator):
+    """Attach the lazily declared schema descriptions before inspection."""
+
+    def create_view(self, callback, method, request=None):
+        attach_lazy_schemas(callback.cls)
+        return super().create_view(callback, method, request)
+
+
+class SchemaArtifact:
+    """One built schema file, kept both compressed and plain."""
+
+    def __init__(self, compressed):
+        self.compressed = compressed
+        self.content = gzip.decompress(compressed)
+        self.etag = f'"{hashlib.sha256(self.content).hexdigest()[:32]}"'
+
+
+def get_schema_directory() -> Path:
+    return Path(settings.AIRPORT_SCHEMA["DIRECTORY"])
+
+
+def artifact_path(fmt) -> Path:
+    return get_schema_directory() / f"schema.{fmt}.gz"
+
+
+def build_schema_artifacts() -> list:
+    """
+    Generate the public schema once and write it gzipped in every served
+    format. Files are replaced atomically, so a running server never
+    reads a partial file.
+    """
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    get_schema_directory().mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for fmt, renderer_class in RENDERERS.items():
+        content = renderer_class().render(
+            schema, renderer_class.media_type, {}
+        )
+        path = artifact_path(fmt)
+        partial = path.with_suffix(".tmp")
+        # mtime=0 keeps the bytes, and so the ETag, stable across builds.
+        partial.write_bytes(gzip.compress(content, mtime=0))
+        os.replace(partial, path)
+        paths.append(path)
+    return paths
+
+
+def load_schema_artifact(fmt):
+    """
+    Return the built ``SchemaArtifact`` for ``fmt``, or None when it has
+    not been built. The file is read again only when it changes.
+    """
+    path = artifact_path(fmt)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    cached = _artifacts.get(path)
+    if cached is None or cached[0] != mtime:
+        with _artifacts_lock:
+            cached = (mtime, SchemaArtifact(path.read_bytes()))
+            _artifacts[path] = cached
+    return cached[1]
+
+
+class SchemaNotBuilt(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = (
+        "The API schema has not been built, run manage.py build_schema."
+    )
+    default_code = "schema_not_built"
@@ -1,5 +1,10 @@
 from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import extend_schema, OpenApiParameter
+from drf_spectacular.utils import (
+    extend_schema,
+    inline_serializer,
+    OpenApiParameter,
+)
+from rest_framework import serializers
 
 from airport_app.serializers import (
     CountryListSerializer,
@@ -10,10 +15,14 @@ from airport_app.serializers import (
     CrewRetrieveSerializer,
     CrewSerializer,
     AirportListSerializer,
+    AirportAutocompleteSerializer,
+    AirportBoardSerializer,
     AirportRetrieveSerializer,
     AirportSerializer,
     RouteListSerializer,
     RouteRetrieveSerializer,
+    RouteAvailabilitySerializer,
+    RouteCalendarSerializer,
     RouteSerializer,
     AirplaneTypeSerializer,
     AirplaneListSerializer,
@@ -22,6 +31,8 @@ from airport_app.serializers import (
     AirplaneImageSerializer,
     FlightListSerializer,
     FlightRetrieveSerializer,
+    FlightSearchResultSerializer,
+    FlightSearchSerializer,
     FlightSerializer,
     OrderListSerializer,
     OrderRetrieveSerializer,
@@ -186,6 +197,48 @@ airport_list_schema = extend_schema(
         responses={200: AirportListSerializer(many=True)},
     )
 
+airport_autocomplete_schema = extend_schema(
+        summary="Autocomplete airports",
+        description=(
+            "Return the best matches for a type-ahead prefix.\n\n"
+            "- Matches airport, city and country names and country codes\n"
+            "- Served from an in-memory index, no database access"
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Prefix to complete. Examples: hea, new y, UKR",
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Maximum number of matches (1-50). Default: 10",
+            ),
+        ],
+        responses={200: AirportAutocompleteSerializer(many=True)},
+    )
+
+airport_board_schema = extend_schema(
+        summary="Departure and arrival board",
+        description=(
+            "Return the next departures and arrivals of an airport.\n\n"
+            "- Served from a precomputed per-airport window in the cache\n"
+            "- Refreshed on flight changes and at least every 30 seconds"
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Rows per direction (1-50). Default: 10",
+            ),
+        ],
+        responses={200: AirportBoardSerializer},
+    )
+
 airport_retrieve_schema = extend_schema(
         summary="Retrieve an airport",
         description="Get detailed information about an airport by ID.",
@@ -242,6 +295,26 @@ route_list_schema = extend_schema(
         responses={200: RouteListSerializer(many=True)},
     )
 
+route_calendar_schema = extend_schema(
+        summary="Get route availability calendar",
+        description=(
+            "Return per-day availability of a route for one month: number "
+            "of flights and the minimum and maximum free seats.\n\n"
+            "Precomputed on every booking and flight change."
+        ),
+        parameters=[RouteCalendarSerializer],
+        responses={
+            200: inline_serializer(
+                name="RouteCalendar",
+                fields={
+                    "route": serializers.IntegerField(),
+                    "month": serializers.CharField(),
+                    "days": RouteAvailabilitySerializer(many=True),
+                },
+            )
+        },
+    )
+
 route_retrieve_schema = extend_schema(
         summary="Retrieve a route",
         description="Get detailed information about a flight route by ID.",
@@ -324,6 +397,32 @@ airplane_list_schema = extend_schema(
                 location=OpenApiParameter.QUERY,
                 description="Filter by airplane type ID. Example: 1",
             ),
+            OpenApiParameter(
+                name="is_large",
+                type=OpenApiTypes.BOOL,
+                location=OpenApiParameter.QUERY,
+                description="Only airplanes with more (or not more) "
+                "than 200 seats",
+            ),
+            OpenApiParameter(
+                name="capacity_min",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Minimum number of seats. Example: 150",
+            ),
+            OpenApiParameter(
+                name="capacity_max",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Maximum number of seats. Example: 300",
+            ),
+            OpenApiParameter(
+                name="ordering",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Order by id, name or capacity. "
+                "Prefix with '-' for descending. Example: -capacity",
+            ),
         ],
         responses={200: AirplaneListSerializer(many=True)},
     )
@@ -418,11 +517,83 @@ flight_list_schema = extend_schema(
                 location=OpenApiParameter.QUERY,
                 description="Filter flights that arrive before this time",
             ),
+            OpenApiParameter(
+                name="departure_date",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+                description="Flights departing on this day. "
+                "Example: 2025-06-01",
+            ),
+            OpenApiParameter(
+                name="departure_after",
+                type=OpenApiTypes.DATETIME,
+                location=OpenApiParameter.QUERY,
+                description="Flights departing at or after this moment",
+            ),
+            OpenApiParameter(
+                name="departure_before",
+                type=OpenApiTypes.DATETIME,
+                location=OpenApiParameter.QUERY,
+                description="Flights departing before this moment",
+            ),
+            OpenApiParameter(
+                name="departure_time_from",
+                type=OpenApiTypes.TIME,
+                location=OpenApiParameter.QUERY,
+                description="Start of a time-of-day window. Needs "
+                "departure_date or departure_after/before. Example: 06:00",
+            ),
+            OpenApiParameter(
+                name="departure_time_to",
+                type=OpenApiTypes.TIME,
+                location=OpenApiParameter.QUERY,
+                description="End of a time-of-day window (exclusive). "
+                "Example: 12:00",
+            ),
+            OpenApiParameter(
+                name="min_capacity",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Only flights on airplanes with at least "
+                "this many seats. Example: 180",
+            ),
+            OpenApiParameter(
+                name="duration_min",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Minimum flight duration. Example: 01:30:00",
+            ),
+            OpenApiParameter(
+                name="duration_max",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Maximum flight duration. Example: 03:00:00",
+            ),
+            OpenApiParameter(
+                name="ordering",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Order by departure_time, arrival_time or "
+                "duration. Prefix with '-' for descending. Example: duration",
+            ),
         ],
         responses={200: FlightListSerializer(many=True)},
     )
 
 
+flight_search_schema = extend_schema(
+        summary="Search flights over flexible dates",
+        description=(
+            "Return the best flight per day between two airports.\n\n"
+            "- `flex_days` widens the date to ±N days (max 3)\n"
+            "- `return_date` adds the inbound leg for round trips\n"
+            "- `sort` picks the earliest or the shortest flight of each day"
+        ),
+        parameters=[FlightSearchSerializer],
+        responses={200: FlightSearchResultSerializer},
+    )
+
+
 flight_retrieve_schema = extend_schema(
         summary="Retrieve a flight",
         description="Get full details about a specific flight.",
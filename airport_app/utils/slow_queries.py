@@ -0,0 +1,172 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.utils import timezone
+
+from airport_app.utils.metrics import view_labels
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_QUERY_SETTINGS = {
+    "ENABLED": False,
+    "THRESHOLD_MS": 200,
+    "BUFFER_SIZE": 200,
+    "EXPLAIN": True,
+    "LOG_FILE": "",
+    # Parameters can hold personal data, e.g. emails, so the log lines
+    # leave them out, with the plans that inline them. The staff-only
+    # admin page always shows both.
+    "LOG_PARAMS": False,
+}
+
+# Only these statements are explained, EXPLAIN rejects the others
+# (SAVEPOINT, SET, DDL) and plans of writes are rarely the problem.
+EXPLAINED_STATEMENTS = ("SELECT", "WITH")
+
+_current_request = ContextVar("airport_slow_query_request", default=None)
+
+
+def get_slow_query_settings() -> dict:
+    return {
+        **DEFAULT_SLOW_QUERY_SETTINGS,
+        **getattr(settings, "AIRPORT_SLOW_QUERIES", {}),
+    }
+
+
+class SlowQueryBuffer:
+    """The latest slow queries of this process, oldest first."""
+
+    def __init__(self, size):
+        self._records = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def append(self, record):
+        with self._lock:
+            self._records.append(record)
+
+    def records(self) -> list:
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer() -> SlowQueryBuffer:
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = SlowQueryBuffer(
+                    get_slow_query_settings()["BUFFER_SIZE"]
+                )
+    return _buffer
+
+
+@contextmanager
+def track_queries(request):
+    """Attribute the queries run inside the block to request."""
+    token = _current_request.set(request)
+    try:
+        yield
+    finally:
+        _current_request.reset(token)
+
+
+def explain(connection, sql, params):
+    """
+    Return the JSON plan of sql, or None when it cannot be explained.
+
+    The plan is read on a cursor of the underlying driver connection, so
+    it skips the execute wrappers and the result set of the query that is
+    still waiting to be fetched. Inside a transaction a savepoint keeps a
+    failed EXPLAIN from aborting it.
+    """
+    if connection.vendor != "postgresql":
+        return None
+    if not sql.lstrip().upper().startswith(EXPLAINED_STATEMENTS):
+        return None
+
+    error = connection.Database.Error
+    in_transaction = not connection.get_autocommit()
+    try:
+        with connection.connection.cursor() as cursor:
+            if in_transaction:
+                cursor.execute("SAVEPOINT airport_explain")
+            try:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+            except error:
+                if in_transaction:
+                    cursor.execute("ROLLBACK TO SAVEPOINT airport_explain")
+                raise
+            finally:
+                if in_transaction:
+                    cursor.execute("RELEASE SAVEPOINT airport_explain")
+    except error:
+        logger.debug("Could not explain %s", sql, exc_info=True)
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan
+
+
+def record_slow_query(connection, sql, params, many, duration):
+    config = get_slow_query_settings()
+    request = _current_request.get()
+    view, action = view_labels(request) if request else ("", "")
+    plan = None
+    if config["EXPLAIN"] and not many:
+        plan = explain(connection, sql, params)
+
+    record = {
+        "time": timezone.now(),
+        "duration_ms": round(duration * 1000, 2),
+        "database": connection.alias,
+        "view": view,
+        "action": action,
+        "path": request.path if request else "",
+        "sql": sql,
+        "params": params,
+        "many": many,
+        "plan": plan,
+    }
+    get_buffer().append(record)
+    logged = record
+    if not config["LOG_PARAMS"]:
+        logged = {**record, "params": None, "plan": None}
+    logger.warning(
+        "Slow query %sms in %s.%s: %s",
+        record["duration_ms"],
+        view or "-",
+        action or "-",
+        json.dumps(logged, default=str),
+    )
+    return record
+
+
+def log_slow_queries(execute, sql, params, many, context):
+    """Database execute wrapper that records queries over the threshold."""
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration = time.perf_counter() - started
+    if duration * 1000 >= get_slow_query_settings()["THRESHOLD_MS"]:
+        record_slow_query(context["connection"], sql, params, many, duration)
+    return result
+
+
+def install_slow_query_log(sender, connection, **kwargs):
+    """``connection_created`` receiver, runs again on every reconnect."""
+    if log_slow_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_slow_queries)
@@ -0,0 +1,287 @@
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils.module_loading import import_string
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.serializers import ListSerializer, Serializer
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from airport_app.utils.metrics import view_labels
+
+DEFAULT_TRACING_SETTINGS = {
+    "ENABLED": False,
+    # Share of the requests that are traced, from 0 to 1.
+    "SAMPLE_RATE": 0.1,
+    "EXPORTER": "airport_app.utils.tracing.JsonFileExporter",
+    "FILE": "",
+    "SERVICE_NAME": "airport",
+}
+
+SCOPE = "airport_app.utils.tracing"
+
+_current_trace = ContextVar("airport_trace", default=None)
+_current_span = ContextVar("airport_span", default=None)
+
+
+def get_tracing_settings() -> dict:
+    return {
+        **DEFAULT_TRACING_SETTINGS,
+        **getattr(settings, "AIRPORT_TRACING", {}),
+    }
+
+
+def new_id(size) -> str:
+    return os.urandom(size).hex()
+
+
+class Span:
+    def __init__(self, trace, name, parent, attributes):
+        self.trace = trace
+        self.name = name
+        self.span_id = new_id(8)
+        self.parent_id = parent.span_id if parent else ""
+        self.attributes = attributes
+        self.start = time.time_ns()
+        self.end = None
+
+    def to_otlp(self) -> dict:
+        return {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "kind": 2 if not self.parent_id else 1,
+            "startTimeUnixNano": str(self.start),
+            "endTimeUnixNano": str(self.end),
+            "attributes": otlp_attributes(self.attributes),
+        }
+
+
+class Trace:
+    """The finished spans of one sampled request."""
+
+    def __init__(self):
+        self.trace_id = new_id(16)
+        self.root = None
+        self.spans = []
+
+    def to_otlp(self) -> dict:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": otlp_attributes(
+                            {
+                                "service.name": get_tracing_settings()[
+                                    "SERVICE_NAME"
+                                ]
+                            }
+                        )
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": SCOPE},
+                            "spans": [
+                                span.to_otlp() for span in self.spans
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+def otlp_attributes(attributes) -> list:
+    """Attributes in the OTLP JSON encoding."""
+    encoded = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            value = {"boolValue": value}
+        elif isinstance(value, int):
+            value = {"intValue": str(value)}
+        elif isinstance(value, float):
+            value = {"doubleValue": value}
+        else:
+            value = {"stringValue": str(value)}
+        encoded.append({"key": key, "value": value})
+    return encoded
+
+
+class JsonFileExporter:
+    """
+    Append each trace to FILE as one line of OTLP JSON, the format of the
+    OpenTelemetry collector's file exporter and receiver.
+    """
+
+    def __init__(self):
+        self.path = get_tracing_settings()["FILE"]
+        self._lock = threading.Lock()
+
+    def export(self, trace):
+        line = json.dumps(trace.to_otlp(), separators=(",", ":"))
+        with self._lock, open(self.path, "a") as file:
+            file.write(f"{line}\n")
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter():
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = import_string(
+                    get_tracing_settings()["EXPORTER"]
+                )()
+    return _exporter
+
+
+@contextmanager
+def trace_request(request):
+    """
+    Trace the request inside the block when it is sampled. Yields the
+    trace, or None, to pass to export_trace once the response is ready.
+    """
+    if random.random() >= get_tracing_settings()["SAMPLE_RATE"]:
+        yield None
+        return
+    trace = Trace()
+    token = _current_trace.set(trace)
+    try:
+        with span("request", method=request.method) as root:
+            trace.root = root
+            yield trace
+    finally:
+        _current_trace.reset(token)
+        route = ".".join(view_labels(request))
+        root.name = f"{request.method} {route}"
+        root.attributes["route"] = route
+
+
+def export_trace(trace, response):
+    trace.root.attributes["status"] = response.status_code
+    get_exporter().export(trace)
+
+
+@contextmanager
+def span(name, **attributes):
+    """Time the block as a child of the current span, when tracing."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    current = Span(trace, name, _current_span.get(), attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    finally:
+        _current_span.reset(token)
+        current.end = time.time_ns()
+        trace.spans.append(current)
+
+
+def in_span(name):
+    """Whether the current span is called name."""
+    current = _current_span.get()
+    return current is not None and current.name == name
+
+
+def traced(name, attributes=None, outermost=False):
+    """
+    Wrap a function in a span. attributes(*args) returns the span
+    attributes; with outermost, calls made inside a span of the same
+    name, e.g. nested serializers, are not spans of their own.
+    """
+
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None or (
+                outermost and in_span(name)
+            ):
+                return function(*args, **kwargs)
+            with span(name, **(attributes(*args) if attributes else {})):
+                return function(*args, **kwargs)
+
+        wrapper.traced = True
+        return wrapper
+
+    return decorator
+
+
+def class_name(instance, *args):
+    return {"class": type(instance).__name__}
+
+
+def model_name(queryset, *args):
+    return {"model": queryset.model.__name__}
+
+
+def trace_sql(execute, sql, params, many, context):
+    """Database execute wrapper that adds a span per query."""
+    if _current_trace.get() is None:
+        return execute(sql, params, many, context)
+    with span(
+        "sql",
+        statement=sql,
+        database=context["connection"].alias,
+        many=many,
+    ):
+        return execute(sql, params, many, context)
+
+
+def install_sql_tracing(sender, connection, **kwargs):
+    """``connection_created`` receiver, runs again on every reconnect."""
+    if trace_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(trace_sql)
+
+
+def install_tracing():
+    """
+    Wrap the phases of a DRF request in spans: authentication, with the
+    JWT decode and user lookup, permissions, queryset evaluation and
+    counts, serialization and rendering.
+    """
+    if getattr(Request._authenticate, "traced", False):
+        return
+    Request._authenticate = traced("authenticate")(Request._authenticate)
+    JWTAuthentication.get_validated_token = traced("authenticate.jwt")(
+        JWTAuthentication.get_validated_token
+    )
+    JWTAuthentication.get_user = traced("authenticate.user")(
+        JWTAuthentication.get_user
+    )
+    APIView.check_permissions = traced("permissions", class_name)(
+        APIView.check_permissions
+    )
+    APIView.check_object_permissions = traced(
+        "permissions", class_name
+    )(APIView.check_object_permissions)
+    QuerySet._fetch_all = traced("queryset", model_name, outermost=True)(
+        QuerySet._fetch_all
+    )
+    QuerySet.count = traced("queryset.count", model_name)(QuerySet.count)
+    for serializer in (Serializer, ListSerializer):
+        serializer.to_representation = traced(
+            "serialize", class_name, outermost=True
+        )(serializer.to_representation)
+    Response.rendered_content = property(
+        traced(
+            "render",
+            lambda response: {
+                "renderer": type(response.accepted_renderer).__name__
+            },
+        )(Response.rendered_content.fget)
+    )
@@ -1,12 +1,33 @@
-from django.db.models import Value, CharField
-from django.db.models.functions import Concat
+import hmac
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Prefetch
+from django.http import (
+    Http404,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.views import View
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
+from prometheus_client import CONTENT_TYPE_LATEST
 from rest_framework import status
 from rest_framework.decorators import action
-from rest_framework.filters import SearchFilter
+from rest_framework.exceptions import APIException, NotFound, ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAdminUser, IsAuthenticated, AllowAny
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 
+from airport_app.filters import (
+    AirplaneFilterSet,
+    FlightFilterSet,
+    TrigramSearchFilter,
+)
 from airport_app.models import (
     Country,
     City,
@@ -17,6 +38,8 @@ from airport_app.models import (
     Order,
     AirplaneType,
     Crew,
+    RouteAvailability,
+    Ticket,
 )
 from airport_app.serializers import (
     CountrySerializer,
@@ -36,67 +59,47 @@ from airport_app.serializers import (
     AirportListSerializer,
     RouteListSerializer,
     RouteRetrieveSerializer,
+    RouteAvailabilitySerializer,
+    RouteCalendarSerializer,
     AirplaneListSerializer,
     AirplaneRetrieveSerializer,
     FlightListSerializer,
     FlightRetrieveSerializer,
+    FlightSearchSerializer,
     OrderListSerializer,
     CrewRetrieveSerializer,
     AirportRetrieveSerializer,
     AirplaneImageSerializer,
 )
-from airport_app.utils.mixins import ActionMixin, CustomPermissionMixin
-from airport_app.utils.schema_descriptions import (
-    country_list_schema,
-    country_retrieve_schema,
-    country_create_schema,
-    country_update_schema,
-    country_destroy_schema,
-    city_list_schema,
-    city_retrieve_schema,
-    city_create_schema,
-    city_update_schema,
-    city_destroy_schema,
-    crew_list_schema,
-    crew_retrieve_schema,
-    crew_create_schema,
-    crew_update_schema,
-    crew_destroy_schema,
-    airport_list_schema,
-    airport_retrieve_schema,
-    airport_create_schema,
-    airport_update_schema,
-    airport_destroy_schema,
-    route_list_schema,
-    route_retrieve_schema,
-    route_create_schema,
-    route_update_schema,
-    route_destroy_schema,
-    airplane_type_list_schema,
-    airplane_type_retrieve_schema,
-    airplane_type_create_schema,
-    airplane_type_update_schema,
-    airplane_type_destroy_schema,
-    airplane_list_schema,
-    airplane_retrieve_schema,
-    airplane_create_schema,
-    airplane_update_schema,
-    airplane_destroy_schema,
-    airplane_upload_image_schema,
-    flight_list_schema,
-    flight_retrieve_schema,
-    flight_create_schema,
-    flight_update_schema,
-    flight_destroy_schema,
-    order_list_schema,
-    order_retrieve_schema,
-    order_create_schema,
-    order_update_schema,
-    order_destroy_schema
+from airport_app.utils.autocomplete import airport_autocomplete
+from airport_app.utils.board import BOARD_MAX_LIMIT, get_board
+from airport_app.utils.cache import (
+    aget_or_compute,
+    get_or_compute,
+    make_cache_key,
+)
+from airport_app.utils.events import board_topic, event_stream, seats_topic
+from airport_app.utils.flight_search import (
+    asearch_best_flights,
+    search_best_flights,
+)
+from airport_app.utils.lazy import LazySchemas
+from airport_app.utils.metrics import get_metrics_settings, render_metrics
+from airport_app.utils.mixins import (
+    ActionMixin,
+    CacheControlMixin,
+    CachedResponseMixin,
+    CustomPermissionMixin,
+    ReplicaReadMixin,
+    apply_cache_control,
 )
+from airport_app.utils.replicas import read_from_replica
 
+# Applied only when a schema is generated, see LazySchemas.
+schemas = LazySchemas("airport_app.utils.schema_descriptions")
 
-class CountryViewSet(ActionMixin, CustomPermissionMixin):
+
+class CountryViewSet(ReplicaReadMixin, ActionMixin, CustomPermissionMixin):
     """
     Manage countries in the system. Admins can create/update/delete.
     Authenticated users can view the list and detail.
@@ -104,38 +107,47 @@ class CountryViewSet(ActionMixin, CustomPermissionMixin):
 
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
-    filter_backends = [SearchFilter]
+    filter_backends = [TrigramSearchFilter]
     search_fields = ["name"]
 
     action_serializers = {"list": CountryListSerializer}
 
+    action_query_budgets = {
+        "list": 3,
+        "retrieve": 2,
+        "create": 5,
+        "update": 6,
+        "partial_update": 6,
+        "destroy": 6,
+    }
+
     action_permissions = {
         "list": [IsAuthenticated],
         "retrieve": [IsAuthenticated],
     }
 
-    @country_list_schema
+    @schemas.country_list_schema
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @country_retrieve_schema
+    @schemas.country_retrieve_schema
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    @country_create_schema
+    @schemas.country_create_schema
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
-    @country_update_schema
+    @schemas.country_update_schema
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
-    @country_destroy_schema
+    @schemas.country_destroy_schema
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
 
-class CityViewSet(ActionMixin, CustomPermissionMixin):
+class CityViewSet(ReplicaReadMixin, ActionMixin, CustomPermissionMixin):
     """
     Manage cities in the system. Admins can create/update/delete.
     Authenticated users can view list of cities and details.
@@ -143,7 +155,7 @@ class CityViewSet(ActionMixin, CustomPermissionMixin):
 
     queryset = City.objects.select_related("country")
     serializer_class = CitySerializer
-    filter_backends = [SearchFilter, DjangoFilterBackend]
+    filter_backends = [TrigramSearchFilter, DjangoFilterBackend]
     filterset_fields = ["country"]
     search_fields = ["name"]
 
@@ -152,40 +164,49 @@ class CityViewSet(ActionMixin, CustomPermissionMixin):
         "retrieve": CityRetrieveSerializer,
     }
 
+    action_query_budgets = {
+        "list": 3,
+        "retrieve": 2,
+        "create": 5,
+        "update": 6,
+        "partial_update": 4,
+        "destroy": 7,
+    }
+
     action_permissions = {
         "list": [IsAuthenticated],
         "retrieve": [IsAuthenticated],
     }
 
-    @city_list_schema
+    @schemas.city_list_schema
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @city_retrieve_schema
+    @schemas.city_retrieve_schema
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    @city_create_schema
+    @schemas.city_create_schema
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
-    @city_update_schema
+    @schemas.city_update_schema
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
-    @city_destroy_schema
+    @schemas.city_destroy_schema
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
 
-class CrewViewSet(ActionMixin, CustomPermissionMixin):
+class CrewViewSet(ReplicaReadMixin, ActionMixin, CustomPermissionMixin):
     """
     Manage crew members (pilots, stewardesses, etc.) Admins only.
     """
 
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
-    filter_backends = [SearchFilter, DjangoFilterBackend]
+    filter_backends = [TrigramSearchFilter, DjangoFilterBackend]
     filterset_fields = ["position"]
     search_fields = ["search_full_name"]
 
@@ -194,50 +215,62 @@ class CrewViewSet(ActionMixin, CustomPermissionMixin):
         "retrieve": CrewRetrieveSerializer,
     }
 
+    action_query_budgets = {
+        "list": 3,
+        "retrieve": 2,
+        "create": 2,
+        "update": 3,
+        "partial_update": 3,
+        "destroy": 4,
+    }
+
     action_permissions = {
         "list": [IsAdminUser],
         "retrieve": [IsAdminUser],
     }
 
-    def get_queryset(self):
-        return Crew.objects.annotate(
-            search_full_name=Concat(
-                "first_name",
-                Value(" "),
-                "last_name",
-                output_field=CharField(),
-            )
-        )
-
-    @crew_list_schema
+    @schemas.crew_list_schema
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @crew_retrieve_schema
+    @schemas.crew_retrieve_schema
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    @crew_create_schema
+    @schemas.crew_create_schema
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
-    @crew_update_schema
+    @schemas.crew_update_schema
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
-    @crew_destroy_schema
+    @schemas.crew_destroy_schema
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
 
-class AirportViewSet(ActionMixin, CustomPermissionMixin):
+def get_limit(request, default=10, maximum=50):
+    try:
+        limit = int(request.query_params.get("limit", default))
+    except ValueError:
+        raise ValidationError({"limit": "A valid integer is required."})
+    return max(1, min(limit, maximum))
+
+
+class AirportViewSet(
+    CacheControlMixin,
+    ReplicaReadMixin,
+    ActionMixin,
+    CustomPermissionMixin,
+):
     """
     Manage airports. Authenticated users can view the list and detail.
     """
 
     queryset = Airport.objects.select_related("city", "city__country")
     serializer_class = AirportSerializer
-    filter_backends = [SearchFilter, DjangoFilterBackend]
+    filter_backends = [TrigramSearchFilter, DjangoFilterBackend]
     filterset_fields = ["city", "city__country"]
     search_fields = ["name"]
 
@@ -246,33 +279,79 @@ class AirportViewSet(ActionMixin, CustomPermissionMixin):
         "retrieve": AirportRetrieveSerializer,
     }
 
+    action_query_budgets = {
+        "list": 3,
+        "retrieve": 2,
+        "autocomplete": 2,
+        "board": 4,
+        "create": 4,
+        "update": 5,
+        "partial_update": 3,
+        "destroy": 8,
+    }
+
     action_permissions = {
         "list": [IsAuthenticated],
         "retrieve": [IsAuthenticated],
+        "autocomplete": [IsAuthenticated],
+        "board": [AllowAny],
     }
 
-    @airport_list_schema
+    action_cache_control = {
+        "board": {"max_age": 5, "s_maxage": 5},
+    }
+
+    @schemas.airport_list_schema
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @airport_retrieve_schema
+    @schemas.airport_retrieve_schema
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    @airport_create_schema
+    @schemas.airport_create_schema
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
-    @airport_update_schema
+    @schemas.airport_update_schema
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
-    @airport_destroy_schema
+    @schemas.airport_destroy_schema
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
+    @schemas.airport_autocomplete_schema
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="autocomplete",
+        filter_backends=[],
+        pagination_class=None,
+    )
+    def autocomplete(self, request):
+        limit = get_limit(request)
+        query = request.query_params.get("q", "")
+
+        return Response(airport_autocomplete.search(query, limit))
+
+    @schemas.airport_board_schema
+    @action(methods=["GET"], detail=True, url_path="board")
+    def board(self, request, pk=None):
+        try:
+            airport_id = int(pk)
+        except ValueError:
+            raise Http404
+        board = get_board(
+            airport_id, get_limit(request, maximum=BOARD_MAX_LIMIT)
+        )
+        if board is None:
+            raise Http404
+
+        return Response(board)
 
-class RouteViewSet(ActionMixin, CustomPermissionMixin):
+
+class RouteViewSet(ReplicaReadMixin, ActionMixin, CustomPermissionMixin):
     """
     Manage flight routes between airports. Admins can create/update/delete.
     Authenticated users can view list and details.
@@ -287,42 +366,79 @@ class RouteViewSet(ActionMixin, CustomPermissionMixin):
         "destination__city__country",
     )
     serializer_class = RouteSerializer
-    filter_backends = [SearchFilter, DjangoFilterBackend]
+    filter_backends = [TrigramSearchFilter, DjangoFilterBackend]
     filterset_fields = ["source", "destination"]
     search_fields = ["source__name", "destination__name"]
 
     action_serializers = {
         "list": RouteListSerializer,
         "retrieve": RouteRetrieveSerializer,
+        "calendar": RouteAvailabilitySerializer,
+    }
+
+    action_query_budgets = {
+        "list": 3,
+        "retrieve": 2,
+        "calendar": 3,
+        "create": 7,
+        "update": 8,
+        "partial_update": 8,
+        "destroy": 9,
     }
 
     action_permissions = {
         "list": [IsAuthenticated],
         "retrieve": [IsAuthenticated],
+        "calendar": [IsAuthenticated],
     }
 
-    @route_list_schema
+    @schemas.route_list_schema
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @route_retrieve_schema
+    @schemas.route_retrieve_schema
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    @route_create_schema
+    @schemas.route_create_schema
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
-    @route_update_schema
+    @schemas.route_update_schema
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
-    @route_destroy_schema
+    @schemas.route_destroy_schema
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
+    @schemas.route_calendar_schema
+    @action(methods=["GET"], detail=True, url_path="calendar")
+    def calendar(self, request, pk=None):
+        params = RouteCalendarSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        month = params.validated_data.get("month") or timezone.localdate()
+        first_day = month.replace(day=1)
+        next_month = (first_day + timedelta(days=32)).replace(day=1)
+
+        route = get_object_or_404(Route.objects.only("id"), pk=pk)
+        days = RouteAvailability.objects.filter(
+            route=route, date__gte=first_day, date__lt=next_month
+        ).order_by("date")
+        return Response(
+            {
+                "route": route.id,
+                "month": first_day.strftime("%Y-%m"),
+                "days": self.get_serializer(days, many=True).data,
+            }
+        )
+
 
-class AirplaneTypeViewSet(ActionMixin, CustomPermissionMixin):
+class AirplaneTypeViewSet(
+    ReplicaReadMixin,
+    ActionMixin,
+    CustomPermissionMixin,
+):
     """
     Manage airplane types (e.g. Boeing 737, Airbus A320).
     Admins only.
@@ -330,44 +446,53 @@ class AirplaneTypeViewSet(ActionMixin, CustomPermissionMixin):
 
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
-    filter_backends = [SearchFilter]
+    filter_backends = [TrigramSearchFilter]
     search_fields = ["name"]
 
+    action_query_budgets = {
+        "list": 3,
+        "retrieve": 2,
+        "create": 3,
+        "update": 4,
+        "partial_update": 4,
+        "destroy": 6,
+    }
+
     action_permissions = {
         "list": [IsAdminUser],
         "retrieve": [IsAdminUser],
     }
 
-    @airplane_type_list_schema
+    @schemas.airplane_type_list_schema
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @airplane_type_retrieve_schema
+    @schemas.airplane_type_retrieve_schema
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    @airplane_type_create_schema
+    @schemas.airplane_type_create_schema
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
-    @airplane_type_update_schema
+    @schemas.airplane_type_update_schema
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
-    @airplane_type_destroy_schema
+    @schemas.airplane_type_destroy_schema
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
 
-class AirplaneViewSet(ActionMixin, CustomPermissionMixin):
+class AirplaneViewSet(ReplicaReadMixin, ActionMixin, CustomPermissionMixin):
     """
     Manage airplanes. Admins only.
     """
 
     queryset = Airplane.objects.select_related("airplane_type").order_by("id")
     serializer_class = AirplaneSerializer
-    filter_backends = [SearchFilter, DjangoFilterBackend]
-    filterset_fields = ["airplane_type"]
+    filter_backends = [TrigramSearchFilter, DjangoFilterBackend]
+    filterset_class = AirplaneFilterSet
     search_fields = ["name"]
 
     action_serializers = {
@@ -376,32 +501,42 @@ class AirplaneViewSet(ActionMixin, CustomPermissionMixin):
         "upload_image": AirplaneImageSerializer,
     }
 
+    action_query_budgets = {
+        "list": 3,
+        "retrieve": 2,
+        "upload_image": 4,
+        "create": 4,
+        "update": 13,
+        "partial_update": 4,
+        "destroy": 12,
+    }
+
     action_permissions = {
         "list": [IsAdminUser],
         "retrieve": [IsAdminUser],
     }
 
-    @airplane_list_schema
+    @schemas.airplane_list_schema
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @airplane_retrieve_schema
+    @schemas.airplane_retrieve_schema
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    @airplane_create_schema
+    @schemas.airplane_create_schema
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
-    @airplane_update_schema
+    @schemas.airplane_update_schema
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
-    @airplane_destroy_schema
+    @schemas.airplane_destroy_schema
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
-    @airplane_upload_image_schema
+    @schemas.airplane_upload_image_schema
     @action(
         methods=["POST"],
         detail=True,
@@ -419,7 +554,13 @@ class AirplaneViewSet(ActionMixin, CustomPermissionMixin):
         )
 
 
-class FlightViewSet(ActionMixin, CustomPermissionMixin):
+class FlightViewSet(
+    CacheControlMixin,
+    CachedResponseMixin,
+    ReplicaReadMixin,
+    ActionMixin,
+    CustomPermissionMixin,
+):
     """
     Manage flights and their scheduling.
     Public access to list and detail.
@@ -436,53 +577,126 @@ class FlightViewSet(ActionMixin, CustomPermissionMixin):
         "airplane",
     ).prefetch_related("crew")
     serializer_class = FlightSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter]
-    filterset_fields = [
-        "route",
-        "airplane",
-        "is_active",
-        "departure_time",
-        "arrival_time",
-    ]
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter]
+    filterset_class = FlightFilterSet
     search_fields = ["route__source__name", "route__destination__name"]
 
     action_serializers = {
         "list": FlightListSerializer,
         "retrieve": FlightRetrieveSerializer,
     }
+    action_query_budgets = {
+        "list": 4,
+        "retrieve": 3,
+        "search": 2,
+        "create": 21,
+        "update": 30,
+        "partial_update": 23,
+        "destroy": 13,
+    }
+
     action_permissions = {
         "list": [AllowAny],
         "retrieve": [AllowAny],
+        "search": [AllowAny],
     }
 
-    @flight_list_schema
+    action_cache_control = {
+        "list": {
+            "max_age": 60,
+            "s_maxage": 300,
+            "stale_while_revalidate": 30,
+        },
+        "retrieve": {
+            "max_age": 60,
+            "s_maxage": 300,
+            "stale_while_revalidate": 30,
+        },
+        "search": {
+            "max_age": 60,
+            "s_maxage": 300,
+            "stale_while_revalidate": 30,
+        },
+    }
+
+    cache_actions = ("list", "retrieve")
+    cache_namespace = "flights"
+
+    @schemas.flight_list_schema
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @flight_retrieve_schema
+    @schemas.flight_retrieve_schema
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    @flight_create_schema
+    @schemas.flight_create_schema
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
-    @flight_update_schema
+    @schemas.flight_update_schema
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
-    @flight_destroy_schema
+    @schemas.flight_destroy_schema
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
+    @schemas.flight_search_schema
+    @action(methods=["GET"], detail=False, url_path="search")
+    def search(self, request):
+        serializer = FlightSearchSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        key = make_cache_key(
+            self.cache_namespace, "search", sorted(params.items())
+        )
+        return Response(
+            get_or_compute(
+                key,
+                lambda: search_best_flights(**params),
+                namespace=self.cache_namespace,
+            )
+        )
 
-class OrderViewSet(ActionMixin, CustomPermissionMixin):
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "retrieve":
+            # AirplaneRetrieveSerializer nests the airplane type.
+            return queryset.select_related("airplane__airplane_type")
+        return queryset
+
+
+class OrderViewSet(
+    CacheControlMixin,
+    ReplicaReadMixin,
+    ActionMixin,
+    CustomPermissionMixin,
+):
     """
     Manage flight ticket orders.
     Authenticated users can view and create their orders.
     """
 
-    queryset = Order.objects.prefetch_related("tickets")
+    # Shallow joins per query: past eight joined tables PostgreSQL stops
+    # reordering joins (join_collapse_limit) and plans them as written.
+    queryset = Order.objects.prefetch_related(
+        Prefetch(
+            "tickets",
+            queryset=Ticket.objects.select_related(
+                "flight__route", "flight__airplane"
+            ),
+        ),
+        Prefetch(
+            "tickets__flight__route__source",
+            queryset=Airport.objects.select_related("city__country"),
+        ),
+        Prefetch(
+            "tickets__flight__route__destination",
+            queryset=Airport.objects.select_related("city__country"),
+        ),
+    )
     serializer_class = OrderSerializer
 
     action_serializers = {
@@ -490,37 +704,245 @@ class OrderViewSet(ActionMixin, CustomPermissionMixin):
         "retrieve": OrderRetrieveSerializer,
     }
 
+    # create runs queries per ticket and has no budget.
+    action_query_budgets = {
+        "list": 6,
+        "retrieve": 5,
+    }
+
     action_permissions = {
         "list": [IsAuthenticated],
         "retrieve": [IsAuthenticated],
         "create": [IsAuthenticated],
     }
 
-    @order_list_schema
+    action_cache_control = {
+        "list": {"private": True, "no_store": True},
+        "retrieve": {"private": True, "no_store": True},
+        "create": {"private": True, "no_store": True},
+    }
+
+    @schemas.order_list_schema
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @order_retrieve_schema
+    @schemas.order_retrieve_schema
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    @order_create_schema
+    @schemas.order_create_schema
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
-    @order_update_schema
+    @schemas.order_update_schema
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
-    @order_destroy_schema
+    @schemas.order_destroy_schema
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
     def get_queryset(self):
+        queryset = super().get_queryset()
         user = self.request.user
         if user.is_staff:
-            return Order.objects.all()
-        return Order.objects.filter(user=user)
+            return queryset
+        return queryset.filter(user=user)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+
+def seat_map(flight_id):
+    flight = Flight.objects.select_related("airplane").get(pk=flight_id)
+    return {
+        "flight": flight.id,
+        "rows": flight.airplane.rows,
+        "seats_in_row": flight.airplane.seats_in_row,
+        "taken": [
+            list(seat)
+            for seat in Ticket.objects.filter(flight_id=flight_id)
+            .order_by("row", "seat")
+            .values_list("row", "seat")
+        ],
+    }
+
+
+def sse_response(request, topic, snapshot):
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "Event streams are only served over ASGI."},
+            status=status.HTTP_501_NOT_IMPLEMENTED,
+        )
+    response = StreamingHttpResponse(
+        event_stream(topic, snapshot), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def flight_seats_stream(request, pk):
+    """
+    Stream the seat map of a flight: a snapshot of the taken seats,
+    then ``seats.taken``/``seats.released`` deltas as orders change.
+    """
+    if not await Flight.objects.filter(pk=pk).aexists():
+        raise Http404
+
+    async def snapshot():
+        return await sync_to_async(seat_map)(pk)
+
+    return sse_response(request, seats_topic(pk), snapshot)
+
+
+async def airport_board_stream(request, pk):
+    """
+    Stream the board of an airport: a snapshot of the next departures
+    and arrivals, then ``flight.changed``/``flight.removed`` deltas.
+    """
+    try:
+        limit = get_limit(Request(request), maximum=BOARD_MAX_LIMIT)
+    except APIException as exc:
+        return JsonResponse(exc.detail, status=exc.status_code)
+    if await sync_to_async(get_board)(pk, limit) is None:
+        raise Http404
+
+    async def snapshot():
+        return await sync_to_async(get_board)(pk, limit)
+
+    return sse_response(request, board_topic(pk), snapshot)
+
+
+class AsyncFlightView(View):
+    """
+    ASGI-native variant of the public FlightViewSet read actions. The
+    queryset, filters, pagination and serializers are the viewset's own;
+    rows are fetched through the async ORM interface, so a slow client
+    does not hold a worker thread while its response is produced.
+    """
+
+    action = None
+    http_method_names = ["get"]
+
+    async def get(self, request, pk=None):
+        drf_request = Request(
+            request,
+            authenticators=[
+                authentication()
+                for authentication in FlightViewSet.authentication_classes
+            ],
+        )
+        viewset = FlightViewSet(
+            request=drf_request,
+            action=self.action,
+            args=(),
+            kwargs={"pk": pk} if pk else {},
+            format_kwarg=None,
+        )
+        try:
+            # The cache policy depends on the user, authenticated in a
+            # thread as it may look the user up.
+            await sync_to_async(getattr)(drf_request, "user")
+            with read_from_replica():
+                data = await getattr(self, self.action)(viewset)
+        except APIException as exc:
+            return self.render(exc.detail, exc.status_code)
+
+        return apply_cache_control(
+            drf_request,
+            self.render(data, status.HTTP_200_OK),
+            FlightViewSet.action_cache_control[self.action],
+        )
+
+    def render(self, data, status_code):
+        return JsonResponse(
+            data, status=status_code, encoder=JSONEncoder, safe=False
+        )
+
+    def get_cache_key(self, viewset):
+        request = viewset.request
+        return make_cache_key(
+            FlightViewSet.cache_namespace,
+            "async",
+            self.action,
+            request.scheme,
+            request.get_host(),
+            sorted(viewset.kwargs.items()),
+            sorted(request.query_params.lists()),
+        )
+
+    async def list(self, viewset):
+        async def compute():
+            # Filter validation may look up routes and airplanes, which
+            # the async ORM interface does not cover for form fields.
+            # The list serializer does not render crew.
+            queryset = await sync_to_async(viewset.filter_queryset)(
+                viewset.get_queryset().prefetch_related(None)
+            )
+            page = await viewset.paginator.apaginate_queryset(
+                queryset, viewset.request, view=viewset
+            )
+            serializer = FlightListSerializer(
+                page, many=True, context=viewset.get_serializer_context()
+            )
+            return viewset.get_paginated_response(serializer.data).data
+
+        return await aget_or_compute(
+            self.get_cache_key(viewset),
+            compute,
+            namespace=FlightViewSet.cache_namespace,
+        )
+
+    async def retrieve(self, viewset):
+        async def compute():
+            try:
+                flight = await (
+                    viewset.get_queryset()
+                    .select_related("airplane__airplane_type")
+                    .aget(pk=viewset.kwargs["pk"])
+                )
+            except Flight.DoesNotExist:
+                raise NotFound
+            return FlightRetrieveSerializer(
+                flight, context=viewset.get_serializer_context()
+            ).data
+
+        return await aget_or_compute(
+            self.get_cache_key(viewset),
+            compute,
+            namespace=FlightViewSet.cache_namespace,
+        )
+
+    async def search(self, viewset):
+        serializer = FlightSearchSerializer(
+            data=viewset.request.query_params
+        )
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        # Same key as FlightViewSet.search, the payload has no URLs.
+        return await aget_or_compute(
+            make_cache_key(
+                FlightViewSet.cache_namespace,
+                "search",
+                sorted(params.items()),
+            ),
+            lambda: asearch_best_flights(**params),
+            namespace=FlightViewSet.cache_namespace,
+        )
+
+
+def metrics(request):
+    """
+    Expose the request metrics in the Prometheus text format. When
+    AIRPORT_METRICS["TOKEN"] is set, scrapers must send it as a bearer
+    token.
+    """
+    token = get_metrics_settings()["TOKEN"]
+    if token and not hmac.compare_digest(
+        request.headers.get("Authorization", "").encode(),
+        f"Bearer {token}".encode(),
+    ):
+        return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,165 @@
+"""
+Measure what connection handling costs each request.
+
+Requests go through Django's request handling in-process from several
+threads, with the response cache disabled so that each request queries
+PostgreSQL. The test client skips the connection cleanup that a real
+server runs around each request, so the benchmark runs it itself.
+Each mode reports latency percentiles and how many connections were
+opened:
+
+    per-request  CONN_MAX_AGE=0, a new connection for every request
+    persistent   CONN_MAX_AGE=60 with health checks
+    pool         psycopg 3 client-side pool (only when psycopg_pool is
+                 installed)
+
+    python benchmarks/db_connections.py --threads 8 --requests 200
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import (  # noqa: E402
+    close_old_connections,
+    connection,
+    connections,
+)
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+MODES = {
+    "per-request": {"CONN_MAX_AGE": 0},
+    "persistent": {"CONN_MAX_AGE": 60},
+    "pool": {"CONN_MAX_AGE": 0, "pool": True},
+}
+
+
+def pool_available():
+    try:
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        return False
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+    return is_psycopg3
+
+
+def configure(mode, pool_size):
+    # Close the connection and pool so that no thread reuses a
+    # connection opened under the previous mode.
+    connection.close()
+    connection.close_pool()
+    settings_dict = connections["default"].settings_dict
+    settings_dict["CONN_MAX_AGE"] = MODES[mode]["CONN_MAX_AGE"]
+    settings_dict["CONN_HEALTH_CHECKS"] = True
+    settings_dict["OPTIONS"].pop("pool", None)
+    if MODES[mode].get("pool"):
+        settings_dict["OPTIONS"]["pool"] = {
+            "min_size": pool_size,
+            "max_size": pool_size,
+        }
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run(mode, path, threads, requests):
+    opened = []
+    wrapper_class = type(connections["default"])
+    get_new_connection = wrapper_class.get_new_connection
+
+    def count(self, conn_params):
+        opened.append(1)
+        return get_new_connection(self, conn_params)
+
+    def worker(number):
+        client = Client()
+        latencies = []
+        for request_number in range(requests):
+            started = time.perf_counter()
+            close_old_connections()
+            # A unique parameter keeps concurrent misses from being
+            # coalesced into one query.
+            response = client.get(
+                path, {"bench": f"{number}-{request_number}"}
+            )
+            close_old_connections()
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.status_code
+        connections.close_all()
+        return latencies
+
+    wrapper_class.get_new_connection = count
+    try:
+        with ThreadPoolExecutor(threads) as executor:
+            latencies = [
+                latency
+                for chunk in executor.map(worker, range(threads))
+                for latency in chunk
+            ]
+    finally:
+        wrapper_class.get_new_connection = get_new_connection
+
+    return {
+        "mode": mode,
+        "requests": len(latencies),
+        "connections": len(opened),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+    }
+
+
+def connect_cost(samples=50):
+    connection.close()
+    started = time.perf_counter()
+    for _ in range(samples):
+        connection.connect()
+        connection.close()
+    return round((time.perf_counter() - started) / samples * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--path", default="/api/airport/flights/", help="without a query"
+    )
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    settings.AIRPORT_CACHE = {"TIMEOUT": 0, "STALE_WHILE_REVALIDATE": 0}
+
+    modes = list(MODES)
+    if not pool_available():
+        modes.remove("pool")
+        print("psycopg 3 with psycopg_pool is not installed, skipping pool")
+
+    print(f"connect + close: {connect_cost()} ms")
+    print(f"{'mode':<12} {'conns':>6} {'p50':>8} {'p95':>8} {'mean':>8}")
+    for mode in modes:
+        configure(mode, args.threads)
+        row = run(mode, args.path, args.threads, args.requests)
+        print(
+            f"{row['mode']:<12} {row['connections']:>6} "
+            f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['mean_ms']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Compare the sync and async flight read paths under many concurrent
+keep-alive connections.
+
+Start the project under an ASGI server with the response cache disabled,
+so every request reaches PostgreSQL, and point the benchmark at it:
+
+    AIRPORT_CACHE_TIMEOUT=0 AIRPORT_CACHE_STALE_WHILE_REVALIDATE=0 \\
+        uvicorn airport.asgi:application --workers 4 --no-access-log
+    python benchmarks/flight_reads.py --concurrency 500 --duration 30
+
+Only the standard library is used, so the script runs anywhere.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+PATHS = {
+    "sync list": "/api/airport/flights/",
+    "async list": "/api/airport/async/flights/",
+}
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+
+    def percentile(self, fraction):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(fraction * len(ordered)))
+        return ordered[index] * 1000
+
+
+async def read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed")
+    status = int(status_line.split()[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers.get("connection") == "close"
+
+
+async def client(host, port, path, deadline, stats):
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+        "Connection: keep-alive\r\n\r\n"
+    ).encode()
+    writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status, closed = await read_response(reader)
+        except (OSError, ConnectionError, asyncio.IncompleteReadError):
+            stats.errors += 1
+            writer = None
+            await asyncio.sleep(0.05)
+            continue
+
+        stats.latencies.append(time.perf_counter() - started)
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        if closed:
+            writer.close()
+            writer = None
+
+    if writer is not None:
+        writer.close()
+
+
+async def run(base_url, path, concurrency, duration):
+    url = urlsplit(base_url)
+    stats = Stats()
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(
+        *(
+            client(url.hostname, url.port or 80, path, deadline, stats)
+            for _ in range(concurrency)
+        )
+    )
+    return stats
+
+
+def summarize(name, stats, duration):
+    return {
+        "path": name,
+        "requests": len(stats.latencies),
+        "rps": round(len(stats.latencies) / duration, 1),
+        "p50_ms": round(stats.percentile(0.50), 1),
+        "p95_ms": round(stats.percentile(0.95), 1),
+        "p99_ms": round(stats.percentile(0.99), 1),
+        "mean_ms": round(
+            statistics.fmean(stats.latencies) * 1000
+            if stats.latencies
+            else 0.0,
+            1,
+        ),
+        "statuses": stats.statuses,
+        "errors": stats.errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--query", default="", help="e.g. page_size=20")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = []
+    for name, path in PATHS.items():
+        if args.query:
+            path = f"{path}?{args.query}"
+        stats = asyncio.run(
+            run(args.base_url, path, args.concurrency, args.duration)
+        )
+        results.append(summarize(name, stats, args.duration))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(
+        f"{'path':<12} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} "
+        f"{'errors':>7}  statuses"
+    )
+    for row in results:
+        print(
+            f"{row['path']:<12} {row['rps']:>8} {row['p50_ms']:>8} "
+            f"{row['p95_ms']:>8} {row['p99_ms']:>8} {row['errors']:>7}  "
+            f"{row['statuses']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
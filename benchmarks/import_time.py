@@ -0,0 +1,144 @@
+"""
+Measure the cold-start import time of a worker.
+
+Each run starts a fresh interpreter that imports the WSGI entry point
+(``django.setup()`` included) and loads the URLconf, which a worker
+otherwise does on its first request. Timings are the median of several
+runs; one extra run under ``python -X importtime`` shows which modules
+and packages the time goes to:
+
+    python benchmarks/import_time.py --runs 10 --top 15
+    python benchmarks/import_time.py --env dev --json
+
+``--budget-ms`` exits with status 1 when the median exceeds the budget,
+so the check can run in CI.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SNIPPET = """
+import json, time
+started = time.perf_counter()
+import {target}
+imported = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "urlconf_ms": (time.perf_counter() - imported) * 1000,
+}}))
+"""
+
+
+def run_once(target, env, importtime=False):
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", SNIPPET.format(target=target)]
+    result = subprocess.run(
+        command, cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode:
+        sys.exit(result.stderr)
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return timings, result.stderr
+
+
+def parse_importtime(output):
+    """Return ``(module, self_us)`` pairs from ``-X importtime`` output."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us)))
+    return modules
+
+
+def summarize(modules, top):
+    packages = defaultdict(int)
+    for name, self_us in modules:
+        packages[name.split(".")[0]] += self_us
+    by_self = sorted(modules, key=lambda item: item[1], reverse=True)
+    by_package = sorted(packages.items(), key=lambda item: -item[1])
+    return {
+        "modules": len(modules),
+        "top_modules": [
+            {"module": name, "self_ms": round(us / 1000, 2)}
+            for name, us in by_self[:top]
+        ],
+        "top_packages": [
+            {"package": name, "self_ms": round(us / 1000, 2)}
+            for name, us in by_package[:top]
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--target", default="airport.wsgi")
+    parser.add_argument(
+        "--env", default="prod", choices=("dev", "test", "prod")
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    env = {
+        **os.environ,
+        "DJANGO_ENV": args.env,
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "import-time-benchmark"),
+    }
+    runs = [run_once(args.target, env)[0] for _ in range(args.runs)]
+    _, importtime = run_once(args.target, env, importtime=True)
+
+    result = {
+        "target": args.target,
+        "env": args.env,
+        "runs": args.runs,
+        "import_ms": round(
+            statistics.median(run["import_ms"] for run in runs), 1
+        ),
+        "urlconf_ms": round(
+            statistics.median(run["urlconf_ms"] for run in runs), 1
+        ),
+        **summarize(parse_importtime(importtime), args.top),
+    }
+    result["total_ms"] = round(result["import_ms"] + result["urlconf_ms"], 1)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(
+            f"{args.target} ({args.env}, median of {args.runs} runs): "
+            f"import {result['import_ms']} ms + URLconf "
+            f"{result['urlconf_ms']} ms = {result['total_ms']} ms, "
+            f"{result['modules']} modules"
+        )
+        print(f"\n{'package':<32} {'self ms':>8}")
+        for row in result["top_packages"]:
+            print(f"{row['package']:<32} {row['self_ms']:>8}")
+        print(f"\n{'module':<48} {'self ms':>8}")
+        for row in result["top_modules"]:
+            print(f"{row['module']:<48} {row['self_ms']:>8}")
+
+    if args.budget_ms is not None and result["total_ms"] > args.budget_ms:
+        sys.exit(
+            f"Cold start {result['total_ms']} ms exceeds the "
+            f"{args.budget_ms} ms budget."
+        )
+
+
+if __name__ == "__main__":
+    main()
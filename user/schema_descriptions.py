@@ -0,0 +1,33 @@
+from drf_spectacular.utils import extend_schema
+
+from user.serializers import UserSerializer
+
+user_create_schema = extend_schema(
+        summary="Register a new user",
+        description="Create a new user account. "
+                    "Requires email and password (min. 5 characters).",
+        request=UserSerializer,
+        responses={201: UserSerializer},
+    )
+
+user_retrieve_schema = extend_schema(
+        summary="Retrieve current user",
+        description="Return details of the currently authenticated user.",
+        responses={200: UserSerializer},
+    )
+
+user_partial_update_schema = extend_schema(
+        summary="Partially update current user",
+        description="Update one or more fields "
+                    "(email or password) of the current user.",
+        request=UserSerializer,
+        responses={200: UserSerializer},
+    )
+
+user_update_schema = extend_schema(
+        summary="Fully update current user",
+        description="Overwrite all fields "
+                    "(email and password) of the current user.",
+        request=UserSerializer,
+        responses={200: UserSerializer},
+    )
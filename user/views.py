@@ -1,5 +1,4 @@
 from django.utils import timezone
-from drf_spectacular.utils import extend_schema
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
@@ -7,20 +6,18 @@ from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from airport_app.models import Flight
+from airport_app.utils.cache import bump_generation
+from airport_app.utils.lazy import LazySchemas
 from user.serializers import UserSerializer
 
+schemas = LazySchemas("user.schema_descriptions")
+
 
 class CreateUserView(generics.CreateAPIView):
     serializer_class = UserSerializer
     permission_classes = ()
 
-    @extend_schema(
-        summary="Register a new user",
-        description="Create a new user account. "
-                    "Requires email and password (min. 5 characters).",
-        request=UserSerializer,
-        responses={201: UserSerializer},
-    )
+    @schemas.user_create_schema
     def post(self, request, *args, **kwargs):
         return super().post(request, *args, **kwargs)
 
@@ -33,31 +30,15 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
     def get_object(self):
         return self.request.user
 
-    @extend_schema(
-        summary="Retrieve current user",
-        description="Return details of the currently authenticated user.",
-        responses={200: UserSerializer},
-    )
+    @schemas.user_retrieve_schema
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
-    @extend_schema(
-        summary="Partially update current user",
-        description="Update one or more fields "
-                    "(email or password) of the current user.",
-        request=UserSerializer,
-        responses={200: UserSerializer},
-    )
+    @schemas.user_partial_update_schema
     def patch(self, request, *args, **kwargs):
         return super().patch(request, *args, **kwargs)
 
-    @extend_schema(
-        summary="Fully update current user",
-        description="Overwrite all fields "
-                    "(email and password) of the current user.",
-        request=UserSerializer,
-        responses={200: UserSerializer},
-    )
+    @schemas.user_update_schema
     def put(self, request, *args, **kwargs):
         return super().put(request, *args, **kwargs)
 
@@ -66,9 +47,11 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     def validate(self, attrs):
         data = super().validate(attrs)
 
-        Flight.objects.filter(
+        deactivated = Flight.objects.filter(
             is_active=True, departure_time__lt=timezone.now()
         ).update(is_active=False)
+        if deactivated:
+            bump_generation("flights")
 
         return data
 